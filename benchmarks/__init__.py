@@ -0,0 +1 @@
+"""Benchmarks of parsing, encoding, training, loading and serving Titanic ML models."""
@@ -0,0 +1,48 @@
+"""Run the benchmarks, write a JSON report, and compare it to a baseline report."""
+import sys
+import argparse
+from . import report, suite
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--rows",
+        type=int,
+        nargs="+",
+        default=suite.ROWS,
+        help="Number of rows of each synthetic dataset to benchmark on.",
+    )
+    arg_parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of times to time each benchmark."
+    )
+    arg_parser.add_argument(
+        "--only", nargs="+", help="Names of the benchmarks to run (default: all)."
+    )
+    arg_parser.add_argument(
+        "--output",
+        default="benchmarks/results.json",
+        help="Path of the JSON report to write.",
+    )
+    arg_parser.add_argument(
+        "--compare", help="Path of a baseline JSON report to flag regressions against."
+    )
+    arg_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=report.THRESHOLD,
+        help="Relative slowdown to flag as a regression, e.g. 0.2 for 20%%.",
+    )
+    args = arg_parser.parse_args()
+
+    results = suite.run(args.rows, args.repeat, args.only)
+    report.write(results, args.output)
+
+    if args.compare:
+        regressions = report.compare(results, report.read(args.compare), args.threshold)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression.name} ({regression.rows} rows): "
+                f"{regression.baseline:.4f} s -> {regression.median:.4f} s "
+                f"(+{regression.slowdown:.0%})"
+            )
+        sys.exit(1 if regressions else 0)
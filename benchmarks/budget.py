@@ -0,0 +1,208 @@
+"""Accuracy, prediction latency and artifact size of budgeted vs full SVC models.
+
+The full SVC keeps every support vector it finds, so its prediction cost and size
+grow with the number of rows. The nystroem backend approximates its RBF kernel on a
+budget of basis vectors instead. Both are trained on the same synthetic dataset,
+and tested on a held out part of it, predicting with the NumPy predictor of the
+saved artifact as the API does.
+"""
+import os
+import time
+import argparse
+import tempfile
+import statistics
+from dataclasses import dataclass
+from typing import Any, List, Optional, Sequence
+import numpy as np
+from titanic.ml import artifact, model
+from titanic.ml.backends import Backend
+from titanic.preprocessing import parser
+from titanic.preprocessing.encoder import TitanicEncoder
+from .data import scaled_raw
+
+ROWS = 10_000
+BUDGETS = (50, 100, 200, 500)
+
+# Share of the rows held out to test on
+TEST_SIZE = 0.2
+
+# Number of rows of the batch prediction latency, and times to time each latency
+BATCH = 1000
+REPEAT = 200
+
+
+@dataclass
+class BudgetResult:
+    """Accuracy, prediction latency and artifact size of one model."""
+
+    name: str
+    # Budget of kernel basis vectors, or None for the full SVC
+    budget: Optional[int]
+    # Number of support or basis vectors that the model predicts with
+    vectors: int
+    accuracy: float
+    # Median wall time of predicting one row, and a batch of BATCH rows
+    row_us: float
+    batch_ms: float
+    artifact_bytes: int
+
+
+def run(
+    rows: int = ROWS, budgets: Sequence[int] = BUDGETS, repeat: int = REPEAT
+) -> List[BudgetResult]:
+    """Train a full SVC and a budgeted model of each budget, and compare them.
+
+    Args:
+        rows:       Number of rows of the synthetic dataset, of which TEST_SIZE are
+                    held out to test on.
+        budgets:    Budgets of kernel basis vectors of the budgeted models.
+        repeat:     Number of times to time each prediction latency.
+
+    Returns:
+        Result of the full SVC first, and then of each budgeted model.
+    """
+    # Split the dataset into train and test rows, and fit the encoder on the train rows
+    raw = scaled_raw(rows)
+    split = int(rows * (1.0 - TEST_SIZE))
+    x_train, y_train = parser.create_titanic_columns(raw.iloc[:split])
+    x_test, y_test = parser.create_titanic_columns(raw.iloc[split:])
+    encoder = TitanicEncoder()
+    encoder.fit(x_train)
+    x_test_enc = encoder.encode(x_test)
+
+    results = [
+        _measure(
+            "svc",
+            None,
+            model.train(x_train, y_train, encoder)[0],
+            encoder,
+            x_test_enc,
+            y_test,
+            repeat,
+        )
+    ]
+    for budget in budgets:
+        model_, _ = model.train(
+            x_train, y_train, encoder, backend=Backend.NYSTROEM, budget=budget
+        )
+        results.append(
+            _measure(
+                f"nystroem {budget}",
+                budget,
+                model_,
+                encoder,
+                x_test_enc,
+                y_test,
+                repeat,
+            )
+        )
+    return results
+
+
+def report(results: List[BudgetResult]) -> str:
+    """Format the <results> as a table.
+
+    Args:
+        results:    Result of each model.
+
+    Returns:
+        The report, as lines of text.
+    """
+    lines = [
+        f"{'model':<16} {'vectors':>8} {'accuracy':>9} {'row us':>8} "
+        f"{f'{BATCH} rows ms':>14} {'artifact KiB':>13}"
+    ]
+    for result in results:
+        lines.append(
+            f"{result.name:<16} {result.vectors:>8} {result.accuracy:>9.3f} "
+            f"{result.row_us:>8.1f} {result.batch_ms:>14.2f} "
+            f"{result.artifact_bytes / 1024:>13.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _measure(  # pylint: disable=too-many-arguments
+    name: str,
+    budget: Optional[int],
+    model_: Any,
+    encoder: TitanicEncoder,
+    x_test_enc: np.ndarray,
+    y_test: np.ndarray,
+    repeat: int,
+) -> BudgetResult:
+    """Save <model_> as an artifact, and measure its accuracy, latency and size.
+
+    Args:
+        name:       Name of the model in the report.
+        budget:     Budget of kernel basis vectors of the model, if any.
+        model_:     The trained ML model, of a backend with an artifact.
+        encoder:    The fitted encoder that <model_> was trained with.
+        x_test_enc: Encoded Titanic data to test on.
+        y_test:     Titanic survival labels to test on.
+        repeat:     Number of times to time each prediction latency.
+
+    Returns:
+        The result of <model_>.
+    """
+    # Predict with the memory-mapped artifact, as the API does
+    with tempfile.TemporaryDirectory() as path:
+        artifact.save(path, model_, encoder)
+        size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+        predictor, _ = artifact.load(path)
+
+        accuracy = float(np.mean(predictor.predict(x_test_enc) == y_test))
+        row_time = _median_time(predictor.predict_proba, x_test_enc[:1], repeat)
+        batch_time = _median_time(predictor.predict_proba, x_test_enc[:BATCH], repeat)
+
+    vectors = getattr(predictor, "support_vectors", getattr(predictor, "basis", []))
+    return BudgetResult(
+        name=name,
+        budget=budget,
+        vectors=len(vectors),
+        accuracy=accuracy,
+        row_us=row_time * 1e6,
+        batch_ms=batch_time * 1e3,
+        artifact_bytes=size,
+    )
+
+
+def _median_time(func: Any, data: np.ndarray, repeat: int) -> float:
+    """Time <func> called with <data> <repeat> times.
+
+    Args:
+        func:   Function to time.
+        data:   Argument of <func>.
+        repeat: Number of times to time <func>.
+
+    Returns:
+        Median wall time of <func>, in seconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--rows", type=int, default=ROWS, help="Number of rows of the dataset."
+    )
+    arg_parser.add_argument(
+        "--budgets",
+        type=int,
+        nargs="+",
+        default=BUDGETS,
+        help="Budgets of kernel basis vectors of the budgeted models.",
+    )
+    arg_parser.add_argument(
+        "--repeat",
+        type=int,
+        default=REPEAT,
+        help="Number of times to time each prediction latency.",
+    )
+    args = arg_parser.parse_args()
+
+    print(report(run(args.rows, args.budgets, args.repeat)))
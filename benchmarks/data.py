@@ -0,0 +1,27 @@
+"""Synthetic raw Titanic datasets for benchmarks, scaled from the bundled CSV."""
+import functools
+import pandas as pd
+from titanic.data import generator
+
+
+@functools.lru_cache(maxsize=None)
+def _profile() -> generator.Profile:
+    """Fit the distributions of the bundled CSV once, for all datasets.
+
+    Returns:
+        The fitted Profile of the bundled CSV.
+    """
+    return generator.fit()
+
+
+def scaled_raw(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Create a raw Titanic dataset of <rows> rows, generated from the bundled CSV.
+
+    Args:
+        rows:   Number of rows of the dataset.
+        seed:   Seed of the random generation, for reproducible datasets.
+
+    Returns:
+        The raw Titanic DataFrame, with the same columns as the bundled CSV.
+    """
+    return pd.concat(generator.generate(_profile(), rows, seed), ignore_index=True)
@@ -0,0 +1,120 @@
+"""Import time report of the API, from Python's -X importtime output.
+
+The API is imported in a fresh interpreter, as a cold start of an API worker does,
+and the report lists the modules that took the longest to import. Importing any of
+the training-only packages fails the report, as serving only needs NumPy.
+"""
+import sys
+import argparse
+import subprocess  # nosec
+from dataclasses import dataclass
+from typing import List
+
+API_MODULE = "titanic.api.provider.api"
+
+# Packages that only training needs, and that the API must not import
+TRAINING_ONLY = ("sklearn", "scipy", "pandas", "dateutil")
+
+
+@dataclass
+class ImportTime:
+    """Import time of one module, in microseconds."""
+
+    module: str
+    # Time of the module itself, and including the modules that it imported
+    self_us: int
+    cumulative_us: int
+
+
+def measure(module: str = API_MODULE) -> List[ImportTime]:
+    """Import <module> in a fresh interpreter, and measure the import of each module.
+
+    Args:
+        module: Name of the module to import.
+
+    Returns:
+        Import time of every module that was imported, in import order.
+    """
+    process = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return parse(process.stderr)
+
+
+def parse(output: str) -> List[ImportTime]:
+    """Parse the -X importtime <output> of an interpreter.
+
+    Args:
+        output: The stderr of the interpreter, e.g. lines like
+                "import time:       416 |      59125 |   fastapi.security".
+
+    Returns:
+        Import time of every module in <output>, in import order.
+    """
+    times = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line.replace("import time:", "").split("|")
+        if not self_us.strip().isdigit():
+            # The header line, e.g. "import time: self [us] | cumulative | ..."
+            continue
+        times.append(ImportTime(module.strip(), int(self_us), int(cumulative_us)))
+    return times
+
+
+def training_only(times: List[ImportTime]) -> List[str]:
+    """Find the training-only packages that were imported.
+
+    Args:
+        times:  Import time of every imported module.
+
+    Returns:
+        Names of the imported training-only packages.
+    """
+    imported = {time.module.split(".")[0] for time in times}
+    return [package for package in TRAINING_ONLY if package in imported]
+
+
+def report(times: List[ImportTime], module: str = API_MODULE, top: int = 15) -> str:
+    """Format the <top> slowest imports of <times>, and the total import time.
+
+    Args:
+        times:  Import time of every imported module.
+        module: Name of the imported module, to report the total import time of.
+        top:    Number of modules with the longest cumulative import time to report.
+
+    Returns:
+        The report, as lines of text.
+    """
+    total = next(t.cumulative_us for t in times if t.module == module)
+    lines = [f"{'module':<48} {'self ms':>10} {'cumulative ms':>14}"]
+    for time in sorted(times, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        lines.append(
+            f"{time.module:<48} {time.self_us / 1000:>10.1f} "
+            f"{time.cumulative_us / 1000:>14.1f}"
+        )
+    lines.append(f"Total import time of {module}: {total / 1000:.1f} ms")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--module", default=API_MODULE, help="Name of the module to import."
+    )
+    arg_parser.add_argument(
+        "--top", type=int, default=15, help="Number of slowest imports to report."
+    )
+    args = arg_parser.parse_args()
+
+    import_times = measure(args.module)
+    print(report(import_times, args.module, args.top))
+
+    imported_training_only = training_only(import_times)
+    if imported_training_only:
+        print(f"ERROR training-only packages imported: {imported_training_only}")
+        sys.exit(1)
@@ -0,0 +1,86 @@
+"""Peak memory of encoding and training densely vs sparsely, on large datasets.
+
+Peak memory is measured with tracemalloc, so only memory allocated by Python and
+NumPy is included, and not e.g. liblinear's own copy of the training data.
+"""
+import argparse
+from dataclasses import dataclass
+from typing import Any, Callable, List
+from titanic.ml import model
+from titanic.ml.backends import Backend
+from titanic.preprocessing import parser, stream
+from titanic.preprocessing.encoder import TitanicEncoder
+from .data import scaled_raw
+
+ROWS = 1_000_000
+
+
+@dataclass
+class MemoryResult:
+    """Peak memory of one function, on one dataset size."""
+
+    name: str
+    rows: int
+    peak_bytes: int
+
+
+def run(rows: int = ROWS) -> List[MemoryResult]:
+    """Measure the peak memory of encoding and training, densely and sparsely.
+
+    Args:
+        rows:   Number of rows of the synthetic dataset to measure on.
+
+    Returns:
+        Peak memory of each function.
+    """
+    data, labels = parser.create_titanic_columns(scaled_raw(rows))
+    encoder = TitanicEncoder()
+    encoder.fit(data)
+
+    funcs: List[Any] = [
+        ("TitanicEncoder.encode", encoder.encode),
+        ("TitanicEncoder.encode_sparse", encoder.encode_sparse),
+    ]
+    for sparse in (False, True):
+        funcs.append(
+            (
+                f"model.train logistic_regression sparse={sparse}",
+                _trainer(encoder, labels, sparse),
+            )
+        )
+
+    results = []
+    for name, func in funcs:
+        _, peak = stream.peak_memory(func, data)
+        results.append(MemoryResult(name, rows, peak))
+        print(f"{name:<48} {rows:>10} rows {peak / 2**20:>10.1f} MiB")
+    return results
+
+
+def _trainer(encoder: TitanicEncoder, labels: Any, sparse: bool) -> Callable[..., Any]:
+    """Create a function that trains a logistic regression on its data argument.
+
+    Args:
+        encoder:    The fitted encoder to encode the data with.
+        labels:     Labels of the data.
+        sparse:     Whether to train on sparse encoded data.
+
+    Returns:
+        The training function.
+    """
+    return lambda data: model.train(
+        data, labels, encoder, backend=Backend.LOGISTIC_REGRESSION, sparse=sparse
+    )
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--rows",
+        type=int,
+        default=ROWS,
+        help="Number of rows of the synthetic dataset to measure on.",
+    )
+    args = arg_parser.parse_args()
+
+    run(args.rows)
@@ -0,0 +1,93 @@
+"""Machine-readable JSON reports of benchmark results, and regression checks."""
+import json
+import platform
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+import sklearn
+from .suite import Result
+
+# Relative slowdown of the median wall time that is flagged as a regression
+THRESHOLD = 0.2
+
+
+@dataclass
+class Regression:
+    """A benchmark that got slower than its baseline."""
+
+    name: str
+    rows: int
+    baseline: float
+    median: float
+
+    @property
+    def slowdown(self) -> float:
+        """Relative slowdown of the median wall time, e.g. 0.5 for 50% slower."""
+        return self.median / self.baseline - 1.0
+
+
+def write(results: List[Result], path: str) -> None:
+    """Write benchmark <results> as a JSON report to <path>.
+
+    The report includes the environment that the benchmarks were run in, as results
+    are only comparable between runs in the same environment.
+
+    Args:
+        results:    Benchmark results to write.
+        path:       Path of the JSON report.
+    """
+    report = {
+        "created": datetime.now().strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "sklearn": sklearn.__version__,
+        },
+        "results": [asdict(result) for result in results],
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+
+
+def read(path: str) -> List[Result]:
+    """Read benchmark results from the JSON report at <path>.
+
+    Args:
+        path:   Path of the JSON report.
+
+    Returns:
+        The benchmark results of the report.
+    """
+    with open(path, encoding="utf-8") as file:
+        report: Dict[str, Any] = json.load(file)
+    return [Result(**result) for result in report["results"]]
+
+
+def compare(
+    results: List[Result], baseline: List[Result], threshold: float = THRESHOLD
+) -> List[Regression]:
+    """Compare benchmark <results> to a <baseline>, and flag regressions.
+
+    Benchmarks are matched by name and number of rows, and benchmarks without a
+    baseline are skipped.
+
+    Args:
+        results:    Benchmark results to check.
+        baseline:   Benchmark results to compare to, e.g. of the main branch.
+        threshold:  Relative slowdown of the median wall time to flag.
+
+    Returns:
+        The benchmarks whose median wall time is more than <threshold> slower.
+    """
+    baselines = {(result.name, result.rows): result.median for result in baseline}
+    regressions = [
+        Regression(result.name, result.rows, baselines[key], result.median)
+        for result in results
+        for key in [(result.name, result.rows)]
+        if key in baselines
+    ]
+    return [regression for regression in regressions if regression.slowdown > threshold]
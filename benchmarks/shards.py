@@ -0,0 +1,86 @@
+"""Scaling of parallel sharded ingestion with the number of processes.
+
+Writes a synthetic raw dataset as CSV shards, and ingests it with 1, 2, 4, ... up
+to all cores, reporting the wall time and speedup over one process. Parsing the
+shards is independent, so the speedup should be near-linear, up to the time of
+merging the shards in the main process.
+"""
+import os
+import time
+import argparse
+import tempfile
+from dataclasses import dataclass
+from typing import List, Optional
+from titanic.preprocessing import shards
+from .data import scaled_raw
+
+ROWS = 1_000_000
+SHARDS = 16
+
+
+@dataclass
+class ScalingResult:
+    """Wall time of ingesting all shards with a number of processes."""
+
+    processes: int
+    rows: int
+    seconds: float
+    speedup: float
+
+
+def run(
+    rows: int = ROWS, n_shards: int = SHARDS, max_processes: Optional[int] = None
+) -> List[ScalingResult]:
+    """Ingest <rows> rows of <n_shards> shards with increasing numbers of processes.
+
+    Args:
+        rows:           Total number of rows of the synthetic dataset.
+        n_shards:       Number of CSV shards to split the dataset into.
+        max_processes:  Max number of processes, default all cores.
+
+    Returns:
+        Result of each number of processes, starting with 1.
+    """
+    max_processes = max_processes or os.cpu_count() or 1
+    counts = [
+        2 ** i for i in range(max_processes.bit_length()) if 2 ** i < max_processes
+    ]
+
+    results: List[ScalingResult] = []
+    with tempfile.TemporaryDirectory() as path:
+        # Write the shards, each of an equal part of the dataset
+        raw = scaled_raw(rows)
+        for i in range(n_shards):
+            start, end = i * rows // n_shards, (i + 1) * rows // n_shards
+            raw.iloc[start:end].to_csv(f"{path}/part-{i:05d}.csv", index=False)
+        del raw
+
+        for processes in [*counts, max_processes]:
+            start_time = time.perf_counter()
+            shards.ingest(path, processes)
+            seconds = time.perf_counter() - start_time
+            speedup = results[0].seconds / seconds if results else 1.0
+            results.append(ScalingResult(processes, rows, seconds, speedup))
+            print(
+                f"{processes:>3} processes {rows:>10} rows {seconds:>8.2f} s "
+                f"{speedup:>5.2f}x"
+            )
+    return results
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--rows", type=int, default=ROWS, help="Total number of rows of the dataset."
+    )
+    arg_parser.add_argument(
+        "--shards", type=int, default=SHARDS, help="Number of CSV shards."
+    )
+    arg_parser.add_argument(
+        "--max-processes",
+        type=int,
+        help="Max number of processes (default: all cores).",
+    )
+    args = arg_parser.parse_args()
+
+    run(args.rows, args.shards, args.max_processes)
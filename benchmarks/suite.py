@@ -0,0 +1,236 @@
+"""Benchmarks of each stage of training and serving Titanic ML models."""
+import time
+import statistics
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+import pandas as pd
+from fastapi.testclient import TestClient
+from titanic.api.provider.api import app
+from titanic.api.provider.endpoints.titanic import titanic
+from titanic.ml import model
+from titanic.preprocessing import parser
+from titanic.preprocessing.encoder import TitanicEncoder
+from titanic.preprocessing.feature_engineering import feature_engineering
+from . import imports
+from .data import scaled_raw
+
+# Number of rows of the synthetic datasets to benchmark on
+ROWS = [10_000, 100_000, 1_000_000]
+
+# Number of requests to time per repeat of the API benchmark
+REQUESTS = 100
+
+
+@dataclass
+class Benchmark:
+    """A benchmark of one function, on raw Titanic datasets of different sizes."""
+
+    name: str
+    # Prepare the arguments of <func> from a raw dataset, outside of the timing
+    setup: Callable[[pd.DataFrame], Any]
+    # Function to time, called with what <setup> returned
+    func: Callable[[Any], Any]
+    # Max number of rows to benchmark on, if <func> doesn't scale to all sizes
+    max_rows: Optional[int] = None
+    # Whether the function doesn't depend on the dataset, and is timed once only
+    fixed: bool = False
+
+
+@dataclass
+class Result:
+    """Wall times of one benchmark on one dataset size, in seconds."""
+
+    name: str
+    rows: int
+    min: float
+    median: float
+    repeat: int
+
+
+def _columns(raw: pd.DataFrame) -> Any:
+    """Parse <raw> into columns, to benchmark encoding and training on.
+
+    Args:
+        raw:    Raw Titanic dataset.
+
+    Returns:
+        Tuple of the columnar Titanic dataset and its y labels.
+    """
+    return parser.create_titanic_columns(raw)
+
+
+def _fitted(raw: pd.DataFrame) -> Any:
+    """Parse <raw> into columns and fit an encoder on them, to benchmark encode().
+
+    Args:
+        raw:    Raw Titanic dataset.
+
+    Returns:
+        Tuple of the fitted encoder and the columnar Titanic dataset.
+    """
+    data, _ = parser.create_titanic_columns(raw)
+    encoder = TitanicEncoder()
+    encoder.fit(data)
+    return encoder, data
+
+
+def _queries(raw: pd.DataFrame) -> Any:
+    """Create a test client and distinct queries, to benchmark the API on.
+
+    The queries are distinct, and the prediction cache is cleared before each repeat,
+    so that every timed request is predicted instead of served from the cache.
+
+    Args:
+        raw:    Raw Titanic dataset, only used for its number of rows.
+
+    Returns:
+        Tuple of the test client and the queries.
+    """
+    client = TestClient(app)
+    query = (
+        "/titanic/survived?personClass=upper&nameTitle=Mrs&sex=female&age=28"
+        "&siblingsSpouses=2&cabinLetter=A&cabinNumber=40&embarked=cherbourg"
+        "&ticketPrice={}"
+    )
+    queries = [
+        query.format(80 + i / REQUESTS)
+        for i in range(len(raw) if len(raw) < REQUESTS else REQUESTS)
+    ]
+    # Load the model before timing, as the API does at startup, with another query
+    # than the timed ones, and clear the predictions cached by previous repeats
+    client.get(query.format(79)).raise_for_status()
+    titanic.cache.invalidate(titanic.registry.get().version)
+    return client, queries
+
+
+def _get_all(args: Any) -> None:
+    """Send every query of <args> to the API, and check the responses.
+
+    Args:
+        args:   Tuple of the test client and the queries.
+    """
+    client, queries = args
+    for query in queries:
+        client.get(query).raise_for_status()
+
+
+BENCHMARKS = [
+    Benchmark(
+        "parser.create_titanic",
+        setup=lambda raw: raw,
+        func=parser.create_titanic,
+        max_rows=100_000,
+    ),
+    Benchmark(
+        "parser.create_titanic_columns",
+        setup=lambda raw: raw,
+        func=parser.create_titanic_columns,
+    ),
+    Benchmark(
+        "feature_engineering",
+        setup=lambda raw: raw.rename(columns=parser.RENAME_COLUMNS),
+        func=feature_engineering,
+    ),
+    Benchmark(
+        "TitanicEncoder.fit",
+        setup=lambda raw: _columns(raw)[0],
+        func=lambda data: TitanicEncoder().fit(data),
+    ),
+    Benchmark(
+        "TitanicEncoder.encode",
+        setup=_fitted,
+        func=lambda args: args[0].encode(args[1]),
+    ),
+    Benchmark(
+        "TitanicEncoder.encode_sparse",
+        setup=_fitted,
+        func=lambda args: args[0].encode_sparse(args[1]),
+    ),
+    # SVC training time is superlinear in the number of rows
+    Benchmark(
+        "model.train",
+        setup=_columns,
+        func=lambda args: model.train(*args),
+        max_rows=10_000,
+    ),
+    Benchmark(
+        "model.load_latest",
+        setup=lambda raw: None,
+        func=lambda _: model.load_latest(),
+        fixed=True,
+    ),
+    # Cold start of an API worker, see imports.py for the report of each module
+    Benchmark(
+        f"import {imports.API_MODULE}",
+        setup=lambda raw: None,
+        func=lambda _: imports.measure(),
+        fixed=True,
+    ),
+    Benchmark(
+        f"GET /titanic/survived x{REQUESTS}",
+        setup=_queries,
+        func=_get_all,
+        fixed=True,
+    ),
+]
+
+
+def run(
+    rows: Optional[List[int]] = None,
+    repeat: int = 3,
+    names: Optional[List[str]] = None,
+) -> List[Result]:
+    """Run the benchmarks on synthetic datasets of each size in <rows>.
+
+    Args:
+        rows:   Number of rows of each synthetic dataset, default ROWS.
+        repeat: Number of times to time each benchmark.
+        names:  Optional names of the benchmarks to run, default all of them.
+
+    Returns:
+        Result of each benchmark on each dataset size it was run on.
+    """
+    results: List[Result] = []
+    for size in sorted(ROWS if rows is None else rows):
+        raw = scaled_raw(size)
+        for bench in BENCHMARKS:
+            # Fixed benchmarks are only run once, on the smallest dataset
+            done = bench.fixed and any(r.name == bench.name for r in results)
+            too_large = bench.max_rows is not None and size > bench.max_rows
+            if done or too_large or (names is not None and bench.name not in names):
+                continue
+
+            results.append(_time(bench, raw, repeat))
+            print(
+                f"{bench.name:<36} {results[-1].rows:>10} rows "
+                f"{results[-1].median:>10.4f} s"
+            )
+
+    return results
+
+
+def _time(bench: Benchmark, raw: pd.DataFrame, repeat: int) -> Result:
+    """Time <bench> on <raw> <repeat> times.
+
+    Args:
+        bench:  The benchmark to time.
+        raw:    Raw Titanic dataset to benchmark on.
+        repeat: Number of times to time the benchmark.
+
+    Returns:
+        The min and median wall times of the benchmark.
+    """
+    times = []
+    for _ in range(repeat):
+        args = bench.setup(raw)
+        start = time.perf_counter()
+        bench.func(args)
+        times.append(time.perf_counter() - start)
+
+    return Result(
+        name=bench.name,
+        rows=0 if bench.fixed else len(raw),
+        min=min(times),
+        median=statistics.median(times),
+        repeat=repeat,
+    )
@@ -1 +1,112 @@
 """Test API consumer functions."""
+import json
+import asyncio
+import threading
+import contextlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List
+from urllib.parse import parse_qs, urlparse
+import pandas as pd
+from titanic.api.consumer.api import APIConnector, AsyncAPIConnector
+from titanic.api.consumer.endpoints import Endpoint
+
+TRAIN_PATH = "titanic/data/csv/train.csv"
+
+
+class StandIn(ThreadingHTTPServer):
+    """Local stand-in of the upstream API, serving the raw Titanic CSV dataset."""
+
+    records: List[Dict[str, Any]]
+    put: List[Dict[str, Any]]
+    failures: int
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Serve pages of raw Titanic records as NDJSON, and receive NDJSON records."""
+
+    server: StandIn
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name
+        """Respond with a page of records, after failing <failures> times."""
+        if self.server.failures > 0:
+            self.server.failures -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        query = parse_qs(urlparse(self.path).query)
+        page, size = int(query["page"][0]), int(query["pageSize"][0])
+        start, end = page * size, (page + 1) * size
+        records = self.server.records[start:end]
+        body = "".join(json.dumps(record) + "\n" for record in records).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Total-Count", str(len(self.server.records)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self) -> None:  # pylint: disable=invalid-name
+        """Receive NDJSON records."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.put.extend(json.loads(line) for line in body.splitlines())
+        self.send_response(204)
+        self.end_headers()
+
+    def log_message(self, *_: Any) -> None:  # pylint: disable=arguments-differ
+        """Don't log requests."""
+
+
+@contextlib.contextmanager
+def stand_in(failures: int = 0) -> Iterator[StandIn]:
+    """Serve the stand-in API on a free local port, until the context exits."""
+    raw = pd.read_csv(TRAIN_PATH)
+    server = StandIn(("127.0.0.1", 0), Handler)
+    server.records = json.loads(raw.to_json(orient="records"))
+    server.put = []
+    server.failures = failures
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_fetch_titanic_concurrent_pages_with_retry():
+    """Verify all pages are fetched into the raw DataFrame, retrying failures."""
+    # setup
+    raw = pd.read_csv(TRAIN_PATH)
+    with stand_in(failures=2) as server:
+        url = f"http://127.0.0.1:{server.server_port}"
+        with APIConnector(base_url=url, backoff=0.01) as api:
+
+            # when
+            df = api.fetch_titanic(page_size=100)
+
+    # then
+    pd.testing.assert_frame_equal(df, raw, check_like=True)
+
+
+def test_async_fetch_and_put_bulk():
+    """Verify the asyncio connector fetches all pages, and puts records in bulk."""
+    # setup
+    raw = pd.read_csv(TRAIN_PATH)
+    records = [{"PassengerId": i, "Survived": i % 2} for i in range(250)]
+
+    async def fetch_and_put(url: str) -> Any:
+        async with AsyncAPIConnector(APIConnector(base_url=url)) as api:
+            df = await api.fetch(Endpoint.GET_TITANIC_DATA, page_size=200)
+            ok = await api.put_bulk("/predictions", records, batch_size=100)
+            return df, ok
+
+    with stand_in() as server:
+        # when
+        df, ok = asyncio.run(fetch_and_put(f"http://127.0.0.1:{server.server_port}"))
+
+        # then
+        assert ok
+        assert sorted(server.put, key=lambda r: r["PassengerId"]) == records
+    pd.testing.assert_frame_equal(df, raw, check_like=True)
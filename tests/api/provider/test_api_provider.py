@@ -1,10 +1,27 @@
 """Test API provider endpoints."""
+import json
 from fastapi import status
 from fastapi.testclient import TestClient
 from titanic.api.provider.api import app
+from titanic.api.provider.endpoints.titanic import titanic
+from titanic.api.provider.executor import Saturated
+from titanic.ml import model
 
 api = TestClient(app)
 
+PASSENGER = {
+    "personClass": "upper",
+    "nameTitle": "Mrs",
+    "sex": "female",
+    "age": 28,
+    "siblingsSpouses": 2,
+    "parentsChildren": 0,
+    "cabinLetter": "A",
+    "cabinNumber": 40,
+    "embarked": "cherbourg",
+    "ticketPrice": 80.2,
+}
+
 
 def test_get_predict_survival():
     """Verify API predicts survival given input parameters."""
@@ -35,3 +52,105 @@ def test_get_predict_survival2():
 
     # then
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_get_model_info():
+    """Verify API returns the version of the loaded model."""
+    # when
+    response = api.get("/titanic/model")
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["version"] == model.latest_version()
+
+
+def test_post_predict_survival_batch():
+    """Verify API predicts survival of a batch of passengers."""
+    # setup
+    passengers = [PASSENGER, {**PASSENGER, "sex": "male", "nameTitle": "Mr"}]
+
+    # when
+    response = api.post("/titanic/survived/batch", json=passengers)
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["survived"]) == 2
+
+
+def test_post_predict_survival_stream():
+    """Verify API streams survival predictions of NDJSON passengers.
+
+    The second line is not a valid passenger, which should be streamed back as an
+    error without stopping the predictions of the other passengers.
+    """
+    # setup
+    lines = [PASSENGER, {**PASSENGER, "sex": "unknown"}, PASSENGER]
+    body = "\n".join(json.dumps(line) for line in lines)
+
+    # when
+    response = api.post("/titanic/survived/batch/stream", data=body)
+    results = [json.loads(line) for line in response.text.splitlines()]
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert [result["line"] for result in results] == [2, 1, 3]
+    assert "error" in results[0]
+    assert isinstance(results[1]["survived"], float)
+
+
+def test_post_predict_survival_stream_saturated(monkeypatch):
+    """Verify API streams errors for passengers that can't be predicted as saturated.
+
+    The response has already started when a batch is predicted, so the passengers of
+    the batch should be streamed back as errors instead of failing the response.
+    """
+    # setup
+    async def saturated(loaded, data):
+        raise Saturated(f"{len(data)} passengers of {loaded.version}")
+
+    monkeypatch.setattr(titanic, "predict_async", saturated)
+    body = "\n".join(json.dumps(PASSENGER) for _ in range(2))
+
+    # when
+    response = api.post("/titanic/survived/batch/stream", data=body)
+    results = [json.loads(line) for line in response.text.splitlines()]
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert [result["line"] for result in results] == [1, 2]
+    assert all("retry later" in result["error"] for result in results)
+
+
+def test_get_predict_survival_cached():
+    """Verify API returns repeated predictions from the cache."""
+    # setup
+    query = "/titanic/survived?personClass=lower&nameTitle=Mr&sex=male&age=40\
+&siblingsSpouses=0&cabinLetter=none&cabinNumber=0&embarked=queenstown&ticketPrice=7.5"
+    prediction = api.get(query).json()["survived"]
+    hits = api.get("/titanic/cache").json()["hits"]
+
+    # when
+    response = api.get(query)
+
+    # then
+    assert response.json()["survived"] == prediction
+    assert api.get("/titanic/cache").json()["hits"] == hits + 1
+
+
+def test_get_metrics():
+    """Verify API exposes request, stage, model and cache metrics."""
+    # setup
+    api.post("/titanic/survived/batch", json=[PASSENGER])
+
+    # when
+    response = api.get("/metrics")
+
+    # then
+    assert response.status_code == status.HTTP_200_OK
+    assert (
+        'titanic_requests_total{method="POST",route="/titanic/survived/batch",'
+        'status="200"}' in response.text
+    )
+    assert 'titanic_stage_duration_seconds_count{stage="encode"}' in response.text
+    assert "titanic_model_loaded_timestamp_seconds{version=" in response.text
+    assert 'titanic_cache_events_total{event="hits"}' in response.text
@@ -0,0 +1,54 @@
+"""Test micro-batching of single passenger predictions."""
+import asyncio
+from typing import List
+import pytest
+from titanic.api.provider.batcher import MicroBatcher
+from titanic.api.provider.executor import Saturated
+
+
+def test_micro_batcher_batches_concurrent_submits():
+    """Verify concurrent submits are predicted in batches of at most max_size."""
+    # setup
+    batches: List[List[float]] = []
+
+    async def predict(loaded, data):
+        batches.append(data)
+        return [loaded + value for value in data]
+
+    batcher = MicroBatcher(predict, window=0.05, max_size=4)
+
+    async def submit_all():
+        preds = await asyncio.gather(*(batcher.submit(100, i) for i in range(10)))
+        batcher.stop()
+        return preds
+
+    # when
+    preds = asyncio.run(submit_all())
+
+    # then
+    assert preds == [100 + i for i in range(10)]
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+
+def test_micro_batcher_saturated():
+    """Verify submits are rejected once max_queue passengers are queued."""
+    # setup
+    async def predict(loaded, data):
+        return [loaded + value for value in data]
+
+    batcher = MicroBatcher(predict, window=0.05, max_size=4, max_queue=2)
+
+    async def submit_all():
+        results = await asyncio.gather(
+            *(batcher.submit(100, i) for i in range(3)), return_exceptions=True
+        )
+        batcher.stop()
+        return results
+
+    # when
+    results = asyncio.run(submit_all())
+
+    # then
+    assert results[:2] == [100, 101]
+    with pytest.raises(Saturated):
+        raise results[2]
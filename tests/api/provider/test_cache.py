@@ -0,0 +1,55 @@
+"""Test PredictionCache."""
+from titanic.api.provider.cache import PredictionCache
+
+
+def test_cache_evicts_least_recently_used():
+    """Verify the least recently used prediction is evicted when the cache is full."""
+    # setup
+    cache = PredictionCache(max_size=2)
+    cache.invalidate("v1")
+    cache.put("a", "v1", 0.1)
+    cache.put("b", "v1", 0.2)
+
+    # when
+    cache.get("a", "v1")
+    cache.put("c", "v1", 0.3)
+
+    # then
+    assert cache.get("a", "v1") == 0.1
+    assert cache.get("b", "v1") is None
+    assert cache.stats.evictions == 1
+
+
+def test_cache_invalidated_by_new_model_version():
+    """Verify cached predictions are cleared when a new model version is loaded, and
+    predictions of the old version are not cached after the swap.
+    """
+    # setup
+    cache = PredictionCache()
+    cache.invalidate("v1")
+    cache.put("a", "v1", 0.1)
+
+    # when
+    cache.invalidate("v2")
+    cache.put("b", "v2", 0.2)
+    cache.put("c", "v1", 0.3)
+
+    # then
+    assert cache.get("a", "v2") is None
+    assert cache.get("b", "v2") == 0.2
+    assert cache.get("b", "v1") is None
+    assert len(cache) == 1
+    assert cache.stats.invalidations == 1
+
+
+def test_cache_expires_predictions():
+    """Verify predictions are not returned after their time to live."""
+    # setup
+    cache = PredictionCache(ttl=-1.0)
+    cache.invalidate("v1")
+
+    # when
+    cache.put("a", "v1", 0.1)
+
+    # then
+    assert cache.get("a", "v1") is None
@@ -0,0 +1,43 @@
+"""Test InferenceExecutor."""
+import asyncio
+import pytest
+from titanic.api.provider.endpoints.titanic import titanic
+from titanic.api.provider.endpoints.titanic.models import Passenger
+from titanic.api.provider.executor import InferenceExecutor, Saturated
+from titanic.ml.registry import ModelRegistry
+from .test_api_provider import PASSENGER
+
+
+def test_executor_predicts_like_in_process():
+    """Verify worker processes predict the same as predicting in-process."""
+    # setup
+    loaded = ModelRegistry().get()
+    data = [Passenger.parse_obj(PASSENGER).to_titanic()] * 3
+    executor = InferenceExecutor(processes=2)
+    executor.start(loaded.version)
+
+    # when
+    try:
+        preds = asyncio.run(executor.predict(loaded, data))
+    finally:
+        executor.stop()
+
+    # then
+    assert preds == pytest.approx(titanic.predict(loaded, data))
+    assert executor.pending == 0
+
+
+def test_executor_saturated():
+    """Verify predictions are rejected once max_pending predictions are pending."""
+    # setup
+    loaded = ModelRegistry().get()
+    data = [Passenger.parse_obj(PASSENGER).to_titanic()]
+    executor = InferenceExecutor(processes=1, max_pending=0)
+    executor.start(loaded.version)
+
+    # when / then
+    try:
+        with pytest.raises(Saturated):
+            asyncio.run(executor.predict(loaded, data))
+    finally:
+        executor.stop()
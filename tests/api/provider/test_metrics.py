@@ -0,0 +1,24 @@
+"""Test Prometheus metrics."""
+from titanic.api.provider import metrics
+
+
+def test_histogram_and_counter_exposition():
+    """Verify metrics are exposed with cumulative buckets, sums and counts."""
+    # setup
+    counter = metrics.Counter("test_total", "Test counter.", ["route"])
+    histogram = metrics.Histogram("test_seconds", "Test histogram.", buckets=[0.1, 1])
+
+    # when
+    counter.inc('/a"b')
+    counter.inc('/a"b', amount=2.0)
+    for value in [0.05, 0.1, 0.5, 5.0]:
+        histogram.observe(value)
+    text = metrics.expose()
+
+    # then
+    assert 'test_total{route="/a\\"b"} 3.0' in text
+    assert 'test_seconds_bucket{le="0.1"} 2.0' in text
+    assert 'test_seconds_bucket{le="1"} 3.0' in text
+    assert 'test_seconds_bucket{le="+Inf"} 4.0' in text
+    assert "test_seconds_sum 5.65" in text
+    assert "test_seconds_count 4.0" in text
@@ -0,0 +1,105 @@
+"""Test on-demand request profiling."""
+import os
+import threading
+from fastapi import status
+from fastapi.testclient import TestClient
+from titanic.api.provider import api as api_module
+from titanic.api.provider import profiler
+from titanic.api.provider.profiler import RequestProfiler, Sampler
+
+
+def test_sampler_folds_stacks_of_other_threads():
+    """Verify the sampler samples the stacks of other threads, from their root."""
+    # setup
+    stop = threading.Event()
+
+    def busy_wait() -> None:
+        while not stop.is_set():
+            pass
+
+    thread = threading.Thread(target=busy_wait, name="busy")
+    thread.start()
+    sampler = Sampler(interval=0.001)
+
+    # when
+    sampler.start()
+    threading.Event().wait(0.05)
+    samples = sampler.stop()
+    stop.set()
+    thread.join()
+
+    # then
+    busy = [stack for stack in samples if stack.startswith("busy;")]
+    assert busy and all(":busy_wait" in stack for stack in busy)
+    assert not any(stack.startswith("profile-sampler;") for stack in samples)
+
+
+def test_profile_request_with_token(tmp_path, monkeypatch):
+    """Verify only requests with the profiling token are profiled, and saved."""
+    # setup
+    request_profiler = RequestProfiler(token="secret", path=str(tmp_path), keep=1)
+    monkeypatch.setattr(api_module, "profiler", request_profiler)
+    client = TestClient(api_module.app)
+
+    # when
+    unprofiled = client.get("/titanic/model")
+    wrong = client.get("/titanic/model", headers={profiler.PROFILE_HEADER: "wrong"})
+    responses = [
+        client.get("/titanic/model", headers={profiler.PROFILE_HEADER: "secret"})
+        for _ in range(2)
+    ]
+
+    # then
+    assert profiler.PROFILE_ID_HEADER not in unprofiled.headers
+    assert profiler.PROFILE_ID_HEADER not in wrong.headers
+    assert all(r.status_code == status.HTTP_200_OK for r in responses)
+    name = responses[-1].headers[profiler.PROFILE_ID_HEADER]
+    assert name.endswith("-titanic-model.folded")
+    assert os.listdir(tmp_path) == [name]
+    assert all(count > 0 for count in profiler.read(str(tmp_path / name)).values())
+
+
+def test_profile_named_by_route_and_never_fails_request(tmp_path, monkeypatch):
+    """Verify profiles are named by route, and failing to save doesn't fail requests.
+
+    Unmatched URLs of any length should be named as unmatched, and not by their
+    path. A profiles folder that can't be created should only skip the profile.
+    """
+    # setup
+    request_profiler = RequestProfiler(rate=1.0, path=str(tmp_path / "profiles"))
+    monkeypatch.setattr(api_module, "profiler", request_profiler)
+    client = TestClient(api_module.app)
+    blocked = tmp_path / "blocked"
+    blocked.write_text("", encoding="utf-8")
+
+    # when
+    unmatched = client.get("/" + "x" * 1000)
+    request_profiler.path = str(blocked)
+    unsaved = client.get("/titanic/model")
+
+    # then
+    assert unmatched.status_code == status.HTTP_404_NOT_FOUND
+    assert unmatched.headers[profiler.PROFILE_ID_HEADER].endswith("-unmatched.folded")
+    assert unsaved.status_code == status.HTTP_200_OK
+    assert profiler.PROFILE_ID_HEADER not in unsaved.headers
+
+
+def test_profiles_of_worker_processes_saved_apart(tmp_path, monkeypatch):
+    """Verify profilers of two worker processes, saving in the same second, don't
+    overwrite each other's profiles, although their counters both start at 0.
+    """
+    # setup
+    workers = [RequestProfiler(path=str(tmp_path)) for _ in range(2)]
+    samples = profiler.Sampler().samples
+    samples["MainThread;module:function"] = 1
+    monkeypatch.setattr(profiler.time, "strftime", lambda _: "20260101T000000")
+
+    # when
+    names = []
+    for pid, worker in enumerate(workers, start=100):
+        monkeypatch.setattr(profiler.os, "getpid", lambda pid=pid: pid)
+        names.append(worker.save(samples, "/titanic/model"))
+
+    # then
+    assert len(set(names)) == 2
+    assert sorted(os.listdir(tmp_path)) == sorted(names)
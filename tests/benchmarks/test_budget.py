@@ -0,0 +1,16 @@
+"""Test the comparison of budgeted and full SVC models."""
+from benchmarks import budget
+
+
+def test_budgeted_models_are_bounded():
+    """Verify budgeted models predict with at most their budget of basis vectors."""
+    # when
+    results = budget.run(rows=1000, budgets=[20], repeat=1)
+
+    # then
+    full, budgeted = results[0], results[1]
+    assert full.budget is None and budgeted.budget == 20
+    assert budgeted.vectors == 20 < full.vectors
+    assert budgeted.artifact_bytes < full.artifact_bytes
+    assert budgeted.accuracy > 0.5
+    assert "nystroem 20" in budget.report(results)
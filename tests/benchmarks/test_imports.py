@@ -0,0 +1,30 @@
+"""Test the import time report of the API."""
+from benchmarks import imports
+
+
+def test_parse_import_times():
+    """Verify -X importtime output is parsed, skipping its header."""
+    # setup
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       416 |      59125 |   fastapi.security\n"
+        "import time:     16052 |     398101 | titanic.api.provider.api\n"
+    )
+
+    # when
+    times = imports.parse(output)
+
+    # then
+    assert [t.module for t in times] == ["fastapi.security", imports.API_MODULE]
+    assert times[1].self_us == 16052
+    assert times[1].cumulative_us == 398101
+
+
+def test_api_imports_no_training_only_packages():
+    """Verify importing the API doesn't import sklearn, scipy, pandas or dateutil."""
+    # when
+    times = imports.measure()
+
+    # then
+    assert not imports.training_only(times)
+    assert imports.API_MODULE in imports.report(times)
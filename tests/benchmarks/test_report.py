@@ -0,0 +1,27 @@
+"""Test benchmark reports."""
+from benchmarks import report
+from benchmarks.suite import Result
+
+
+def test_write_read_and_compare(tmp_path):
+    """Verify reports are written and read back, and regressions are flagged."""
+    # setup
+    path = str(tmp_path / "baseline.json")
+    baseline = [
+        Result("encode", 1000, min=1.0, median=1.0, repeat=3),
+        Result("train", 1000, min=1.0, median=1.0, repeat=3),
+    ]
+    results = [
+        Result("encode", 1000, min=1.1, median=1.1, repeat=3),
+        Result("train", 1000, min=2.0, median=2.0, repeat=3),
+        Result("train", 2000, min=9.0, median=9.0, repeat=3),
+    ]
+
+    # when
+    report.write(baseline, path)
+    regressions = report.compare(results, report.read(path), threshold=0.2)
+
+    # then
+    assert report.read(path) == baseline
+    assert [(r.name, r.rows) for r in regressions] == [("train", 1000)]
+    assert regressions[0].slowdown == 1.0
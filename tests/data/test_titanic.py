@@ -1,7 +1,14 @@
 """Test Titanic dataclasses."""
+import numpy as np
 import pytest
 from pydantic.error_wrappers import ValidationError
-from titanic.data.titanic import Categorical, Numerical
+from titanic.data.titanic import (
+    Categorical,
+    Numerical,
+    TitanicColumns,
+    CATEGORICAL_ENUMS,
+    NUMERICAL_TYPES,
+)
 
 
 def test_invalid_data_types():
@@ -12,3 +19,24 @@ def test_invalid_data_types():
 
     with pytest.raises(ValidationError):
         Numerical(32, 12.5, None, True, "random_string")
+
+
+def test_invalid_columns():
+    """Verify columnar datasets cannot be created with wrong data types or codes."""
+    # setup
+    categorical = {col: np.zeros(2, dtype=np.int8) for col in CATEGORICAL_ENUMS}
+    numerical = {
+        col: np.zeros(2, dtype=type_) for col, type_ in NUMERICAL_TYPES.items()
+    }
+
+    # when
+    with pytest.raises(ValueError):
+        TitanicColumns(
+            {**categorical, "sex": np.array([0, 2], dtype=np.int8)}, numerical
+        )
+
+    with pytest.raises(ValueError):
+        TitanicColumns(categorical, {**numerical, "age": np.array([1, 2])})
+
+    with pytest.raises(ValueError):
+        TitanicColumns(categorical, {**numerical, "cabin_number": np.zeros(3)})
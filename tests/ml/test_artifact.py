@@ -0,0 +1,25 @@
+"""Test compact model artifacts."""
+import numpy as np
+import pandas as pd
+from titanic.ml import artifact, model
+from titanic.preprocessing import parser
+
+
+def test_save_and_load_artifact(tmp_path):
+    """Verify a loaded artifact encodes and predicts the same as sklearn."""
+    # setup
+    train_raw = pd.read_csv("titanic/data/csv/train.csv")
+    x_train, y_train = parser.create_titanic(train_raw)
+    model_, encoder = model.train(x_train, y_train)
+
+    # when
+    artifact.save(str(tmp_path), model_, encoder)
+    predictor, encoder_load = artifact.load(str(tmp_path))
+    x_train_enc = encoder_load.encode(x_train)
+
+    # then
+    assert np.array_equal(x_train_enc, encoder.encode(x_train))
+    assert np.allclose(
+        predictor.predict_proba(x_train_enc), model_.predict_proba(x_train_enc)
+    )
+    assert np.array_equal(predictor.predict(x_train_enc), model_.predict(x_train_enc))
@@ -0,0 +1,34 @@
+"""Test ML model backends."""
+import numpy as np
+import pandas as pd
+import pytest
+from titanic.ml import artifact, backends, model, registry
+from titanic.ml.backends import Backend
+from titanic.preprocessing import parser
+
+
+@pytest.mark.parametrize("backend", list(Backend))
+def test_backend_train_save_and_serve(backend):
+    """Verify each backend is trained, saved and loaded for serving the same way."""
+    # setup
+    train_raw = pd.read_csv("titanic/data/csv/train.csv")
+    x_train, y_train = parser.create_titanic_columns(train_raw)
+    model_, encoder = model.train(x_train, y_train, backend=backend)
+    x_train_enc = encoder.encode(x_train)
+
+    # when
+    version = model.save(model_, encoder)
+    model_load, encoder_load = registry.load(version)
+    path = f"{model.MODEL_PATH}/{version}"
+    saved_artifact = artifact.exists(path)
+    model.delete_latest()
+
+    # then
+    assert backends.backend_of(model_) == backend
+    assert saved_artifact == (backend != Backend.HIST_GRADIENT_BOOSTING)
+    assert model.test(x_train, y_train, model_, encoder) > 0.5
+    assert np.allclose(
+        model_load.predict_proba(encoder_load.encode(x_train)),
+        model_.predict_proba(x_train_enc),
+    )
+    assert np.array_equal(model_load.predict(x_train_enc), model_.predict(x_train_enc))
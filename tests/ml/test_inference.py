@@ -0,0 +1,83 @@
+"""Test NumPy inference of trained ML models and encoders."""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.svm import SVC
+from titanic.ml import inference, model
+from titanic.ml.backends import Backend
+from titanic.ml.inference import NystroemPredictor, SVCPredictor, TableEncoder
+from titanic.preprocessing import parser
+from titanic.preprocessing.encoder import TitanicEncoder
+
+
+@pytest.mark.parametrize("kernel", ["rbf", "linear", "poly", "sigmoid"])
+def test_svc_predictor_matches_sklearn(kernel):
+    """Verify SVCPredictor predicts the same as the sklearn SVC it's extracted from."""
+    # setup
+    train_raw = pd.read_csv("titanic/data/csv/train.csv")
+    x_train, y_train = parser.create_titanic_columns(train_raw)
+    encoder = TitanicEncoder()
+    encoder.fit(x_train)
+    x_train_enc = encoder.encode(x_train)
+    model_ = SVC(kernel=kernel, probability=True).fit(x_train_enc, y_train)
+
+    # when
+    predictor = SVCPredictor.from_sklearn(model_)
+
+    # then
+    assert np.allclose(
+        predictor.predict_proba(x_train_enc),
+        model_.predict_proba(x_train_enc),
+        atol=1e-9,
+    )
+    assert np.array_equal(predictor.predict(x_train_enc), model_.predict(x_train_enc))
+
+
+def test_nystroem_predictor_matches_sklearn():
+    """Verify NystroemPredictor predicts the same as the NystroemSVC it's from."""
+    # setup
+    train_raw = pd.read_csv("titanic/data/csv/train.csv")
+    x_train, y_train = parser.create_titanic_columns(train_raw)
+    model_, encoder = model.train(x_train, y_train, backend=Backend.NYSTROEM, budget=50)
+    x_train_enc = encoder.encode(x_train)
+
+    # when
+    predictor = NystroemPredictor.from_sklearn(model_)
+
+    # then
+    assert len(predictor.basis) == 50
+    assert np.allclose(
+        predictor.predict_proba(x_train_enc),
+        model_.predict_proba(x_train_enc),
+        atol=1e-9,
+    )
+    assert np.array_equal(predictor.predict(x_train_enc), model_.predict(x_train_enc))
+
+
+def test_table_encoder_matches_titanic_encoder():
+    """Verify TableEncoder encodes single rows the same as TitanicEncoder."""
+    # setup
+    train_raw = pd.read_csv("titanic/data/csv/train.csv")
+    x_train, y_train = parser.create_titanic(train_raw)
+    _, encoder = model.train(x_train, y_train)
+
+    # when
+    table_encoder = TableEncoder.from_encoder(encoder)
+
+    # then
+    for row in x_train[:20]:
+        assert np.array_equal(table_encoder.encode([row]), encoder.encode([row]))
+
+
+def test_pairwise_coupling_of_few_rows_as_many():
+    """Verify probabilities of a few rows are estimated the same as of many rows."""
+    # setup
+    pairwise = np.linspace(inference.MIN_PROB, 1.0 - inference.MIN_PROB, 101)
+    coupling = inference._pairwise_coupling  # pylint: disable=protected-access
+
+    # when
+    probs = coupling(pairwise)
+    probs_few = np.vstack([coupling(pairwise[[i]]) for i in range(len(pairwise))])
+
+    # then
+    assert np.allclose(probs_few, probs, rtol=0.0, atol=1e-15)
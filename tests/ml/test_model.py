@@ -1,14 +1,17 @@
 """Test Titanic ML model functions."""
+import copy
+import numpy as np
 import pandas as pd
-from titanic.ml import model
-from titanic.preprocessing import parser
+from titanic.ml import backends, model
+from titanic.ml.backends import Backend
+from titanic.preprocessing import cache, parser
 
 
 def test_model_train_and_test():
     """Verify train() and test() trains and tests an ML model."""
     # setup
-    train_raw = pd.read_csv("titanic/data/csv/train.csv")
-    x_train, y_train = parser.create_titanic(train_raw)
+    # Parsed once, and reused from the processed data cache by later runs
+    x_train, y_train = cache.load("titanic/data/csv/train.csv")
 
     # when
     model_, encoder = model.train(x_train, y_train)
@@ -21,9 +24,8 @@ def test_model_train_and_test():
 def test_model_save_load_and_delete():
     """Verify save, load and delete functions saves, loads and deletes ML models."""
     # setup
-    train_raw = pd.read_csv("titanic/data/csv/train.csv")
-    # Create dataset from raw data
-    x_train, y_train = parser.create_titanic(train_raw)
+    # Create dataset from raw data, or reuse it from the processed data cache
+    x_train, y_train = cache.load("titanic/data/csv/train.csv")
     # Train model and fit encoder
     model_, encoder = model.train(x_train, y_train)
 
@@ -39,3 +41,49 @@ def test_model_save_load_and_delete():
 
     # then
     assert score > 0.0
+
+
+def test_model_update():
+    """Verify update() adapts an online ML model to new data, from where it was."""
+    # setup
+    train_raw = pd.read_csv("titanic/data/csv/train.csv")
+    x_old, y_old = parser.create_titanic_columns(train_raw[:100])
+    x_new, y_new = parser.create_titanic_columns(train_raw[100:])
+    model_, encoder = model.train(x_old, y_old, backend=Backend.SGD)
+    encoder_new = copy.deepcopy(encoder)
+    encoder_new.partial_fit(x_new)
+    model_adapted = copy.deepcopy(model_)
+
+    # when
+    backends.adapt(model_adapted, encoder, encoder_new)
+    model_new, encoder_update = model.update(x_new, y_new, model_, encoder)
+
+    # then
+    assert np.allclose(
+        model_adapted.decision_function(encoder_new.encode(x_old)),
+        model_.decision_function(encoder.encode(x_old)),
+    )
+    assert model_new.coef_.shape[1] > model_.coef_.shape[1]
+    assert model.test(x_new, y_new, model_new, encoder_update) > 0.5
+
+
+def test_model_train_sparse_as_dense():
+    """Verify models trained on sparse encoded data predict the same as dense ones."""
+    # setup
+    x_train, y_train = cache.load("titanic/data/csv/train.csv")
+
+    # when
+    model_dense, encoder = model.train(x_train, y_train)
+    model_sparse, _ = model.train(x_train, y_train, encoder, sparse=True)
+    predictor = backends.to_predictor(model_sparse)
+
+    # then
+    assert np.allclose(
+        model_sparse.decision_function(encoder.encode_sparse(x_train)),
+        model_dense.decision_function(encoder.encode(x_train)),
+    )
+    assert np.allclose(
+        predictor.predict_proba(encoder.encode(x_train)),
+        model_sparse.predict_proba(encoder.encode_sparse(x_train)),
+    )
+    assert model.test(x_train, y_train, model_sparse, encoder, sparse=True) > 0.5
@@ -0,0 +1,26 @@
+"""Test ModelRegistry."""
+import pandas as pd
+from titanic.ml import model
+from titanic.ml.registry import ModelRegistry
+from titanic.preprocessing import parser
+
+
+def test_registry_hot_swaps_new_model_version():
+    """Verify refresh() swaps in a newly saved model, while old references persist."""
+    # setup
+    registry = ModelRegistry()
+    loaded_old = registry.get()
+    train_raw = pd.read_csv("titanic/data/csv/train.csv")
+    x_train, y_train = parser.create_titanic(train_raw)
+    model_, encoder = model.train(x_train, y_train)
+
+    # when
+    version = model.save(model_, encoder)
+    loaded_new = registry.refresh()
+    model.delete_latest()
+
+    # then
+    assert registry.get() is loaded_new
+    assert loaded_new.version == version
+    assert loaded_old.version != version
+    assert model.test(x_train, y_train, loaded_old.model, loaded_old.encoder) > 0.0
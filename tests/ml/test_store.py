@@ -0,0 +1,42 @@
+"""Test the versioned model store."""
+import os
+from titanic.ml import store
+
+
+def test_publish_prune_and_remove(tmp_path):
+    """Verify published versions are indexed and pruned, and removal repoints."""
+    # setup
+    path = str(tmp_path)
+    versions = ["2021-01-01T00:00:00", "2021-01-02T00:00:00", "2021-01-03T00:00:00"]
+
+    # when
+    staging = store.stage(path)
+    staged_latest = store.list_versions(path)
+    for version in versions:
+        store.publish(path, staging, version, retain=2)
+        staging = store.stage(path)
+    latest = store.latest(path)
+    store.remove(path, latest)
+
+    # then
+    assert not staged_latest
+    assert latest == versions[2]
+    assert store.latest(path) == versions[1]
+    assert store.list_versions(path) == [versions[1]]
+    assert sorted(os.listdir(path)) == sorted(
+        [versions[1], store.LATEST, store.INDEX, os.path.basename(staging)]
+    )
+
+
+def test_latest_without_pointer(tmp_path):
+    """Verify stores saved without pointer and index files are scanned instead."""
+    # setup
+    for version in ["2021-09-10T09:00:00", "2021-10-01T08:00:00"]:
+        os.mkdir(tmp_path / version)
+    store.stage(str(tmp_path))
+
+    # when
+    latest = store.latest(str(tmp_path))
+
+    # then
+    assert latest == "2021-10-01T08:00:00"
@@ -0,0 +1,22 @@
+"""Test hyperparameter search."""
+import pandas as pd
+from titanic.ml import model
+from titanic.preprocessing import parser
+
+
+def test_model_tune():
+    """Verify tune() searches hyperparameters and trains with the best of them."""
+    # setup
+    train_raw = pd.read_csv("titanic/data/csv/train.csv")
+    x_train, y_train = parser.create_titanic_columns(train_raw)
+
+    # when
+    model_, encoder, results = model.tune(x_train, y_train, n_iter=4, processes=2)
+    score = model.test(x_train, y_train, model_, encoder)
+
+    # then
+    assert len(results) == 4
+    assert results[0].score == max(result.score for result in results)
+    assert all(result.fit_time > 0.0 for result in results)
+    assert model_.get_params()["C"] == results[0].params["C"]
+    assert score > 0.0
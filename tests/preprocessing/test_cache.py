@@ -0,0 +1,55 @@
+"""Test the on-disk cache of parsed raw Titanic datasets."""
+import os
+import numpy as np
+import pandas as pd
+from titanic.preprocessing import cache, parser
+
+TRAIN_PATH = "titanic/data/csv/train.csv"
+
+
+def test_cache_load_parses_once_and_reuses(tmp_path):
+    """Verify load() caches the parsed dataset, and reuses it until invalidated."""
+    # setup
+    cache_path = str(tmp_path / "cache")
+    data, labels = parser.create_titanic_columns(pd.read_csv(TRAIN_PATH))
+
+    # when
+    data_miss, labels_miss = cache.load(TRAIN_PATH, cache_path)
+    data_hit, labels_hit = cache.load(TRAIN_PATH, cache_path)
+    entries = os.listdir(cache_path)
+    removed = cache.invalidate(TRAIN_PATH, cache_path)
+
+    # then
+    assert entries == [cache.key(TRAIN_PATH)]
+    assert removed == 1
+    assert not os.listdir(cache_path)
+    for parsed, parsed_labels in [(data_miss, labels_miss), (data_hit, labels_hit)]:
+        np.testing.assert_array_equal(parsed_labels, labels)
+        for col, values in {**data.categorical, **data.numerical}.items():
+            cached = {**parsed.categorical, **parsed.numerical}[col]
+            np.testing.assert_array_equal(cached, values)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Verify new entries evict the least recently used ones beyond max_bytes."""
+    # setup
+    cache_path = str(tmp_path / "cache")
+    paths = [str(tmp_path / f"train{i}.csv") for i in range(3)]
+    raw = pd.read_csv(TRAIN_PATH)
+    for i, path in enumerate(paths):
+        raw.drop(range(i * 100)).to_csv(path, index=False)
+
+    # when
+    cache.load(paths[0], cache_path)
+    cache.load(paths[1], cache_path)
+    os.utime(os.path.join(cache_path, cache.key(paths[0])), (0, 0))
+    size = sum(
+        os.path.getsize(os.path.join(cache_path, cache.key(paths[1]), name))
+        for name in os.listdir(os.path.join(cache_path, cache.key(paths[1])))
+    )
+    cache.load(paths[2], cache_path, max_bytes=2 * size)
+
+    # then
+    assert sorted(os.listdir(cache_path)) == sorted(
+        cache.key(path) for path in paths[1:]
+    )
@@ -1,5 +1,7 @@
 """Test TitanicEncoder."""
+import numpy as np
 import pandas as pd
+from titanic.data.titanic import NUMERICAL_TYPES
 from titanic.preprocessing.encoder import TitanicEncoder
 from titanic.preprocessing import parser
 
@@ -18,3 +20,86 @@ def test_fit_encoder():
     # then
     assert data_enc.shape[0] == len(data)
     assert data_enc.shape[1] == 39
+
+
+def test_encode_single_row_as_in_batch():
+    """Verify a single row is encoded the same as when it's encoded in a batch.
+
+    The numerical normalization should be fitted once in fit(), and not depend on
+    the other rows that are encoded at the same time.
+    """
+    # setup
+    enc = TitanicEncoder()
+    data_raw = pd.read_csv("titanic/data/csv/train.csv")
+    data, labels = parser.create_titanic(data_raw)  # pylint: disable=unused-variable
+    enc.fit(data)
+
+    # when
+    data_enc = enc.encode(data)
+    row_enc = enc.encode(data[:1])
+
+    # then
+    assert np.allclose(row_enc[0], data_enc[0])
+    assert data_enc.min() == 0.0
+    assert data_enc.max() == 1.0
+
+
+def test_encode_columns_as_dataclasses():
+    """Verify a columnar dataset is fitted and encoded the same as dataclasses."""
+    # setup
+    enc, enc_columns = TitanicEncoder(), TitanicEncoder()
+    data_raw = pd.read_csv("titanic/data/csv/train.csv")
+    data, labels = parser.create_titanic(data_raw)  # pylint: disable=unused-variable
+    data_columns, labels = parser.create_titanic_columns(data_raw)
+
+    # when
+    enc.fit(data)
+    enc_columns.fit(data_columns)
+
+    # then
+    assert np.array_equal(enc_columns.encode(data_columns), enc.encode(data))
+
+
+def test_encode_sparse_as_dense():
+    """Verify sparse encoding has the same values as dense, also for unfitted values."""
+    # setup
+    enc = TitanicEncoder()
+    data_raw = pd.read_csv("titanic/data/csv/train.csv")
+    data, labels = parser.create_titanic(data_raw)  # pylint: disable=unused-variable
+    data_columns, labels = parser.create_titanic_columns(data_raw)
+    # Fit on a few rows only, so that some categories are unknown when encoding
+    enc.fit(data_columns.to_titanic()[:20])
+
+    # when
+    data_enc = enc.encode_sparse(data)
+    columns_enc = enc.encode_sparse(data_columns)
+
+    # then
+    assert np.array_equal(data_enc.toarray(), enc.encode(data))
+    assert np.array_equal(columns_enc.toarray(), enc.encode(data_columns))
+    # At most the 5 categorical ones and 5 numerical values are stored per row
+    assert columns_enc.nnz <= len(data_columns) * 10
+
+
+def test_numerical_means_of_all_data_fitted_on():
+    """Verify the numerical averages are of all chunks fitted on, like clean() fills.
+
+    They should be the averages that the NaN/None values were filled with, to fill
+    those of new data the same way.
+    """
+    # setup
+    enc = TitanicEncoder()
+    data_raw = pd.read_csv("titanic/data/csv/train.csv")
+    df = parser.drop_incomplete(parser.transform(data_raw))
+    expected = {col: df[col].mean() for col in NUMERICAL_TYPES}
+    first, _ = parser.create_titanic_columns(data_raw[:300], expected)
+    rest, _ = parser.create_titanic_columns(data_raw[300:], expected)
+
+    # when
+    enc.fit(first)
+    enc.partial_fit(rest)
+    means = enc.numerical_means()
+
+    # then
+    assert list(means) == list(expected)
+    assert np.allclose(list(means.values()), list(expected.values()))
@@ -0,0 +1,44 @@
+"""Test feature engineering functions."""
+import numpy as np
+import pandas as pd
+from titanic.preprocessing.feature_engineering import (
+    feature_engineering,
+    feature_engineering_chunks,
+)
+
+
+def test_feature_engineering():
+    """Verify name titles, cabin letters and cabin numbers are extracted."""
+    # setup
+    df = pd.DataFrame(
+        {
+            "name": ["Braund, Mr. Owen Harris", "Rothes, the Countess. of (Lucy)"],
+            "cabin": ["C23 C25 C27", np.nan],
+        }
+    )
+
+    # when
+    df = feature_engineering(df)
+
+    # then
+    assert list(df["name_title"]) == ["Mr", "the Countess"]
+    assert list(df["cabin_letter"]) == ["C", "none"]
+    assert df["cabin_number"][0] == 23
+
+
+def test_feature_engineering_chunks():
+    """Verify feature engineering in chunks gives the same result as all at once.
+
+    The chunk size is small enough that some chunks have no cabins at all.
+    """
+    # setup
+    df = pd.read_csv("titanic/data/csv/train.csv").rename(
+        columns={"Name": "name", "Cabin": "cabin"}
+    )
+
+    # when
+    chunks = (chunk.copy() for _, chunk in df.groupby(np.arange(len(df)) // 3))
+    df_chunks = pd.concat(feature_engineering_chunks(chunks))
+
+    # then
+    pd.testing.assert_frame_equal(df_chunks, feature_engineering(df))
@@ -1,5 +1,6 @@
 """Test Titanic dataset parser."""
 import pandas as pd
+from titanic.data.titanic import TitanicColumns
 from titanic.preprocessing import parser
 
 
@@ -16,3 +17,18 @@ def test_create_titanic_dataset():
     assert isinstance(labels, list)
     assert len(train) > 0
     assert len(labels) > 0
+
+
+def test_create_titanic_columns_dataset():
+    """Verify create_titanic_columns() creates the same dataset as create_titanic()."""
+    # setup
+    train_raw = pd.read_csv("titanic/data/csv/train.csv")
+    train, labels = parser.create_titanic(train_raw)
+
+    # when
+    train_columns, labels_columns = parser.create_titanic_columns(train_raw)
+
+    # then
+    assert isinstance(train_columns, TitanicColumns)
+    assert train_columns.to_titanic() == train
+    assert list(labels_columns) == labels
@@ -0,0 +1,52 @@
+"""Test parallel ingestion of sharded raw Titanic datasets."""
+import numpy as np
+import pandas as pd
+import pytest
+from titanic.preprocessing import parser, shards
+
+TRAIN_PATH = "titanic/data/csv/train.csv"
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_ingest_shards_as_one_dataset(tmp_path, processes):
+    """Verify parsing shards in parallel gives the same result as all at once.
+
+    The numerical NaN/None values of each shard should be filled with the averages
+    of all shards, not of the shard.
+    """
+    # setup
+    raw = pd.read_csv(TRAIN_PATH)
+    data, labels = parser.create_titanic_columns(raw)
+    for i, start in enumerate(range(0, len(raw), 300)):
+        end = start + 300
+        raw.iloc[start:end].to_csv(tmp_path / f"part-{i}.csv", index=False)
+
+    # when
+    data_shards, labels_shards, results = shards.ingest(str(tmp_path), processes)
+
+    # then
+    assert [r.raw_rows for r in results] == [300, 300, 291]
+    assert sum(r.rows for r in results) == len(labels)
+    assert max(r.watermark for r in results) == 891
+    assert np.array_equal(labels_shards, labels)
+    for col, codes in data.categorical.items():
+        assert np.array_equal(data_shards.categorical[col], codes)
+    for col, values in data.numerical.items():
+        assert np.allclose(data_shards.numerical[col], values, rtol=1e-12)
+
+
+def test_shard_paths(tmp_path):
+    """Verify shards are listed from a folder or glob, and missing shards fail."""
+    # setup
+    for name in ["b.csv", "a.csv", "notes.txt"]:
+        (tmp_path / name).write_text("", encoding="utf-8")
+
+    # when
+    from_folder = shards.shard_paths(str(tmp_path))
+    from_glob = shards.shard_paths(str(tmp_path / "b*"))
+
+    # then
+    assert from_folder == [str(tmp_path / "a.csv"), str(tmp_path / "b.csv")]
+    assert from_glob == [str(tmp_path / "b.csv")]
+    with pytest.raises(FileNotFoundError):
+        shards.shard_paths(str(tmp_path / "missing-*.csv"))
@@ -0,0 +1,42 @@
+"""Test streaming ingestion of raw Titanic datasets."""
+import numpy as np
+import pandas as pd
+from titanic.preprocessing import parser, stream
+from titanic.preprocessing.encoder import TitanicEncoder
+
+TRAIN_PATH = "titanic/data/csv/train.csv"
+
+
+def test_fit_stream():
+    """Verify parsing & fitting in chunks gives the same result as all at once.
+
+    The numerical NaN/None values of each chunk should be filled with the averages
+    of the whole dataset, not of the chunk.
+    """
+    # setup
+    data, labels = parser.create_titanic_columns(pd.read_csv(TRAIN_PATH))
+    enc = TitanicEncoder()
+    enc.fit(data)
+
+    # when
+    data_stream, labels_stream, enc_stream = stream.fit_stream(TRAIN_PATH, 100)
+
+    # then
+    assert np.array_equal(labels_stream, labels)
+    for col, codes in data.categorical.items():
+        assert np.array_equal(data_stream.categorical[col], codes)
+    for col, values in data.numerical.items():
+        assert np.allclose(data_stream.numerical[col], values, rtol=1e-12)
+    assert np.allclose(enc_stream.encode(data_stream), enc.encode(data), rtol=1e-12)
+
+
+def test_read_new():
+    """Verify only rows after the watermark are read, and the watermark advances."""
+    # when
+    new_raw, watermark = stream.read_new(TRAIN_PATH, 800, 100)
+    none_raw, none_watermark = stream.read_new(TRAIN_PATH, watermark, 100)
+
+    # then
+    assert list(new_raw["PassengerId"]) == list(range(801, 892))
+    assert watermark == stream.last_passenger_id(TRAIN_PATH) == 891
+    assert len(none_raw) == 0 and none_watermark == 891
@@ -1,49 +1,433 @@
-"""API connector class to request/put data from/to various APIs."""
-from typing import Optional, Union, Tuple, Any
+"""API connector class to request/put data from/to various APIs.
+
+Connections are pooled and kept alive between requests, and requests that fail with
+a connection error or a transient status (e.g. 503) are retried with exponential
+backoff. Datasets are fetched and put as NDJSON, one record per line, so that they
+are decoded while downloaded instead of buffered and parsed as one JSON document.
+
+Paginated endpoints take the query parameters "page" (starting at 0) and
+"pageSize", and respond with the total number of records in the X-Total-Count
+header. The first page is fetched to get the total, and the rest concurrently.
+"""
+import os
+import json
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union, Tuple
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .endpoints import Endpoint
+from ...data.enums import ColumnsRaw
+
+# Statuses of transient errors to retry, e.g. rate limited or temporarily unavailable
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Response header with the total number of records of a paginated endpoint
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Default number of records per page to fetch, and per request to put
+PAGE_SIZE = 1000
+
+NDJSON = "application/x-ndjson"
+
+# Values of each raw Titanic column, decoded from NDJSON records
+Columns = Dict[str, List[Any]]
 
 
 class APIConnector:
     """API connector class to request/put data from/to various APIs."""
 
-    client_id: str
-    client_secret: str
+    client_id: Optional[str]
+    client_secret: Optional[str]
     base_url: str
-    api: Any
+    pool_size: int
+    timeout: float
+    api: requests.Session
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         client_id: Optional[str] = None,
         client_secret: Optional[str] = None,
         base_url: Optional[str] = None,
+        pool_size: int = 10,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 30.0,
     ) -> None:
-        """Set up connection to an API.
+        """Set up a pooled, retrying connection to an API.
 
         Args:
-            client_id:       Client id to connect with.
+            client_id:       Client id to connect with, using basic auth. If not
+                             provided, the API_TOKEN environment variable is sent as a
+                             bearer token instead, if set.
             client_secret:   Client secret to connect with.
-            base_url:        Base URL of the API to connect to.
+            base_url:        Base URL of the API to connect to, default the
+                             API_BASE_URL environment variable.
+            pool_size:       Max number of connections to keep alive, and of
+                             concurrent requests.
+            retries:         Max number of retries of each failed request.
+            backoff:         Backoff factor of the retries, e.g. 0.5 to sleep 0.5 s,
+                             1 s, 2 s... between retries.
+            timeout:         Seconds to wait for the API to respond.
         """
-        # <Code here to connect to an API>
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.base_url = (base_url or os.environ.get("API_BASE_URL") or "").rstrip("/")
+        self.pool_size = max(pool_size, 1)
+        self.timeout = timeout
+
+        # Retry idempotent requests only, respecting the Retry-After of 429 and 503
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "PUT"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            max_retries=retry,
+        )
+        self.api = requests.Session()
+        self.api.mount("http://", adapter)
+        self.api.mount("https://", adapter)
+
+        if client_id is not None and client_secret is not None:
+            self.api.auth = (client_id, client_secret)
+        elif os.environ.get("API_TOKEN"):
+            self.api.headers["Authorization"] = f"Bearer {os.environ['API_TOKEN']}"
+
+    def __enter__(self) -> "APIConnector":
+        """Use the connector as a context manager, closing it when done."""
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        """Close the connector, see close()."""
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.api.close()
 
-    def get(self, endpoint: Union[Endpoint, str]) -> Tuple[Any, bool]:
+    def url(self, endpoint: Union[Endpoint, str]) -> str:
+        """Get the URL of <endpoint>.
+
+        Args:
+            endpoint:   The endpoint, relative to the base URL.
+
+        Returns:
+            The URL of the endpoint.
+        """
+        path = endpoint.value if isinstance(endpoint, Endpoint) else endpoint
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def get(
+        self, endpoint: Union[Endpoint, str], params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, bool]:
         """Get data from an API according to <endpoint>.
 
         Args:
             endpoint:   The endpoint to get data from.
+            params:     Optional query parameters.
 
         Returns:
             Tuple of JSON response data and an OK boolean.
         """
-        # <Code here to get data from an API>
+        try:
+            response = self.api.get(
+                self.url(endpoint), params=params, timeout=self.timeout
+            )
+        except requests.RequestException:
+            return None, False
+        if not response.ok:
+            return None, False
+        return (response.json() if response.content else None), True
 
-    def put(self, endpoint: Endpoint, data: Any) -> bool:
+    def put(self, endpoint: Union[Endpoint, str], data: Any) -> bool:
         """Put <data> to an API according to <endpoint>.
 
         Args:
             endpoint:    The endpoint to put data to.
             data:        JSON data to put to the API.
+
+        Returns:
+            OK boolean.
+        """
+        try:
+            response = self.api.put(self.url(endpoint), json=data, timeout=self.timeout)
+        except requests.RequestException:
+            return False
+        return bool(response.ok)
+
+    def put_bulk(
+        self,
+        endpoint: Union[Endpoint, str],
+        records: Iterable[Dict[str, Any]],
+        batch_size: int = PAGE_SIZE,
+    ) -> bool:
+        """Put <records> to an API as NDJSON, in concurrent batches of <batch_size>.
+
+        Args:
+            endpoint:   The endpoint to put the records to.
+            records:    JSON records to put.
+            batch_size: Max number of records per request.
+
+        Returns:
+            OK boolean, False if any batch failed.
+        """
+        with ThreadPoolExecutor(self.pool_size) as executor:
+            oks = executor.map(
+                lambda batch: self.put_batch(endpoint, batch),
+                _batches(records, batch_size),
+            )
+            return all(list(oks))
+
+    def put_batch(
+        self, endpoint: Union[Endpoint, str], records: List[Dict[str, Any]]
+    ) -> bool:
+        """Put one batch of <records> to an API as NDJSON.
+
+        Args:
+            endpoint:   The endpoint to put the records to.
+            records:    JSON records to put.
+
         Returns:
             OK boolean.
         """
-        # <Code here to put data to an API>
+        try:
+            response = self.api.put(
+                self.url(endpoint),
+                data=_encode(records),
+                headers={"Content-Type": NDJSON},
+                timeout=self.timeout,
+            )
+        except requests.RequestException:
+            return False
+        return bool(response.ok)
+
+    def fetch_titanic(self, page_size: int = PAGE_SIZE) -> pd.DataFrame:
+        """Fetch the whole raw Titanic dataset, see fetch().
+
+        Args:
+            page_size:  Number of records per page.
+
+        Returns:
+            The raw Titanic dataset DataFrame, to parse like the raw CSV dataset.
+        """
+        return self.fetch(Endpoint.GET_TITANIC_DATA, page_size)
+
+    def fetch(
+        self, endpoint: Union[Endpoint, str], page_size: int = PAGE_SIZE
+    ) -> pd.DataFrame:
+        """Fetch all pages of raw Titanic records of <endpoint>, concurrently.
+
+        Args:
+            endpoint:   The paginated endpoint of NDJSON raw Titanic records.
+            page_size:  Number of records per page.
+
+        Returns:
+            The raw Titanic dataset DataFrame, with the records in page order.
+
+        Raises:
+            requests.HTTPError: If any page fails, after retrying.
+        """
+        first, total = self.fetch_page(endpoint, 0, page_size)
+        pages = range(1, -(-total // page_size))
+        with ThreadPoolExecutor(self.pool_size) as executor:
+            rest = executor.map(
+                lambda page: self.fetch_page(endpoint, page, page_size)[0], pages
+            )
+            return _frame([first, *rest])
+
+    def fetch_page(
+        self, endpoint: Union[Endpoint, str], page: int, page_size: int
+    ) -> Tuple[Columns, int]:
+        """Fetch one <page> of NDJSON raw Titanic records, decoding it as it streams.
+
+        Args:
+            endpoint:   The paginated endpoint of NDJSON raw Titanic records.
+            page:       The page to fetch, starting at 0.
+            page_size:  Number of records per page.
+
+        Returns:
+            Tuple of the decoded columns of the page, and the total number of records
+            of all pages.
+
+        Raises:
+            requests.HTTPError: If the page fails, after retrying.
+        """
+        with self.api.get(
+            self.url(endpoint),
+            params={"page": page, "pageSize": page_size},
+            headers={"Accept": NDJSON},
+            timeout=self.timeout,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            total = int(response.headers.get(TOTAL_COUNT_HEADER, 0))
+            return _decode(response.iter_lines()), total
+
+
+class AsyncAPIConnector:
+    """asyncio variant of APIConnector, to fetch and put data from event loops.
+
+    Requests are sent with the pooled, retrying session of an APIConnector, on a
+    thread pool as large as its connection pool, so that the event loop is never
+    blocked and at most <pool_size> requests are in flight.
+    """
+
+    connector: APIConnector
+    _executor: ThreadPoolExecutor
+
+    def __init__(self, connector: Optional[APIConnector] = None) -> None:
+        """Initialize AsyncAPIConnector.
+
+        Args:
+            connector:  The connector to send requests with, default one connecting
+                        to the API_BASE_URL environment variable.
+        """
+        self.connector = connector or APIConnector()
+        self._executor = ThreadPoolExecutor(self.connector.pool_size)
+
+    async def __aenter__(self) -> "AsyncAPIConnector":
+        """Use the connector as an async context manager, closing it when done."""
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        """Close the connector, see close()."""
+        self.close()
+
+    def close(self) -> None:
+        """Close all pooled connections, and the thread pool."""
+        self._executor.shutdown()
+        self.connector.close()
+
+    async def get(
+        self, endpoint: Union[Endpoint, str], params: Optional[Dict[str, Any]] = None
+    ) -> Tuple[Any, bool]:
+        """Get data from an API, see APIConnector.get()."""
+        return await self._run(self.connector.get, endpoint, params)
+
+    async def put(self, endpoint: Union[Endpoint, str], data: Any) -> bool:
+        """Put data to an API, see APIConnector.put()."""
+        return await self._run(self.connector.put, endpoint, data)
+
+    async def put_bulk(
+        self,
+        endpoint: Union[Endpoint, str],
+        records: Iterable[Dict[str, Any]],
+        batch_size: int = PAGE_SIZE,
+    ) -> bool:
+        """Put records to an API in concurrent batches, see APIConnector.put_bulk()."""
+        oks = await asyncio.gather(
+            *(
+                self._run(self.connector.put_batch, endpoint, batch)
+                for batch in _batches(records, batch_size)
+            )
+        )
+        return all(oks)
+
+    async def fetch_titanic(self, page_size: int = PAGE_SIZE) -> pd.DataFrame:
+        """Fetch the whole raw Titanic dataset, see APIConnector.fetch_titanic()."""
+        return await self.fetch(Endpoint.GET_TITANIC_DATA, page_size)
+
+    async def fetch(
+        self, endpoint: Union[Endpoint, str], page_size: int = PAGE_SIZE
+    ) -> pd.DataFrame:
+        """Fetch all pages of an endpoint concurrently, see APIConnector.fetch()."""
+        first, total = await self._run(
+            self.connector.fetch_page, endpoint, 0, page_size
+        )
+        rest = await asyncio.gather(
+            *(
+                self._run(self.connector.fetch_page, endpoint, page, page_size)
+                for page in range(1, -(-total // page_size))
+            )
+        )
+        return _frame([first, *(columns for columns, _ in rest)])
+
+    async def _run(self, func: Any, *args: Any) -> Any:
+        """Call <func> with <args> on the thread pool.
+
+        Args:
+            func:   Blocking function to call.
+            args:   Arguments to call <func> with.
+
+        Returns:
+            What <func> returned.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+
+def _decode(lines: Iterable[bytes]) -> Columns:
+    """Decode NDJSON <lines> of raw Titanic records straight into columns.
+
+    Args:
+        lines:  NDJSON lines, one raw Titanic record per line.
+
+    Returns:
+        Values of each raw Titanic column, None for missing values.
+    """
+    columns: Columns = {col.value: [] for col in ColumnsRaw}
+    for line in lines:
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        for name, values in columns.items():
+            values.append(record.get(name))
+    return columns
+
+
+def _frame(pages: List[Columns]) -> pd.DataFrame:
+    """Create the raw Titanic DataFrame of the decoded columns of each page.
+
+    Args:
+        pages:  Decoded columns of each page, in page order.
+
+    Returns:
+        The raw Titanic dataset DataFrame, with the columns of the raw CSV dataset.
+    """
+    names = [col.value for col in ColumnsRaw]
+    columns = {
+        name: [value for page in pages for value in page[name]] for name in names
+    }
+    # Missing values are NaN, as when reading the raw CSV dataset
+    return pd.DataFrame(columns, columns=names).fillna(value=float("nan"))
+
+
+def _encode(records: List[Dict[str, Any]]) -> bytes:
+    """Encode <records> as NDJSON.
+
+    Args:
+        records:    JSON records to encode.
+
+    Returns:
+        The NDJSON body, one record per line.
+    """
+    return "".join(json.dumps(record) + "\n" for record in records).encode("utf-8")
+
+
+def _batches(
+    records: Iterable[Dict[str, Any]], batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Split <records> into batches of at most <batch_size>.
+
+    Args:
+        records:    Records to split.
+        batch_size: Max number of records per batch.
+
+    Yields:
+        Lists of records.
+    """
+    batch: List[Dict[str, Any]] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -1,7 +1,21 @@
 """API handler."""
-from fastapi import FastAPI, APIRouter
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+from fastapi import FastAPI, APIRouter, Request, Response
+from starlette.routing import Route
+from titanic.api.provider import metrics
+from titanic.api.provider.profiler import (
+    PROFILE_HEADER,
+    PROFILE_ID_HEADER,
+    RequestProfiler,
+)
+from titanic.api.provider.settings import settings
 from titanic.api.provider.endpoints.titanic import titanic
 
+logger = logging.getLogger(__name__)
+
 # Combine all endpoints to the same FastAPI app instance
 router = APIRouter()
 
@@ -15,3 +29,126 @@ router.include_router(
 # Create the FastAPI app
 app = FastAPI(title="Titanic ML API")
 app.include_router(router)
+
+# Profiles a fraction of requests, and the requests with the profiling token
+profiler = RequestProfiler(
+    rate=settings.profile_rate,
+    token=settings.profile_token,
+    path=settings.profile_path,
+    interval=settings.profile_interval_ms / 1000,
+    keep=settings.profile_keep,
+)
+
+# Route path of each endpoint function, to label request metrics with, e.g.
+# "/titanic/survived" instead of each unique URL (filled in when first requested)
+_route_paths: Dict[Any, str] = {}
+
+
+@app.middleware("http")
+async def observe_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Count requests and observe their latency, per route.
+
+    Args:
+        request:    The incoming request.
+        call_next:  Handles the request, and returns its response.
+
+    Returns:
+        The response of the request.
+    """
+    start = time.perf_counter()
+    response = await call_next(request)
+    latency = time.perf_counter() - start
+
+    # Label by the route path, and not the URL, to bound the number of labels
+    route = _route_path(request)
+    metrics.REQUESTS.inc(request.method, route, str(response.status_code))
+    metrics.REQUEST_LATENCY.observe(latency, request.method, route)
+    return response
+
+
+@app.middleware("http")
+async def profile_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """Profile the request, if it's sampled or has the profiling token header.
+
+    The profile is saved as folded stacks (see profiler.py) on a worker thread, named
+    by the route path of the request, and its file name is returned in the
+    PROFILE_ID_HEADER response header. Streamed response bodies are only profiled
+    until the response starts. Failing to save the profile doesn't fail the request.
+
+    Args:
+        request:    The incoming request.
+        call_next:  Handles the request, and returns its response.
+
+    Returns:
+        The response of the request.
+    """
+    if not profiler.sampled(request.headers.get(PROFILE_HEADER)):
+        return await call_next(request)
+
+    sampler = profiler.start()
+    try:
+        response = await call_next(request)
+    finally:
+        samples = sampler.stop()
+
+    route = _route_path(request)
+    loop = asyncio.get_running_loop()
+    try:
+        name = await loop.run_in_executor(None, profiler.save, samples, route)
+    except OSError:
+        logger.exception("Failed to save the profile of a request to %s", route)
+    else:
+        response.headers[PROFILE_ID_HEADER] = name
+    return response
+
+
+@app.get("/metrics", include_in_schema=False)
+def get_metrics() -> Response:
+    """Get the metrics of the API, in the Prometheus text format.
+
+    Returns:
+        Response with the text of all metrics.
+    """
+    return Response(metrics.expose(), media_type=metrics.CONTENT_TYPE)
+
+
+@app.on_event("startup")
+def start_model_registry() -> None:
+    """Load the latest ML model at startup, and start polling for new versions.
+
+    If TITANIC_INFERENCE_PROCESSES > 0, the inference worker processes are started
+    too, and pre-warmed with the loaded model version before serving requests.
+    """
+    titanic.registry.refresh()
+    if settings.inference_processes > 0:
+        titanic.executor.start(titanic.registry.get().version)
+    titanic.registry.start()
+
+
+@app.on_event("shutdown")
+def stop_model_registry() -> None:
+    """Stop polling for new ML model versions, micro-batching and worker processes."""
+    titanic.registry.stop()
+    titanic.batcher.stop()
+    titanic.executor.stop()
+
+
+def _route_path(request: Request) -> str:
+    """Get the route path template of a handled <request>, e.g. "/titanic/survived".
+
+    Args:
+        request:    The handled request.
+
+    Returns:
+        The path of the route that handled the request, or "unmatched".
+    """
+    endpoint = request.scope.get("endpoint")
+    if endpoint is not None and endpoint not in _route_paths:
+        _route_paths.update(
+            {r.endpoint: r.path for r in app.routes if isinstance(r, Route)}
+        )
+    return _route_paths.get(endpoint, "unmatched")
@@ -0,0 +1,206 @@
+"""Micro-batching of concurrent single passenger predictions."""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from . import metrics
+from .executor import Saturated
+from ...data.titanic import Titanic
+from ...ml.registry import LoadedModel
+
+# A queued passenger, with the model to predict it with and the future of its result
+Item = Tuple[LoadedModel, Titanic, "asyncio.Future[float]"]
+
+# Coroutine function that predicts a batch of passengers with a model
+BatchPredict = Callable[[LoadedModel, List[Titanic]], Awaitable[List[float]]]
+
+
+class MicroBatcher:  # pylint: disable=too-many-instance-attributes
+    """Collect concurrent single passenger predictions into vectorized batches.
+
+    Passengers are queued, and collected for at most <window> seconds or until
+    <max_size> passengers are queued. Each batch is then encoded and predicted in one
+    call, off the event loop, and the future of each passenger is resolved with its
+    own prediction. Up to <concurrency> batches are predicted at a time, e.g. one per
+    worker process, while the next batch is collected.
+    """
+
+    window: float
+    max_size: int
+    concurrency: int
+    max_queue: int
+    _loop: Optional[asyncio.AbstractEventLoop]
+    _queue: "asyncio.Queue[Item]"
+    _full: asyncio.Event
+    _slots: asyncio.Semaphore
+    _task: "Optional[asyncio.Task[None]]"
+    _batches: Set["asyncio.Task[None]"]
+
+    def __init__(
+        self,
+        predict: BatchPredict,
+        window: float = 0.002,
+        max_size: int = 64,
+        concurrency: int = 1,
+        max_queue: int = 10000,
+    ) -> None:
+        """Initialize MicroBatcher, without starting it until the first submit().
+
+        Args:
+            predict:        Coroutine function that predicts a batch of passengers
+                            with a model, off the event loop.
+            window:         Max seconds to collect a batch for.
+            max_size:       Max number of passengers per batch.
+            concurrency:    Max number of batches to predict at a time.
+            max_queue:      Max number of queued passengers, before raising
+                            Saturated.
+        """
+        self.predict: BatchPredict = predict
+        self.window = window
+        self.max_size = max(max_size, 1)
+        self.concurrency = max(concurrency, 1)
+        self.max_queue = max_queue
+        self._loop = None
+        self._task = None
+        self._batches = set()
+
+    async def submit(self, loaded: LoadedModel, data: Titanic) -> float:
+        """Predict how likely a passenger would survive the Titanic, in a batch.
+
+        Args:
+            loaded: The loaded ML model and encoder to predict with.
+            data:   Titanic passenger to predict.
+
+        Returns:
+            The survival prediction float of the passenger.
+
+        Raises:
+            Saturated:  If max_queue passengers are already queued.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._start(loop)
+        if self._queue.qsize() >= self.max_queue:
+            raise Saturated(f"{self._queue.qsize()} passengers are already queued")
+
+        future: "asyncio.Future[float]" = loop.create_future()
+        self._queue.put_nowait((loaded, data, future))
+        if self._queue.qsize() >= self.max_size:
+            self._full.set()
+        return await future
+
+    def stop(self) -> None:
+        """Stop collecting batches, e.g. at shutdown."""
+        if self._task is not None:
+            self._task.cancel()
+        for batch in self._batches:
+            batch.cancel()
+        self._loop = None
+        self._task = None
+        self._batches = set()
+
+    def _start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Start collecting batches on the event <loop>.
+
+        Args:
+            loop:   The running event loop.
+        """
+        self.stop()
+        self._loop = loop
+        self._queue = asyncio.Queue()
+        self._full = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Collect and predict batches, until stopped."""
+        while True:
+            batch = [await self._queue.get()]
+
+            # Collect more passengers until the window ends or the batch is full
+            if self._queue.qsize() < self.max_size - 1:
+                try:
+                    await asyncio.wait_for(self._full.wait(), self.window)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+            while len(batch) < self.max_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            metrics.BATCH_SIZE.observe(len(batch))
+
+            # Wait for a free slot, and predict the batch while collecting the next
+            await self._slots.acquire()
+            task = asyncio.get_running_loop().create_task(self._predict_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task: "asyncio.Task[None]") -> None:
+        """Free the slot of a predicted batch.
+
+        Args:
+            task:   The task that predicted the batch.
+        """
+        self._batches.discard(task)
+        self._slots.release()
+
+    async def _predict_batch(self, batch: List[Item]) -> None:
+        """Predict a <batch>, and resolve the future of each item.
+
+        Passengers are grouped by the model they should be predicted with, in case a
+        new model version was swapped in while collecting the batch.
+
+        Args:
+            batch:  Queued passengers to predict.
+        """
+        for items in _group_by_model(batch):
+            await self._predict_group(items)
+
+    async def _predict_group(self, items: List[Item]) -> None:
+        """Predict <items> of the same model, and resolve the future of each item.
+
+        Args:
+            items:  Queued passengers to predict, all with the same model.
+        """
+        try:
+            preds = await self.predict(items[0][0], [data for _, data, _ in items])
+        except Exception as error:  # pylint: disable=broad-except
+            # Fail the requests of the batch, and not the batcher itself
+            _resolve(items, error=error)
+        else:
+            _resolve(items, preds)
+
+
+def _group_by_model(batch: List[Item]) -> List[List[Item]]:
+    """Group the passengers of a <batch> by the model to predict them with.
+
+    Args:
+        batch:  Queued passengers.
+
+    Returns:
+        The passengers of each model, in the order of the batch.
+    """
+    groups: Dict[int, List[Item]] = {}
+    for item in batch:
+        groups.setdefault(id(item[0]), []).append(item)
+    return list(groups.values())
+
+
+def _resolve(
+    items: List[Item],
+    preds: Sequence[float] = (),
+    error: Optional[BaseException] = None,
+) -> None:
+    """Resolve the future of each item with its prediction, or fail it with <error>.
+
+    Args:
+        items:  Predicted passengers.
+        preds:  Prediction of each passenger, if predicted.
+        error:  Optional error that the prediction failed with.
+    """
+    for i, (_, _, future) in enumerate(items):
+        # Requests may have been cancelled, e.g. if the client disconnected
+        if future.done():
+            continue
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(preds[i])
@@ -0,0 +1,110 @@
+"""Prediction cache for the Titanic ML API."""
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional, Tuple
+
+# Cached prediction and the monotonic time that it expires at
+Entry = Tuple[float, float]
+
+
+@dataclass
+class CacheStats:
+    """Counters of a PredictionCache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class PredictionCache:
+    """Least recently used (LRU) prediction cache, with a time to live (TTL).
+
+    Predictions are cached per model version. The whole cache is cleared by
+    invalidate() when a new model version is loaded, and predictions of any other
+    version than the loaded one are neither returned nor cached, e.g. of requests
+    that were still being predicted by the old version during a hot swap.
+    """
+
+    max_size: int
+    ttl: float
+    stats: CacheStats
+    _version: Optional[str]
+    _entries: "OrderedDict[Hashable, Entry]"
+    _lock: threading.Lock
+
+    def __init__(self, max_size: int = 10000, ttl: float = 3600.0) -> None:
+        """Initialize PredictionCache.
+
+        Args:
+            max_size:   Max number of cached predictions, 0 disables the cache.
+            ttl:        Seconds that a prediction is cached for.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._version = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Get the number of cached predictions."""
+        return len(self._entries)
+
+    def get(self, key: Hashable, version: str) -> Optional[float]:
+        """Get the cached prediction of <key>, made by model <version>.
+
+        Args:
+            key:        Hashable key of the prediction, e.g. a tuple of its inputs.
+            version:    Version of the model that should have made the prediction.
+
+        Returns:
+            The cached prediction, or None if not cached or expired.
+        """
+        with self._lock:
+            entry = None if version != self._version else self._entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                self.stats.misses += 1
+                return None
+
+            # Mark as the most recently used prediction
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, version: str, prediction: float) -> None:
+        """Cache <prediction> of <key>, made by model <version>.
+
+        Args:
+            key:        Hashable key of the prediction, e.g. a tuple of its inputs.
+            version:    Version of the model that made the prediction.
+            prediction: The prediction to cache.
+        """
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            # Drop predictions of another version than the loaded one
+            if version != self._version:
+                return
+            self._entries[key] = (prediction, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+
+            # Evict the least recently used predictions
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, version: str) -> None:
+        """Clear the cache, as model <version> was loaded and is used from now on.
+
+        Args:
+            version:    Version of the newly loaded model.
+        """
+        with self._lock:
+            if self._entries:
+                self._entries.clear()
+                self.stats.invalidations += 1
+            self._version = version
@@ -1,5 +1,9 @@
 """Titanic schema models."""
+from datetime import datetime
+from typing import List
 from pydantic import BaseModel, Field, StrictFloat
+from .....data.enums import PersonClass, NameTitle, Sex, CabinLetter, Embarked
+from .....data.titanic import Titanic, Categorical, Numerical
 
 
 class SurvivalPrediction(BaseModel):
@@ -10,3 +14,125 @@ class SurvivalPrediction(BaseModel):
         description="Float prediction of how likely the person would survive Titanic.",
         example=0.78,
     )
+
+
+class BatchSurvivalPrediction(BaseModel):
+    """Titanic survival predictions for a batch of persons."""
+
+    survived: List[StrictFloat] = Field(
+        ...,
+        description="Float predictions of how likely each person would survive "
+        "Titanic, in the same order as the passengers were given.",
+        example=[0.78, 0.12],
+    )
+
+
+class Passenger(BaseModel):
+    """Titanic passenger to predict survival for."""
+
+    person_class: PersonClass = Field(
+        ...,
+        alias="personClass",
+        description="Socio-economic class of the passenger.",
+    )
+    name_title: NameTitle = Field(
+        ...,
+        alias="nameTitle",
+        description="Name title of the passenger.",
+    )
+    sex: Sex = Field(
+        ...,
+        alias="sex",
+        description="Sex of the passenger.",
+    )
+    age: float = Field(
+        ...,
+        alias="age",
+        description="Age of the passenger.",
+    )
+    siblings_spouses: int = Field(
+        ...,
+        alias="siblingsSpouses",
+        description="Number of siblings and/or spouses of the passenger.",
+    )
+    parents_children: int = Field(
+        ...,
+        alias="parentsChildren",
+        description="Number of parents and/or children of the passenger.",
+    )
+    cabin_letter: CabinLetter = Field(
+        ...,
+        alias="cabinLetter",
+        description="The letter of the cabin that the passenger resided in.",
+    )
+    cabin_number: int = Field(
+        ...,
+        alias="cabinNumber",
+        description="The number of the cabin that the passenger resided in.",
+    )
+    embarked: Embarked = Field(
+        ...,
+        alias="embarked",
+        description="City that the passenger embarked from.",
+    )
+    ticket_price: float = Field(
+        ...,
+        alias="ticketPrice",
+        description="The ticket price the passenger paid.",
+    )
+
+    def to_titanic(self) -> Titanic:
+        """Convert the passenger to a Titanic dataclass, to be encoded.
+
+        Returns:
+            The passenger as a Titanic dataclass.
+        """
+        return Titanic(
+            categorical=Categorical(
+                person_class=self.person_class,
+                name_title=self.name_title,
+                sex=self.sex,
+                cabin_letter=self.cabin_letter,
+                embarked=self.embarked,
+            ),
+            numerical=Numerical(
+                age=self.age,
+                siblings_spouses=self.siblings_spouses,
+                parents_children=self.parents_children,
+                cabin_number=self.cabin_number,
+                ticket_price=self.ticket_price,
+            ),
+        )
+
+
+class ModelInfo(BaseModel):
+    """Information about the ML model version that is loaded by the API."""
+
+    version: str = Field(
+        ...,
+        description="Version (date) of the loaded ML model.",
+        example="2021-08-28T22:39:00",
+    )
+    loaded_at: datetime = Field(
+        ...,
+        description="Date and time that the ML model version was loaded at.",
+        example="2021-08-29T08:00:00",
+    )
+
+
+class CacheInfo(BaseModel):
+    """Counters and size of the prediction cache of the API."""
+
+    size: int = Field(..., description="Number of cached predictions.", example=812)
+    hits: int = Field(..., description="Number of cache hits.", example=9420)
+    misses: int = Field(..., description="Number of cache misses.", example=1033)
+    evictions: int = Field(
+        ...,
+        description="Number of least recently used predictions evicted.",
+        example=221,
+    )
+    invalidations: int = Field(
+        ...,
+        description="Number of times the cache was cleared due to a new model.",
+        example=2,
+    )
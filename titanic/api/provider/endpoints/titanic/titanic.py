@@ -1,14 +1,91 @@
 """Titanic endpoint."""
-from fastapi import APIRouter
+import json
+import asyncio
+from dataclasses import asdict
+from typing import AsyncIterator, List, Sequence, Tuple
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 from . import models as api_models
 from . import query
 from .....data.enums import PersonClass, NameTitle, Sex, CabinLetter, Embarked
 from .....data.titanic import Titanic, Categorical, Numerical
-from .....ml import model
+from .....ml.registry import LoadedModel, ModelRegistry
+from ... import metrics
+from ...batcher import MicroBatcher
+from ...cache import PredictionCache
+from ...executor import InferenceExecutor, Saturated
+from ...settings import settings
 
 router = APIRouter()
 
 
+def _observe_load(loaded: LoadedModel) -> None:
+    """Record the load time of a new model version, clear the cached predictions of
+    the old version, and preload the new version in workers.
+
+    Args:
+        loaded: The newly loaded ML model and encoder.
+    """
+    metrics.STAGE_LATENCY.observe(loaded.load_seconds, "load")
+    cache.invalidate(loaded.version)
+    # Let idle inference worker processes load the new version before it's needed
+    executor.reload(loaded.version)
+
+
+# Keeps the latest model version loaded, instead of loading it for each request
+registry = ModelRegistry(
+    poll_interval=settings.model_poll_interval,
+    engine=settings.inference_engine,
+    on_load=_observe_load,
+)
+
+# Predicts off the event loop in worker processes, if TITANIC_INFERENCE_PROCESSES > 0
+# (started at startup, with the model version loaded by the registry)
+executor = InferenceExecutor(
+    processes=settings.inference_processes,
+    max_pending=settings.inference_max_pending,
+    engine=settings.inference_engine,
+)
+
+# Caches predictions of repeated queries, cleared when a new model version is loaded
+cache = PredictionCache(max_size=settings.cache_size, ttl=settings.cache_ttl)
+
+
+def _model_samples() -> Sequence[Tuple[metrics.Labels, float]]:
+    """Collect the version and load time of the loaded model, when scraped.
+
+    Returns:
+        The version label and load timestamp of the loaded model, if any.
+    """
+    loaded = registry.current()
+    if loaded is None:
+        return []
+    return [((loaded.version,), loaded.loaded_at.timestamp())]
+
+
+metrics.Collected(
+    "titanic_model_loaded_timestamp_seconds",
+    "Unix time that the loaded model version was loaded at.",
+    "gauge",
+    _model_samples,
+    ["version"],
+)
+metrics.Collected(
+    "titanic_cache_entries",
+    "Number of cached predictions.",
+    "gauge",
+    lambda: [((), len(cache))],
+)
+metrics.Collected(
+    "titanic_cache_events_total",
+    "Number of prediction cache hits, misses, evictions and invalidations.",
+    "counter",
+    lambda: [((event,), count) for event, count in asdict(cache.stats).items()],
+    ["event"],
+)
+
+
 @router.get("/survived", response_model=api_models.SurvivalPrediction)
 async def predict_survival(  # pylint: disable=too-many-arguments
     person_class: PersonClass = query.PersonClass,
@@ -39,34 +116,292 @@ async def predict_survival(  # pylint: disable=too-many-arguments
     Returns:
         The survival prediction float, wrapped in a SurvivalPrediction response model.
     """
-    # Load latest saved model & encoder (should be stored in cloud)
-    model_, encoder = model.load_latest()
+    # Get the loaded model & encoder, kept until this request is done even if a new
+    # model version is swapped in meanwhile
+    loaded = registry.get()
 
-    # Encode input data
-    data = [
-        Titanic(
-            categorical=Categorical(
-                person_class=person_class,
-                name_title=name_title,
-                sex=sex,
-                cabin_letter=cabin_letter,
-                embarked=embarked,
-            ),
-            numerical=Numerical(
-                age=age,
-                siblings_spouses=siblings_spouses,
-                parents_children=parents_children,
-                cabin_number=cabin_number,
-                ticket_price=ticket_price,
-            ),
-        )
-    ]
-    data_enc = encoder.encode(data)
+    # Return the cached prediction, if the same query was predicted before
+    key = (
+        person_class,
+        name_title,
+        sex,
+        age,
+        siblings_spouses,
+        parents_children,
+        cabin_letter,
+        cabin_number,
+        embarked,
+        ticket_price,
+    )
+    pred = cache.get(key, loaded.version)
+    if pred is not None:
+        return api_models.SurvivalPrediction(survived=pred)
 
-    # Predict survival
-    pred: float = model_.predict_proba(data_enc)[0][1]
+    # Create input data
+    with metrics.STAGE_LATENCY.time("validate"):
+        data = [
+            Titanic(
+                categorical=Categorical(
+                    person_class=person_class,
+                    name_title=name_title,
+                    sex=sex,
+                    cabin_letter=cabin_letter,
+                    embarked=embarked,
+                ),
+                numerical=Numerical(
+                    age=age,
+                    siblings_spouses=siblings_spouses,
+                    parents_children=parents_children,
+                    cabin_number=cabin_number,
+                    ticket_price=ticket_price,
+                ),
+            )
+        ]
+
+    # Predict survival, batched with concurrent requests off the event loop
+    try:
+        pred = await batcher.submit(loaded, data[0])
+    except Saturated as error:
+        raise _too_many_requests(error) from error
+    cache.put(key, loaded.version, pred)
 
     # Return the response data model
     return api_models.SurvivalPrediction(
         survived=pred,
     )
+
+
+@router.post("/survived/batch", response_model=api_models.BatchSurvivalPrediction)
+async def predict_survival_batch(
+    passengers: List[api_models.Passenger],
+) -> api_models.BatchSurvivalPrediction:
+    """Get predictions of how likely each passenger would survive the Titanic.
+
+    All passengers are encoded and predicted together in one vectorized call.
+
+    Args:
+        passengers: JSON array of passengers, at most TITANIC_MAX_BATCH_SIZE long.
+
+    Returns:
+        The survival prediction floats, wrapped in a BatchSurvivalPrediction response
+        model.
+    """
+    if len(passengers) > settings.max_batch_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.max_batch_size} passengers per batch.",
+        )
+
+    # Predict survival of all passengers at once
+    with metrics.STAGE_LATENCY.time("validate"):
+        data = [p.to_titanic() for p in passengers]
+    try:
+        preds = await predict_async(registry.get(), data)
+    except Saturated as error:
+        raise _too_many_requests(error) from error
+
+    # Return the response data model
+    return api_models.BatchSurvivalPrediction(
+        survived=preds,
+    )
+
+
+@router.post("/survived/batch/stream", response_class=StreamingResponse)
+async def predict_survival_stream(request: Request) -> StreamingResponse:
+    """Stream predictions of how likely each passenger would survive the Titanic.
+
+    The request body is NDJSON with one passenger per line, in the same format as
+    the passengers of the "/survived/batch" endpoint. Passengers are predicted in
+    batches of TITANIC_MAX_BATCH_SIZE as they are uploaded, and the predictions are
+    streamed back as NDJSON, e.g. {"line": 1, "survived": 0.78}. Lines that are not
+    a valid passenger are streamed back with an error, e.g. {"line": 2, "error": ..},
+    as are the lines of batches that can't be predicted as predictions are saturated.
+
+    Args:
+        request:    The request, with an NDJSON body of passengers.
+
+    Returns:
+        Streaming NDJSON response of the survival predictions.
+    """
+    return StreamingResponse(
+        _predict_ndjson(request.stream()),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get("/model", response_model=api_models.ModelInfo)
+async def get_model_info() -> api_models.ModelInfo:
+    """Get the version of the ML model that is loaded, and when it was loaded.
+
+    Returns:
+        The model version and load time, wrapped in a ModelInfo response model.
+    """
+    loaded = registry.get()
+    return api_models.ModelInfo(
+        version=loaded.version,
+        loaded_at=loaded.loaded_at,
+    )
+
+
+@router.get("/cache", response_model=api_models.CacheInfo)
+async def get_cache_info() -> api_models.CacheInfo:
+    """Get the counters and size of the prediction cache.
+
+    Returns:
+        The cache counters and size, wrapped in a CacheInfo response model.
+    """
+    return api_models.CacheInfo(
+        size=len(cache),
+        hits=cache.stats.hits,
+        misses=cache.stats.misses,
+        evictions=cache.stats.evictions,
+        invalidations=cache.stats.invalidations,
+    )
+
+
+def predict(loaded: LoadedModel, data: List[Titanic]) -> List[float]:
+    """Predict how likely each passenger in <data> would survive the Titanic.
+
+    Args:
+        loaded: The loaded ML model and encoder to predict with.
+        data:   Titanic passengers to predict.
+
+    Returns:
+        List of survival prediction floats, one for each passenger.
+    """
+    # Encode input data
+    with metrics.STAGE_LATENCY.time("encode"):
+        data_enc = loaded.encoder.encode(data)
+
+    # Predict survival
+    with metrics.STAGE_LATENCY.time("predict"):
+        preds: List[float] = loaded.model.predict_proba(data_enc)[:, 1].tolist()
+
+    return preds
+
+
+async def predict_async(loaded: LoadedModel, data: List[Titanic]) -> List[float]:
+    """Predict how likely each passenger in <data> would survive, off the event loop.
+
+    Predicts in a worker process if the inference executor is started, and else on
+    a worker thread.
+
+    Args:
+        loaded: The loaded ML model and encoder to predict with.
+        data:   Titanic passengers to predict.
+
+    Returns:
+        List of survival prediction floats, one for each passenger.
+
+    Raises:
+        Saturated: If too many predictions are already pending in worker processes.
+    """
+    if executor.started:
+        return await executor.predict(loaded, data)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, predict, loaded, data)
+
+
+# Collects concurrent single passenger predictions into batches, predicting a batch
+# per worker process at a time
+batcher = MicroBatcher(
+    predict_async,
+    window=settings.batch_window_ms / 1000,
+    max_size=settings.batch_max_size,
+    concurrency=max(settings.inference_processes, 1),
+    max_queue=settings.batch_max_queue,
+)
+
+
+def _too_many_requests(error: Saturated) -> HTTPException:
+    """Create a 429 response for when predictions are saturated, to retry later.
+
+    Args:
+        error:  The saturation error.
+
+    Returns:
+        The HTTPException to raise.
+    """
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail=f"Too many pending predictions, retry later: {error}",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def _predict_ndjson(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Predict passengers of NDJSON <chunks> in batches, and yield NDJSON predictions.
+
+    Args:
+        chunks: Byte chunks of an NDJSON body, with one passenger per line.
+
+    Yields:
+        NDJSON lines of survival predictions, or errors for invalid passengers.
+    """
+    # Use the same model for the whole stream, even if a new version is swapped in
+    loaded = registry.get()
+
+    batch: List[Tuple[int, Titanic]] = []
+    async for number, line in _read_lines(chunks):
+        try:
+            batch.append((number, api_models.Passenger.parse_raw(line).to_titanic()))
+        except ValidationError as error:
+            yield json.dumps({"line": number, "error": error.errors()}, default=str)
+            yield "\n"
+            continue
+
+        # Predict the batch as soon as it is full
+        if len(batch) >= settings.max_batch_size:
+            yield await _predict_lines(loaded, batch)
+            batch = []
+
+    if batch:
+        yield await _predict_lines(loaded, batch)
+
+
+async def _predict_lines(loaded: LoadedModel, batch: List[Tuple[int, Titanic]]) -> str:
+    """Predict a <batch> of numbered passengers, and format them as NDJSON lines.
+
+    Args:
+        loaded: The loaded ML model and encoder to predict with.
+        batch:  Tuples of line numbers and passengers to predict.
+
+    Returns:
+        NDJSON lines of the survival predictions, or errors for all passengers of the
+        batch if predictions are saturated.
+    """
+    numbers, data = zip(*batch)
+    try:
+        preds = await predict_async(loaded, list(data))
+    except Saturated as error:
+        # The response has already started, so fail the lines of the batch instead
+        detail = _too_many_requests(error).detail
+        return "".join(
+            json.dumps({"line": number, "error": detail}) + "\n" for number in numbers
+        )
+    return "".join(
+        json.dumps({"line": number, "survived": pred}) + "\n"
+        for number, pred in zip(numbers, preds)
+    )
+
+
+async def _read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split byte <chunks> into numbered lines, skipping empty lines.
+
+    Args:
+        chunks: Byte chunks to split into lines.
+
+    Yields:
+        Tuples of line numbers (starting at 1) and lines.
+    """
+    buffer = b""
+    number = 0
+    async for chunk in chunks:
+        *lines, buffer = (buffer + chunk).split(b"\n")
+        for line in lines:
+            number += 1
+            if line.strip():
+                yield number, line
+
+    if buffer.strip():
+        yield number + 1, buffer
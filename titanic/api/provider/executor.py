@@ -0,0 +1,207 @@
+"""Process pool that predicts off the event loop, using all cores of the API host."""
+import os
+import time
+import asyncio
+import threading
+import multiprocessing
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from . import metrics
+from ...data.titanic import Titanic
+from ...ml import registry as ml_registry
+from ...ml.registry import InferenceEngine, LoadedModel
+
+# Model version, model and encoder that a worker process has loaded
+_worker: Optional[LoadedModel] = None
+_worker_engine = InferenceEngine.NUMPY
+
+
+class Saturated(RuntimeError):
+    """Raised when too many predictions are pending, to respond 429 instead."""
+
+
+class InferenceExecutor:
+    """Pool of pre-warmed worker processes, each holding a loaded model and encoder.
+
+    Every prediction is dispatched with the version of the model to predict with,
+    and workers load a new version on their first prediction of it. So when a new
+    version is swapped in, predictions already dispatched finish with the old one.
+    """
+
+    processes: int
+    max_pending: int
+    engine: InferenceEngine
+    _pool: Optional[ProcessPoolExecutor]
+    _pending: int
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        processes: int,
+        max_pending: int = 1000,
+        engine: InferenceEngine = InferenceEngine.NUMPY,
+    ) -> None:
+        """Initialize InferenceExecutor, without starting any processes yet.
+
+        Args:
+            processes:      Number of worker processes.
+            max_pending:    Max number of dispatched predictions that are not done,
+                            before raising Saturated.
+            engine:         Engine that the workers load ML models to predict with.
+        """
+        self.processes = processes
+        self.max_pending = max_pending
+        self.engine = engine
+        self._pool = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        """Check whether the worker processes are started."""
+        return self._pool is not None
+
+    @property
+    def pending(self) -> int:
+        """Get the number of dispatched predictions that are not done."""
+        return self._pending
+
+    def start(self, version: str) -> None:
+        """Start the worker processes, and wait until they have loaded <version>.
+
+        Args:
+            version:    The model version to pre-warm the workers with.
+        """
+        if self._pool is not None:
+            return
+        # Spawn instead of fork, as the API process has threads (e.g. model polling)
+        self._pool = ProcessPoolExecutor(
+            self.processes,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.engine, version),
+        )
+        # All workers are started by the first dispatch, and load <version> first
+        self.reload(version, wait=True)
+
+    def stop(self) -> None:
+        """Stop the worker processes, after the dispatched predictions are done."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def reload(self, version: str, wait: bool = False) -> None:
+        """Dispatch loads of <version>, so idle workers load it before it's needed.
+
+        Loads are dispatched like predictions, so a busy worker may not get one, and
+        then loads <version> on its first prediction of it instead.
+
+        Args:
+            version:    The model version to load.
+            wait:       Whether to wait until the loads are done.
+        """
+        if self._pool is None:
+            return
+        loads = [self._pool.submit(_load, version) for _ in range(self.processes)]
+        if wait:
+            for load in loads:
+                load.result()
+
+    async def predict(self, loaded: LoadedModel, data: List[Titanic]) -> List[float]:
+        """Predict how likely each passenger in <data> would survive, in a worker.
+
+        Args:
+            loaded: The loaded ML model to predict with, of which only the version
+                    is sent to the worker.
+            data:   Titanic passengers to predict.
+
+        Returns:
+            List of survival prediction floats, one for each passenger.
+
+        Raises:
+            Saturated:      If max_pending predictions are already dispatched.
+            RuntimeError:   If the executor isn't started.
+        """
+        if self._pool is None:
+            raise RuntimeError("The inference executor isn't started")
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise Saturated(f"{self._pending} predictions are already pending")
+            self._pending += 1
+        try:
+            future = self._pool.submit(_predict, loaded.version, data)
+        except BaseException:
+            self._done()
+            raise
+        future.add_done_callback(lambda _: self._done())
+
+        preds, encode_seconds, predict_seconds = await asyncio.wrap_future(future)
+        metrics.STAGE_LATENCY.observe(encode_seconds, "encode")
+        metrics.STAGE_LATENCY.observe(predict_seconds, "predict")
+        return preds
+
+    def _done(self) -> None:
+        """Count a dispatched prediction as done."""
+        with self._lock:
+            self._pending -= 1
+
+
+def _init_worker(engine: InferenceEngine, version: str) -> None:
+    """Initialize a worker process, and pre-warm it by loading <version>.
+
+    Args:
+        engine:     Engine to load ML models to predict with.
+        version:    The model version to load.
+    """
+    global _worker_engine  # pylint: disable=global-statement
+    _worker_engine = engine
+    _load(version)
+
+
+def _load(version: str) -> int:
+    """Load <version> in a worker process, unless already loaded.
+
+    Args:
+        version:    The model version to load.
+
+    Returns:
+        The process id of the worker.
+    """
+    global _worker  # pylint: disable=global-statement
+    if _worker is None or _worker.version != version:
+        start = time.perf_counter()
+        model_, encoder = ml_registry.load(version, _worker_engine)
+        _worker = LoadedModel(
+            model=model_,
+            encoder=encoder,
+            version=version,
+            loaded_at=datetime.now(),
+            load_seconds=time.perf_counter() - start,
+        )
+    return os.getpid()
+
+
+def _predict(version: str, data: List[Titanic]) -> Tuple[List[float], float, float]:
+    """Predict <data> in a worker process, with the model of <version>.
+
+    Args:
+        version:    The model version to predict with, loaded if not already.
+        data:       Titanic passengers to predict.
+
+    Returns:
+        Tuple of the survival prediction floats, and the seconds it took to encode
+        and to predict, to observe in the API process.
+    """
+    _load(version)
+    if _worker is None:  # pragma: no cover
+        raise RuntimeError("The worker has no model loaded")
+
+    start = time.perf_counter()
+    data_enc = _worker.encoder.encode(data)
+    encoded = time.perf_counter()
+    preds: List[float] = _worker.model.predict_proba(data_enc)[:, 1].tolist()
+    predicted = time.perf_counter()
+
+    return preds, encoded - start, predicted - encoded
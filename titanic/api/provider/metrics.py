@@ -0,0 +1,274 @@
+"""Prometheus metrics of the Titanic ML API, in the Prometheus text format.
+
+Implemented in-house instead of with a client library, to keep the overhead on the
+hot path to a lock and a few additions per observation. Metrics that mirror state
+kept elsewhere (e.g. the loaded model version and the cache counters) are collected
+by callbacks when scraped, so they cost nothing per request.
+"""
+import abc
+import time
+import bisect
+import threading
+import contextlib
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+# Label values of a metric sample, in the order of the metric's label names
+Labels = Tuple[str, ...]
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Upper bounds of the batch size histogram buckets
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Metric(abc.ABC):
+    """Base class of metrics, with a name, help text and label names."""
+
+    name: str
+    help: str
+    type: str
+    label_names: Tuple[str, ...]
+
+    def __init__(self, name: str, help_: str, label_names: Sequence[str] = ()) -> None:
+        """Initialize Metric, and register it to be exposed.
+
+        Args:
+            name:           Name of the metric, e.g. "titanic_requests_total".
+            help_:          Description of the metric.
+            label_names:    Names of the labels of the metric's samples.
+        """
+        self.name = name
+        self.help = help_
+        self.label_names = tuple(label_names)
+        METRICS.append(self)
+
+    @abc.abstractmethod
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        """Collect the samples of the metric.
+
+        Returns:
+            List of the sample name suffix, label values and value of each sample.
+        """
+
+    def expose(self) -> str:
+        """Expose the metric in the Prometheus text format.
+
+        Returns:
+            The HELP and TYPE lines of the metric, followed by one line per sample.
+        """
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for suffix, labels, value in self.samples():
+            names = self.label_names + (("le",) if suffix == "_bucket" else ())
+            pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, labels))
+            pairs = f"{{{pairs}}}" if pairs else ""
+            lines.append(f"{self.name}{suffix}{pairs} {value!r}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Counter metric, that only increases."""
+
+    type = "counter"
+    _values: Dict[Labels, float]
+    _lock: threading.Lock
+
+    def __init__(self, name: str, help_: str, label_names: Sequence[str] = ()) -> None:
+        """Initialize Counter, see Metric."""
+        super().__init__(name, help_, label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Increase the counter of <labels> by <amount>.
+
+        Args:
+            labels: Label values, in the order of the label names.
+            amount: Amount to increase by.
+        """
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        """Collect the value of each label combination, see Metric."""
+        with self._lock:
+            return [("", labels, value) for labels, value in self._values.items()]
+
+
+class Histogram(Metric):
+    """Histogram metric, counting observations in cumulative buckets."""
+
+    type = "histogram"
+    buckets: Tuple[float, ...]
+    _counts: Dict[Labels, List[int]]
+    _sums: Dict[Labels, float]
+    _lock: threading.Lock
+
+    def __init__(
+        self,
+        name: str,
+        help_: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        """Initialize Histogram, see Metric.
+
+        Args:
+            name:           Name of the metric.
+            help_:          Description of the metric.
+            label_names:    Names of the labels of the metric's samples.
+            buckets:        Sorted upper bounds of the buckets, excluding +Inf.
+        """
+        super().__init__(name, help_, label_names)
+        self.buckets = tuple(buckets)
+        self._counts = {}
+        self._sums = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Observe <value> for <labels>.
+
+        Only the count of the one bucket that <value> falls in is increased, and the
+        buckets are made cumulative when collected.
+
+        Args:
+            value:  Value to observe, e.g. seconds of latency.
+            labels: Label values, in the order of the label names.
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(labels)
+            if counts is None:
+                counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+                self._sums[labels] = 0.0
+            counts[index] += 1
+            self._sums[labels] += value
+
+    @contextlib.contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the seconds that the context takes, for <labels>.
+
+        Args:
+            labels: Label values, in the order of the label names.
+
+        Yields:
+            Nothing, while timing.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        """Collect the cumulative buckets, sum and count of each label combination."""
+        with self._lock:
+            counts = {labels: list(values) for labels, values in self._counts.items()}
+            sums = dict(self._sums)
+
+        samples: List[Tuple[str, Labels, float]] = []
+        for labels, values in counts.items():
+            total = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values):
+                total += count
+                bucket = "+Inf" if bound == float("inf") else repr(bound)
+                samples.append(("_bucket", labels + (bucket,), float(total)))
+            samples.append(("_sum", labels, sums[labels]))
+            samples.append(("_count", labels, float(total)))
+        return samples
+
+
+class Collected(Metric):
+    """Metric whose samples are collected by a callback when scraped."""
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        name: str,
+        help_: str,
+        type_: str,
+        collect: Callable[[], Sequence[Tuple[Labels, float]]],
+        label_names: Sequence[str] = (),
+    ) -> None:
+        """Initialize Collected, see Metric.
+
+        Args:
+            name:           Name of the metric.
+            help_:          Description of the metric.
+            type_:          Prometheus type of the metric, e.g. "gauge".
+            collect:        Callback returning the label values and value of each
+                            sample.
+            label_names:    Names of the labels of the metric's samples.
+        """
+        super().__init__(name, help_, label_names)
+        self.type = type_
+        self._collect: Callable[[], Sequence[Tuple[Labels, float]]] = collect
+
+    def samples(self) -> List[Tuple[str, Labels, float]]:
+        """Collect the samples using the callback, see Metric."""
+        return [("", labels, float(value)) for labels, value in self._collect()]
+
+
+# All metrics, in the order they were created
+METRICS: List[Metric] = []
+
+
+def expose() -> str:
+    """Expose all metrics in the Prometheus text format.
+
+    Returns:
+        The text of all metrics, to respond to a Prometheus scrape with.
+    """
+    return "\n".join(metric.expose() for metric in METRICS) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a label <value> for the Prometheus text format.
+
+    Args:
+        value:  Label value to escape.
+
+    Returns:
+        The escaped label value.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUESTS = Counter(
+    "titanic_requests_total",
+    "Number of handled HTTP requests.",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "titanic_request_duration_seconds",
+    "Latency of handling HTTP requests, until the response starts.",
+    ["method", "route"],
+)
+STAGE_LATENCY = Histogram(
+    "titanic_stage_duration_seconds",
+    "Latency of each stage of predicting, e.g. load, validate, encode and predict.",
+    ["stage"],
+)
+BATCH_SIZE = Histogram(
+    "titanic_batch_size",
+    "Number of passengers of each micro-batch of single passenger predictions.",
+    buckets=BATCH_SIZE_BUCKETS,
+)
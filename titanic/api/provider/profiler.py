@@ -0,0 +1,217 @@
+"""On-demand statistical profiling of API requests, as flame graph ready stacks.
+
+While a request is profiled, a background thread samples the call stack of every
+thread of the process at a fixed interval, using sys._current_frames(), which is
+cheap enough to run in production. Every thread is sampled, and not only the event
+loop, as predictions run on executor threads, so requests that are handled at the
+same time show up in the profile too.
+
+The samples of each profiled request are saved as a "folded stacks" text file, one
+line per unique stack with its number of samples, e.g.
+"MainThread;uvicorn.main:run;...;titanic.ml.inference:predict_proba 12", which is
+the input format of flamegraph.pl and speedscope.
+"""
+import os
+import re
+import sys
+import hmac
+import time
+import random
+import itertools
+import threading
+from types import FrameType
+from typing import Counter, Dict, List, Optional
+
+# Request header to profile a request with, if its value is the profiling token
+PROFILE_HEADER = "X-Profile-Token"
+# Response header with the file name of the profile of a profiled request
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+PROFILE_PATH = "titanic/data/profiles"
+
+# Max number of frames of each sampled stack, the innermost ones if it's deeper
+MAX_DEPTH = 128
+
+# Max length of the route part of profile file names, and characters replaced in it
+MAX_SLUG = 64
+UNSAFE_CHARS = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+class Sampler:
+    """Samples the call stacks of all threads at a fixed interval, on a thread."""
+
+    interval: float
+    samples: Counter[str]
+    _stop: threading.Event
+    _thread: Optional[threading.Thread]
+
+    def __init__(self, interval: float = 0.001) -> None:
+        """Initialize Sampler.
+
+        Args:
+            interval:   Seconds between each sample.
+        """
+        self.interval = interval
+        self.samples = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """Start sampling, until stop() is called."""
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> Counter[str]:
+        """Stop sampling, and get the samples.
+
+        Returns:
+            Number of samples of each folded stack.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return self.samples
+
+    def sample(self) -> None:
+        """Sample the call stack of every thread, except the sampler's own, once."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        own = threading.get_ident()
+        # pylint: disable=protected-access
+        for ident, frame in sys._current_frames().items():
+            if ident != own:
+                self.samples[fold(frame, names.get(ident, str(ident)))] += 1
+
+    def _run(self) -> None:
+        """Sample at every interval, until stopped."""
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+
+class RequestProfiler:
+    """Decides which requests to profile, and saves their profiles to files."""
+
+    rate: float
+    token: Optional[str]
+    path: str
+    interval: float
+    keep: int
+    _ids: "itertools.count[int]"
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        rate: float = 0.0,
+        token: Optional[str] = None,
+        path: str = PROFILE_PATH,
+        interval: float = 0.001,
+        keep: int = 100,
+    ) -> None:
+        """Initialize RequestProfiler.
+
+        Args:
+            rate:       Fraction of all requests to profile, 0 to only profile the
+                        requests with the profiling token.
+            token:      Optional secret token that profiles a request if it's the value
+                        of its PROFILE_HEADER header, None or empty to disable it.
+            path:       Folder to save the profiles in.
+            interval:   Seconds between each sample of a profiled request.
+            keep:       Max number of the latest profiles to keep, removing the oldest.
+        """
+        self.rate = rate
+        self.token = token
+        self.path = path
+        self.interval = interval
+        self.keep = keep
+        self._ids = itertools.count()
+
+    def sampled(self, header: Optional[str] = None) -> bool:
+        """Decide whether to profile a request.
+
+        Args:
+            header:     Value of the PROFILE_HEADER header of the request, if any.
+
+        Returns:
+            True if the request has the profiling token, or is randomly sampled.
+        """
+        if self.token and header is not None:
+            if hmac.compare_digest(header.encode(), self.token.encode()):
+                return True
+        return self.rate > 0.0 and random.random() < self.rate  # nosec
+
+    def start(self) -> Sampler:
+        """Start profiling a request.
+
+        Returns:
+            The started sampler, to stop and save when the request is handled.
+        """
+        sampler = Sampler(self.interval)
+        sampler.start()
+        return sampler
+
+    def save(self, samples: Counter[str], route: str) -> str:
+        """Save the <samples> of a profiled request, and remove the oldest profiles.
+
+        Args:
+            samples:    Number of samples of each folded stack.
+            route:      Route path template of the request, e.g. "/titanic/survived",
+                        to name the profile by.
+
+        Returns:
+            File name of the saved profile, in the profiles folder.
+
+        Raises:
+            OSError: If the profile can't be saved, e.g. if the disk is full.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        # Only keep characters that are safe in file names, of a bounded length
+        slug = UNSAFE_CHARS.sub("-", route).strip("-")[:MAX_SLUG] or "root"
+        # Names start with the time to sort by it, and the process id keeps the names
+        # of API worker processes that share the profiles folder apart
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        name = f"{stamp}-{os.getpid()}-{next(self._ids):06d}-{slug}.folded"
+        with open(os.path.join(self.path, name), "w", encoding="utf-8") as file:
+            file.writelines(f"{stack} {count}\n" for stack, count in samples.items())
+
+        # Keep only the latest profiles, as names sort by time
+        profiles = sorted(f for f in os.listdir(self.path) if f.endswith(".folded"))
+        excess = len(profiles) - self.keep if self.keep > 0 else 0
+        for old in profiles[:excess] if excess > 0 else []:
+            os.remove(os.path.join(self.path, old))
+        return name
+
+
+def fold(frame: Optional[FrameType], root: str) -> str:
+    """Fold the call stack of <frame> into one line, from its root to <frame>.
+
+    Args:
+        frame:  The innermost frame of the call stack.
+        root:   Name of the root of the stack, e.g. the thread name.
+
+    Returns:
+        Frames of the stack as "module:function", separated by semicolons.
+    """
+    names: List[str] = []
+    while frame is not None and len(names) < MAX_DEPTH:
+        code = frame.f_code
+        module = frame.f_globals.get("__name__", code.co_filename)
+        names.append(f"{module}:{code.co_name}")
+        frame = frame.f_back
+    # Semicolons separate frames, so they can't be in the (thread) name of the root
+    return ";".join([root.replace(";", "_"), *reversed(names)])
+
+
+def read(path: str) -> Dict[str, int]:
+    """Read a folded stacks profile.
+
+    Args:
+        path:   Path of the profile.
+
+    Returns:
+        Number of samples of each folded stack.
+    """
+    with open(path, encoding="utf-8") as file:
+        return {
+            stack: int(count)
+            for stack, count in (line.rsplit(" ", 1) for line in file if line.strip())
+        }
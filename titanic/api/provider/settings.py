@@ -0,0 +1,37 @@
+"""Titanic ML API settings, read from environment variables."""
+from typing import Optional
+from pydantic import BaseSettings
+from .profiler import PROFILE_PATH
+from ...ml.registry import InferenceEngine
+
+
+class Settings(BaseSettings):
+    """Titanic ML API settings.
+
+    Every setting can be overridden by an environment variable with the prefix
+    "TITANIC_", e.g. TITANIC_MODEL_POLL_INTERVAL=30.
+    """
+
+    model_poll_interval: float = 10.0
+    inference_engine: InferenceEngine = InferenceEngine.NUMPY
+    max_batch_size: int = 10000
+    cache_size: int = 10000
+    cache_ttl: float = 3600.0
+    batch_window_ms: float = 2.0
+    batch_max_size: int = 64
+    batch_max_queue: int = 10000
+    inference_processes: int = 0
+    inference_max_pending: int = 1000
+    profile_rate: float = 0.0
+    profile_token: Optional[str] = None
+    profile_path: str = PROFILE_PATH
+    profile_interval_ms: float = 1.0
+    profile_keep: int = 100
+
+    class Config:  # pylint: disable=too-few-public-methods
+        """Pydantic config of the settings."""
+
+        env_prefix = "TITANIC_"
+
+
+settings = Settings()
@@ -0,0 +1,297 @@
+"""Synthetic raw Titanic dataset generator, for scale and load testing.
+
+Generates raw datasets of any size, with the same columns as the bundled CSV and
+distributions fitted from it. The datasets are generated and written chunk by
+chunk, so that only one chunk is kept in memory at a time.
+"""
+import argparse
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List
+import numpy as np
+import pandas as pd
+from .enums import ColumnsRaw
+
+TRAIN_PATH = "titanic/data/csv/train.csv"
+CHUNKSIZE = 100_000
+
+# Columns that are resampled jointly from the rows of the bundled CSV, to keep their
+# correlations (e.g. class, fare and survival) and their missing values
+JOINT_COLUMNS = [
+    ColumnsRaw.SURVIVED.value,
+    ColumnsRaw.PERSON_CLASS.value,
+    ColumnsRaw.SEX.value,
+    ColumnsRaw.AGE.value,
+    ColumnsRaw.SIBLINGS_SPOUSES.value,
+    ColumnsRaw.PARENTS_CHILDREN.value,
+    ColumnsRaw.TICKET_PRICE.value,
+    ColumnsRaw.EMBARKED.value,
+]
+
+# Names are "<surname>, <title>. <given names>", and cabins are e.g. "C23 C25 C27"
+NAME_PATTERN = r"^(?P<surname>[^,]*), (?P<title>[^.]*)\. (?P<given>.*)$"
+CABIN_PATTERN = r"^(?P<letter>[A-Z])(?P<number>\d*)"
+
+
+@dataclass
+class Profile:  # pylint: disable=too-many-instance-attributes
+    """Distributions of a raw Titanic dataset, to generate synthetic datasets from."""
+
+    # Column names, in the order of the raw dataset
+    columns: List[str]
+    # Rows of the columns that are resampled jointly
+    joint: pd.DataFrame
+    # Name title, given names and number of cabins of each joint row
+    titles: np.ndarray
+    given_names: np.ndarray
+    cabin_counts: np.ndarray
+    # Surnames and tickets, that are sampled independently
+    surnames: np.ndarray
+    tickets: np.ndarray
+    # Cabin letters of each person class, and their probabilities
+    cabin_letters: Dict[int, np.ndarray]
+    cabin_letter_probs: Dict[int, np.ndarray]
+    # Cabin numbers
+    cabin_numbers: np.ndarray
+
+
+def fit(path: str = TRAIN_PATH) -> Profile:
+    """Fit the distributions of the raw Titanic CSV dataset at <path>.
+
+    Args:
+        path:   Path to the raw Titanic CSV dataset.
+
+    Returns:
+        The fitted Profile, to generate synthetic datasets from.
+    """
+    # pylint infers read_csv() as a chunk reader, not a DataFrame
+    # pylint: disable=no-member,unsubscriptable-object
+    df = pd.read_csv(path)
+    names = df[ColumnsRaw.NAME.value].str.extract(NAME_PATTERN)
+    cabins = df[ColumnsRaw.CABIN.value]
+
+    # Cabin letters of each person class, and the numbers of all cabins
+    first_cabins = cabins.dropna().str.extract(CABIN_PATTERN)
+    letters = first_cabins["letter"].groupby(
+        df.loc[first_cabins.index, ColumnsRaw.PERSON_CLASS.value]
+    )
+    cabin_letters, cabin_letter_probs = {}, {}
+    for person_class, class_letters in letters:
+        counts = class_letters.value_counts(normalize=True)
+        cabin_letters[int(person_class)] = counts.index.to_numpy()
+        cabin_letter_probs[int(person_class)] = counts.to_numpy()
+    numbers = cabins.dropna().str.findall(r"\d+").explode().dropna()
+
+    return Profile(
+        columns=list(df.columns),
+        joint=df[JOINT_COLUMNS].reset_index(drop=True),
+        titles=names["title"].fillna("Mr").to_numpy(),
+        given_names=names["given"].fillna("").to_numpy(),
+        cabin_counts=cabins.str.split().str.len().fillna(0).astype(int).to_numpy(),
+        surnames=names["surname"].dropna().unique(),
+        tickets=df[ColumnsRaw.TICKET.value].to_numpy(),
+        cabin_letters=cabin_letters,
+        cabin_letter_probs=cabin_letter_probs,
+        cabin_numbers=numbers.astype(int).to_numpy(),
+    )
+
+
+def generate(
+    profile: Profile, rows: int, seed: int = 0, chunksize: int = CHUNKSIZE
+) -> Iterator[pd.DataFrame]:
+    """Generate a synthetic raw Titanic dataset of <rows> rows, chunk by chunk.
+
+    Each chunk is generated with its own random generator, seeded by <seed> and the
+    chunk's index, so the same <seed> and <chunksize> always give the same dataset.
+
+    Args:
+        profile:    Distributions to generate the dataset from.
+        rows:       Number of rows of the dataset.
+        seed:       Seed of the random generation.
+        chunksize:  Max number of rows per chunk.
+
+    Yields:
+        Raw Titanic DataFrame chunks, with the columns of the fitted dataset.
+    """
+    for index, start in enumerate(range(0, rows, chunksize)):
+        rng = np.random.default_rng([seed, index])
+        size = min(chunksize, rows - start)
+        yield _generate_chunk(profile, rng, start, size)
+
+
+def write(  # pylint: disable=too-many-arguments
+    path: str,
+    rows: int,
+    seed: int = 0,
+    chunksize: int = CHUNKSIZE,
+    profile_path: str = TRAIN_PATH,
+) -> None:
+    """Generate a synthetic raw Titanic dataset, and write it chunk by chunk.
+
+    The dataset is written as Parquet if <path> ends with ".parquet", which needs
+    pyarrow to be installed, and else as CSV.
+
+    Args:
+        path:           Path of the dataset to write.
+        rows:           Number of rows of the dataset.
+        seed:           Seed of the random generation.
+        chunksize:      Max number of rows to generate and write at a time.
+        profile_path:   Path of the raw Titanic CSV dataset to fit distributions of.
+    """
+    chunks = generate(fit(profile_path), rows, seed, chunksize)
+
+    if path.endswith(".parquet"):
+        _write_parquet(path, chunks)
+        return
+
+    for index, chunk in enumerate(chunks):
+        chunk.to_csv(
+            path, mode="w" if index == 0 else "a", header=index == 0, index=False
+        )
+
+
+def _generate_chunk(
+    profile: Profile, rng: np.random.Generator, start: int, size: int
+) -> pd.DataFrame:
+    """Generate one chunk of <size> rows of a synthetic raw Titanic dataset.
+
+    Args:
+        profile:    Distributions to generate the chunk from.
+        rng:        Random generator of the chunk.
+        start:      Number of rows generated before this chunk.
+        size:       Number of rows of the chunk.
+
+    Returns:
+        The raw Titanic DataFrame chunk.
+    """
+    # Resample joint columns, and jitter ages and fares so they aren't just copies
+    rows = rng.integers(0, len(profile.joint), size)
+    chunk = profile.joint.iloc[rows].reset_index(drop=True)
+    age = chunk[ColumnsRaw.AGE.value]
+    age = (age + rng.normal(0.0, 2.0, size)).clip(0.42, 80.0)
+    chunk[ColumnsRaw.AGE.value] = age.where(age < 1.0, age.round())
+    fare = chunk[ColumnsRaw.TICKET_PRICE.value] * rng.lognormal(0.0, 0.1, size)
+    chunk[ColumnsRaw.TICKET_PRICE.value] = fare.round(4)
+
+    chunk[ColumnsRaw.PASSENGER_ID.value] = np.arange(start + 1, start + size + 1)
+    chunk[ColumnsRaw.NAME.value] = (
+        pd.Series(rng.choice(profile.surnames, size))
+        + ", "
+        + profile.titles[rows]
+        + ". "
+        + profile.given_names[rows]
+    )
+    chunk[ColumnsRaw.TICKET.value] = rng.choice(profile.tickets, size)
+    chunk[ColumnsRaw.CABIN.value] = _cabins(
+        profile, rng, chunk[ColumnsRaw.PERSON_CLASS.value].to_numpy(), rows
+    )
+
+    return chunk[profile.columns]
+
+
+def _cabins(
+    profile: Profile,
+    rng: np.random.Generator,
+    person_class: np.ndarray,
+    rows: np.ndarray,
+) -> pd.Series:
+    """Generate cabins, e.g. "C23 C25 C27", with a letter drawn per person class.
+
+    Args:
+        profile:        Distributions to generate the cabins from.
+        rng:            Random generator of the chunk.
+        person_class:   Person class of each row.
+        rows:           Index of the joint row that each row was resampled from.
+
+    Returns:
+        Cabins of each row, NaN for the rows without any cabin.
+    """
+    size = len(rows)
+    letters = np.full(size, "", dtype=object)
+    for class_, class_letters in profile.cabin_letters.items():
+        in_class = person_class == class_
+        letters[in_class] = rng.choice(
+            class_letters, in_class.sum(), p=profile.cabin_letter_probs[class_]
+        )
+
+    # Multiple cabins of a row have the same letter, and consecutive even numbers
+    counts = profile.cabin_counts[rows]
+    numbers = rng.choice(profile.cabin_numbers, size)
+    cabins = pd.Series(letters + numbers.astype(str), dtype=object)
+    for i in range(1, counts.max(initial=0)):
+        more = counts > i
+        cabins[more] += " " + letters[more] + (numbers[more] + 2 * i).astype(str)
+
+    return cabins.where((counts > 0) & (letters != ""))
+
+
+def _write_parquet(path: str, chunks: Iterator[pd.DataFrame]) -> None:
+    """Write DataFrame <chunks> to a Parquet file at <path>, one row group per chunk.
+
+    Args:
+        path:   Path of the Parquet file to write.
+        chunks: DataFrame chunks to write, all with the same columns.
+
+    Raises:
+        ImportError: If pyarrow, which is an optional dependency, isn't installed.
+    """
+    try:
+        # pylint: disable=import-outside-toplevel
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError(
+            "Writing Parquet needs pyarrow: pip install pyarrow"
+        ) from error
+
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                schema = _parquet_schema(pa, chunk)
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(
+                pa.Table.from_pandas(chunk, schema, preserve_index=False)
+            )
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _parquet_schema(pa: Any, chunk: pd.DataFrame) -> Any:
+    """Infer the Parquet schema of all chunks from the first DataFrame <chunk>.
+
+    Columns that are all NaN in the first chunk are inferred as nulls, while they
+    are strings, so they are typed as strings instead.
+
+    Args:
+        pa:     The pyarrow module, imported by _write_parquet() as it's optional.
+        chunk:  The first DataFrame chunk to write.
+
+    Returns:
+        The pyarrow schema to write all chunks with.
+    """
+    schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+    for i, field in enumerate(schema):
+        if pa.types.is_null(field.type):
+            schema = schema.set(i, pa.field(field.name, pa.string()))
+    return schema
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("path", help="Path of the CSV or .parquet file to write.")
+    arg_parser.add_argument(
+        "--rows", type=int, required=True, help="Number of rows to generate."
+    )
+    arg_parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the random generation."
+    )
+    arg_parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=CHUNKSIZE,
+        help="Max number of rows to generate and write at a time.",
+    )
+    args = arg_parser.parse_args()
+
+    write(args.path, args.rows, args.seed, args.chunksize)
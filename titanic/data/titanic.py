@@ -1,4 +1,8 @@
 """Titanic dataclasses."""
+import dataclasses
+from enum import Enum
+from typing import Callable, Dict, List, Type, Union
+import numpy as np
 from pydantic import Field, StrictInt, StrictFloat
 from pydantic.dataclasses import dataclass
 from .enums import PersonClass, NameTitle, Sex, CabinLetter, Embarked
@@ -35,3 +39,134 @@ class Titanic:
 
     categorical: Categorical
     numerical: Numerical
+
+
+# Enum of each categorical variable, and Python type of each numerical variable
+CATEGORICAL_ENUMS: Dict[str, Type[Enum]] = dict(
+    Categorical.__annotations__  # pylint: disable=no-member
+)
+NUMERICAL_TYPES: Dict[str, type] = {
+    col: float if issubclass(type_, float) else int
+    for col, type_ in Numerical.__annotations__.items()  # pylint: disable=no-member
+}
+
+
+@dataclasses.dataclass
+class TitanicColumns:
+    """Columnar Titanic dataset, with one NumPy array per variable.
+
+    Stores the same variables as a list of Titanic dataclasses, but without creating
+    a Python object per row. Categorical variables are stored as small integer codes,
+    being the index of the value in its enum, e.g. 1 for Sex.FEMALE. The same
+    constraints as the Titanic dataclasses are validated, but for whole columns.
+    """
+
+    categorical: Dict[str, np.ndarray]
+    numerical: Dict[str, np.ndarray]
+
+    def __post_init__(self) -> None:
+        """Validate the columns after initialization."""
+        self.validate()
+
+    def __len__(self) -> int:
+        """Get the number of rows of the dataset."""
+        return len(next(iter(self.categorical.values())))
+
+    def validate(self) -> None:
+        """Validate that the columns have correct names, data types and values.
+
+        Raises:
+            ValueError: If any column is missing, has a wrong data type or length, or
+                a categorical code that is not a value of its enum.
+        """
+        if list(self.categorical) != list(CATEGORICAL_ENUMS):
+            raise ValueError(f"Categorical columns must be {list(CATEGORICAL_ENUMS)}")
+        if list(self.numerical) != list(NUMERICAL_TYPES):
+            raise ValueError(f"Numerical columns must be {list(NUMERICAL_TYPES)}")
+
+        length = len(self)
+        for col, codes in self.categorical.items():
+            _validate_column(col, codes, length, int)
+            if len(codes) > 0 and (
+                codes.min() < 0 or codes.max() >= len(CATEGORICAL_ENUMS[col])
+            ):
+                raise ValueError(f"Column {col} has codes that are not valid enums")
+
+        for col, values in self.numerical.items():
+            _validate_column(col, values, length, NUMERICAL_TYPES[col])
+
+    @classmethod
+    def concat(cls, parts: List["TitanicColumns"]) -> "TitanicColumns":
+        """Concatenate columnar Titanic datasets <parts> into one dataset.
+
+        Args:
+            parts:  Columnar Titanic datasets to concatenate, in order.
+
+        Returns:
+            The concatenated columnar Titanic dataset.
+        """
+        return cls(
+            categorical={
+                col: np.concatenate([part.categorical[col] for part in parts])
+                for col in CATEGORICAL_ENUMS
+            },
+            numerical={
+                col: np.concatenate([part.numerical[col] for part in parts])
+                for col in NUMERICAL_TYPES
+            },
+        )
+
+    def to_titanic(self) -> List[Titanic]:
+        """Convert the columns to a list of Titanic dataclasses, one per row.
+
+        Returns:
+            List of Titanic dataclasses.
+        """
+        enums: Dict[str, List[Enum]] = {
+            col: list(enum) for col, enum in CATEGORICAL_ENUMS.items()
+        }
+
+        # Create the dataclasses through plain callables, as mypy doesn't know the
+        # __init__ of pydantic dataclasses without the pydantic plugin
+        titanic: Callable[..., Titanic] = Titanic
+        categorical: Callable[..., Categorical] = Categorical
+        numerical: Callable[..., Numerical] = Numerical
+        return [
+            titanic(
+                categorical=categorical(
+                    **{
+                        col: enums[col][codes[i]]
+                        for col, codes in self.categorical.items()
+                    }
+                ),
+                numerical=numerical(
+                    **{col: values[i].item() for col, values in self.numerical.items()}
+                ),
+            )
+            for i in range(len(self))
+        ]
+
+
+def _validate_column(col: str, values: np.ndarray, length: int, type_: type) -> None:
+    """Validate that the column <values> is 1D, of <length> and of the <type_> kind.
+
+    Args:
+        col:    Name of the column, used in the error message.
+        values: The column values to validate.
+        length: The length that the column should have.
+        type_:  Python type (int or float) that the column data type should be.
+
+    Raises:
+        ValueError: If the column has a wrong shape or data type.
+    """
+    if values.ndim != 1 or len(values) != length:
+        raise ValueError(f"Column {col} must be 1D with length {length}")
+    if values.dtype.kind != ("f" if type_ is float else "i"):
+        raise ValueError(f"Column {col} must have a {type_.__name__} data type")
+
+
+# Titanic dataset, either row-wise as dataclasses or columnar as NumPy arrays
+TitanicData = Union[List[Titanic], TitanicColumns]
+
+# Titanic survival labels, either as a list or as a NumPy array
+TitanicLabels = Union[List[int], np.ndarray]
@@ -0,0 +1,186 @@
+"""Compact model artifacts of raw NumPy arrays, loaded without unpickling.
+
+An artifact is a folder with one .npy file per array, and a manifest.json file
+describing them, including the backend of the ML model. The arrays are
+memory-mapped when loaded, so that all processes (e.g. uvicorn workers) that load
+the same artifact share the same memory pages. Only backends with a NumPy predictor
+can be saved as artifacts.
+
+Loading an artifact only needs NumPy, so sklearn is only imported to save one.
+"""
+import os
+import json
+from typing import Any, Dict, Tuple, TYPE_CHECKING
+import numpy as np
+from .enums import Backend
+from .inference import (
+    Kernel,
+    LinearPredictor,
+    NystroemPredictor,
+    Predictor,
+    SVCPredictor,
+    TableEncoder,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .backends import Classifier
+    from ..preprocessing.encoder import TitanicEncoder
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+
+
+def supports(model: "Classifier") -> bool:
+    """Check if <model> can be saved as an artifact, i.e. has a NumPy predictor.
+
+    Args:
+        model:  Trained ML model of any backend.
+
+    Returns:
+        True if <model> can be saved as an artifact.
+    """
+    # pylint: disable=import-outside-toplevel
+    from . import backends
+
+    return backends.backend_of(model) != Backend.HIST_GRADIENT_BOOSTING
+
+
+def save(path: str, model: "Classifier", encoder: "TitanicEncoder") -> None:
+    """Save <model> and <encoder> as an artifact in the folder <path>.
+
+    Args:
+        path:       Folder to save the artifact in, which must exist.
+        model:      The trained binary ML model to save, of a supported backend.
+        encoder:    The fitted TitanicEncoder to save.
+
+    Raises:
+        ValueError: If the backend of <model> can't be saved as an artifact.
+    """
+    # pylint: disable=import-outside-toplevel
+    from . import backends
+
+    predictor = backends.to_predictor(model)
+    if predictor is None:
+        raise ValueError(f"Unsupported model artifact backend {type(model).__name__}")
+    table_encoder = TableEncoder.from_encoder(encoder)
+
+    # Arrays of the model and encoder, with categories as fixed width strings (as
+    # object arrays can only be saved by pickling)
+    arrays: Dict[str, np.ndarray] = {
+        "numerical_min": table_encoder.numerical_min,
+        "numerical_scale": table_encoder.numerical_scale,
+        "classes": predictor.classes,
+    }
+    for i, categories in enumerate(table_encoder.categories):
+        arrays[f"categories_{i}"] = categories
+
+    # Scalar parameters of the model and encoder
+    manifest: Dict[str, Any] = {
+        "format": FORMAT_VERSION,
+        "backend": backends.backend_of(model).value,
+        "intercept": predictor.intercept,
+        "n_categorical": len(table_encoder.categories),
+    }
+
+    # Arrays and scalar parameters of the model's backend
+    if isinstance(predictor, SVCPredictor):
+        arrays["support_vectors"] = predictor.support_vectors
+        arrays["dual_coef"] = predictor.dual_coef
+        manifest.update(
+            kernel=predictor.kernel.kernel,
+            gamma=predictor.kernel.gamma,
+            degree=predictor.kernel.degree,
+            coef0=predictor.kernel.coef0,
+            prob_a=predictor.platt[0],
+            prob_b=predictor.platt[1],
+        )
+    elif isinstance(predictor, NystroemPredictor):
+        arrays["basis"] = predictor.basis
+        arrays["weights"] = predictor.weights
+        manifest.update(kernel=predictor.kernel.kernel, gamma=predictor.kernel.gamma)
+    else:
+        arrays["coef"] = predictor.coef
+
+    for name, array in arrays.items():
+        np.save(os.path.join(path, f"{name}.npy"), array, allow_pickle=False)
+
+    # Save the scalar parameters and the array names to the manifest
+    manifest["arrays"] = sorted(arrays)
+    with open(os.path.join(path, MANIFEST), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+
+
+def exists(path: str) -> bool:
+    """Check if there is an artifact saved in the folder <path>.
+
+    Args:
+        path:   Folder to check.
+
+    Returns:
+        True if there is an artifact in <path>.
+    """
+    return os.path.isfile(os.path.join(path, MANIFEST))
+
+
+def load(path: str) -> Tuple[Predictor, TableEncoder]:
+    """Load the artifact in the folder <path>, memory-mapping its arrays.
+
+    Args:
+        path:   Folder of the artifact to load.
+
+    Returns:
+        Tuple of the loaded predictor and encoder.
+    """
+    with open(os.path.join(path, MANIFEST), encoding="utf-8") as file:
+        manifest: Dict[str, Any] = json.load(file)
+    if manifest["format"] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported model artifact format in {path}")
+
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+        for name in manifest["arrays"]
+    }
+
+    # Create the predictor of the backend that the artifact was saved from
+    backend = Backend(manifest["backend"])
+    predictor: Predictor
+    if backend == Backend.SVC:
+        predictor = SVCPredictor(
+            support_vectors=arrays["support_vectors"],
+            dual_coef=arrays["dual_coef"],
+            intercept=manifest["intercept"],
+            kernel=Kernel(
+                kernel=manifest["kernel"],
+                gamma=manifest["gamma"],
+                degree=manifest.get("degree", Kernel.degree),
+                coef0=manifest.get("coef0", Kernel.coef0),
+            ),
+            platt=(manifest["prob_a"], manifest["prob_b"]),
+            classes=arrays["classes"],
+        )
+    elif backend in (Backend.LOGISTIC_REGRESSION, Backend.SGD):
+        predictor = LinearPredictor(
+            coef=arrays["coef"],
+            intercept=manifest["intercept"],
+            classes=arrays["classes"],
+        )
+    elif backend == Backend.NYSTROEM:
+        predictor = NystroemPredictor(
+            basis=arrays["basis"],
+            weights=arrays["weights"],
+            intercept=manifest["intercept"],
+            kernel=Kernel(kernel=manifest["kernel"], gamma=manifest["gamma"]),
+            classes=arrays["classes"],
+        )
+    else:
+        raise ValueError(f"Unsupported model artifact backend {backend} in {path}")
+
+    encoder = TableEncoder(
+        categories=[
+            arrays[f"categories_{i}"] for i in range(manifest["n_categorical"])
+        ],
+        numerical_min=arrays["numerical_min"],
+        numerical_scale=arrays["numerical_scale"],
+    )
+
+    return predictor, encoder
@@ -0,0 +1,233 @@
+"""ML model backends that can be trained, saved and served the same way."""
+from typing import Any, Dict, Optional, Union, TYPE_CHECKING
+import numpy as np
+from sklearn.svm import SVC
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.experimental import (  # noqa: F401 pylint: disable=unused-import
+    enable_hist_gradient_boosting,
+)
+from sklearn.ensemble import HistGradientBoostingClassifier
+from .enums import Backend
+from .inference import LinearPredictor, NystroemPredictor, Predictor, SVCPredictor
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..preprocessing.encoder import TitanicEncoder
+
+# Default number of kernel basis vectors of the nystroem backend
+BUDGET = 200
+
+
+class NystroemSVC(BaseEstimator, ClassifierMixin):
+    """Kernel approximation of an RBF SVC, on a budget of kernel basis vectors.
+
+    Maps the data to the RBF kernel against <n_components> sampled rows (Nystroem),
+    and trains a logistic regression on the mapped features. Unlike an SVC, whose
+    number of support vectors grows with the number of rows, the prediction cost and
+    size of the model are bounded by its budget.
+    """
+
+    def __init__(
+        self,
+        n_components: int = BUDGET,
+        gamma: Union[str, float] = "scale",
+        C: float = 1.0,
+        random_state: Optional[int] = 0,
+    ) -> None:
+        """Initialize NystroemSVC.
+
+        Args:
+            n_components:   Budget of kernel basis vectors, at most the number of rows.
+            gamma:          RBF kernel coefficient, or "scale" for the same default as
+                            sklearn's SVC, 1 / (n_features * X.var()).
+            C:              Inverse regularization strength of the logistic regression.
+            random_state:   Seed of the sampling of the basis vectors.
+        """
+        self.n_components = n_components
+        self.gamma = gamma
+        self.C = C
+        self.random_state = random_state
+
+    def fit(self, x: Any, y: Any) -> "NystroemSVC":
+        """Sample the kernel basis vectors from <x>, and train on the mapped <x>.
+
+        Args:
+            x:  Encoded Titanic data, one row per passenger.
+            y:  Titanic survival labels.
+
+        Returns:
+            The trained NystroemSVC itself.
+        """
+        x = np.asarray(x, dtype=float)
+        gamma = 1.0 / (x.shape[1] * x.var()) if self.gamma == "scale" else self.gamma
+
+        # pylint: disable=attribute-defined-outside-init
+        self.nystroem_ = Nystroem(
+            gamma=gamma,
+            n_components=min(self.n_components, len(x)),
+            random_state=self.random_state,
+        ).fit(x)
+        self.linear_ = LogisticRegression(C=self.C, max_iter=1000)
+        self.linear_.fit(self.nystroem_.transform(x), y)
+        self.classes_ = self.linear_.classes_
+        return self
+
+    def decision_function(self, x: Any) -> np.ndarray:
+        """Compute the decision values of <x>.
+
+        Args:
+            x:  Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Decision value of each row, positive for the second class.
+        """
+        decision: np.ndarray = self.linear_.decision_function(
+            self.nystroem_.transform(x)
+        )
+        return decision
+
+    def predict_proba(self, x: Any) -> np.ndarray:
+        """Predict the probability of each class for <x>.
+
+        Args:
+            x:  Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Numpy array of the probabilities of each class, one row per row.
+        """
+        proba: np.ndarray = self.linear_.predict_proba(self.nystroem_.transform(x))
+        return proba
+
+    def predict(self, x: Any) -> np.ndarray:
+        """Predict the class of <x>.
+
+        Args:
+            x:  Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Numpy array of the predicted class of each row.
+        """
+        prediction: np.ndarray = self.linear_.predict(self.nystroem_.transform(x))
+        return prediction
+
+
+Classifier = Union[
+    SVC,
+    LogisticRegression,
+    SGDClassifier,
+    NystroemSVC,
+    HistGradientBoostingClassifier,
+]
+
+# Class of each backend, and its default hyperparameters
+CLASSIFIERS: Dict[Backend, Any] = {
+    Backend.SVC: SVC,
+    Backend.LOGISTIC_REGRESSION: LogisticRegression,
+    Backend.SGD: SGDClassifier,
+    Backend.NYSTROEM: NystroemSVC,
+    Backend.HIST_GRADIENT_BOOSTING: HistGradientBoostingClassifier,
+}
+# Backends that can be updated incrementally with new data, using partial_fit()
+ONLINE_BACKENDS = (Backend.SGD,)
+# Backends that can be trained on sparse encoded data, see TitanicEncoder.encode_sparse
+SPARSE_BACKENDS = (Backend.SVC, Backend.LOGISTIC_REGRESSION, Backend.SGD)
+
+DEFAULT_PARAMS: Dict[Backend, Dict[str, Any]] = {
+    Backend.SVC: {"probability": True},
+    Backend.LOGISTIC_REGRESSION: {"max_iter": 1000},
+    Backend.SGD: {"loss": "log", "random_state": 0},
+    Backend.NYSTROEM: {},
+    Backend.HIST_GRADIENT_BOOSTING: {"random_state": 0},
+}
+
+
+def create(backend: Backend, params: Optional[Dict[str, Any]] = None) -> Classifier:
+    """Create an untrained ML model of <backend>.
+
+    Args:
+        backend:    Backend of the ML model.
+        params:     Optional hyperparameters, overriding the backend's defaults.
+
+    Returns:
+        The untrained ML model.
+    """
+    return CLASSIFIERS[backend](**{**DEFAULT_PARAMS[backend], **(params or {})})
+
+
+def backend_of(model: Classifier) -> Backend:
+    """Get the backend of a <model>.
+
+    Args:
+        model:  ML model of any backend.
+
+    Returns:
+        The backend of <model>.
+
+    Raises:
+        ValueError: If <model> isn't of any backend.
+    """
+    for backend, classifier in CLASSIFIERS.items():
+        if isinstance(model, classifier):
+            return backend
+    raise ValueError(f"Unsupported ML model {type(model).__name__}")
+
+
+def to_predictor(model: Classifier) -> Optional[Predictor]:
+    """Extract the NumPy predictor of a trained <model>, if its backend has one.
+
+    Args:
+        model:  Trained ML model of any backend.
+
+    Returns:
+        The NumPy predictor of <model>, or None if it must be predicted by sklearn.
+    """
+    backend = backend_of(model)
+    if backend == Backend.SVC:
+        return SVCPredictor.from_sklearn(model)
+    if backend in (Backend.LOGISTIC_REGRESSION, Backend.SGD):
+        return LinearPredictor.from_sklearn(model)
+    if backend == Backend.NYSTROEM:
+        return NystroemPredictor.from_sklearn(model)
+    return None
+
+
+def adapt(model: SGDClassifier, old: "TitanicEncoder", new: "TitanicEncoder") -> None:
+    """Adapt a trained linear <model> in-place, from the <old> to the <new> encoder.
+
+    The <new> encoder is the <old> one partially fitted on more data, which may add
+    categories and widen the numerical scaling. Coefficients of added categories are
+    zero, and coefficients of numerical variables are rescaled, so that <model>
+    predicts the same as before for data encoded by the <new> encoder.
+
+    Args:
+        model:  Trained linear ML model, fitted on data encoded by <old>.
+        old:    Encoder that <model> was trained with.
+        new:    Encoder to adapt <model> to.
+    """
+    coef = model.coef_[0]
+    n_categorical = sum(len(categories) for categories in old.enc.categories_)
+
+    # Map the coefficient of each old category to its column in the new encoding
+    columns = [
+        offset + np.searchsorted(new_categories, old_categories)
+        for offset, old_categories, new_categories in zip(
+            np.cumsum([0] + [len(c) for c in new.enc.categories_[:-1]]),
+            old.enc.categories_,
+            new.enc.categories_,
+        )
+    ]
+    n_categorical_new = sum(len(categories) for categories in new.enc.categories_)
+    coef_new = np.zeros(n_categorical_new + len(new.numerical_min))
+    coef_new[np.concatenate(columns)] = coef[:n_categorical]
+
+    # Rescale numerical coefficients, and shift the intercept by the change of min
+    numerical_coef = coef[n_categorical:] * old.numerical_scale
+    coef_new[n_categorical_new:] = numerical_coef / new.numerical_scale
+    intercept = model.intercept_[0] + numerical_coef @ (
+        new.numerical_min - old.numerical_min
+    )
+
+    model.coef_ = coef_new[np.newaxis, :]
+    model.intercept_ = np.array([intercept])
+    model.n_features_in_ = len(coef_new)
@@ -0,0 +1,17 @@
+"""Various ML model enums, importable without importing sklearn."""
+from enum import Enum
+
+
+class Backend(str, Enum):
+    """ML model backends that scheduled_train can train, and the API can serve."""
+
+    # Kernel SVM, whose training time is superlinear in the number of rows
+    SVC = "svc"
+    # Linear models, that train and predict in linear time
+    LOGISTIC_REGRESSION = "logistic_regression"
+    SGD = "sgd"
+    # Kernel approximation of the SVC, on a budget of kernel basis vectors, whose
+    # prediction cost and size don't grow with the number of rows
+    NYSTROEM = "nystroem"
+    # Gradient boosted trees, on binned features
+    HIST_GRADIENT_BOOSTING = "hist_gradient_boosting"
@@ -0,0 +1,596 @@
+"""NumPy-only inference of trained ML models and encoders, e.g. for the API."""
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, List, Tuple, Union, TYPE_CHECKING
+import numpy as np
+from ..data.titanic import (
+    TitanicColumns,
+    TitanicData,
+    CATEGORICAL_ENUMS,
+    NUMERICAL_TYPES,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from sklearn.svm import SVC
+    from sklearn.linear_model import LogisticRegression, SGDClassifier
+    from ..preprocessing.encoder import TitanicEncoder
+    from .backends import NystroemSVC
+
+# Bounds of the pairwise probabilities, and the tolerance of the probability
+# estimation, the same as libsvm (which sklearn's SVC uses) to give the same result.
+MIN_PROB = 1e-7
+MAX_ITER = 100
+EPS = 0.005 / 2
+
+# Max number of rows to estimate probabilities of in plain Python instead of NumPy
+SCALAR_ROWS = 8
+
+# Enum code of each enum value of each categorical variable
+CATEGORICAL_CODES: Dict[str, Dict[Enum, int]] = {
+    col: {e: i for i, e in enumerate(enum.__members__.values())}
+    for col, enum in CATEGORICAL_ENUMS.items()
+}
+
+
+class TableEncoder:  # pylint: disable=too-few-public-methods
+    """Titanic dataset encoder, using fitted category tables instead of sklearn.
+
+    Encodes the same as a fitted TitanicEncoder, from the categories of each
+    categorical variable, and the min-max scaling of the numerical variables.
+    """
+
+    categories: List[np.ndarray]
+    numerical_min: np.ndarray
+    numerical_scale: np.ndarray
+    _columns: List[np.ndarray]
+
+    def __init__(
+        self,
+        categories: List[np.ndarray],
+        numerical_min: np.ndarray,
+        numerical_scale: np.ndarray,
+    ) -> None:
+        """Initialize TableEncoder.
+
+        Args:
+            categories:         Fitted category values of each categorical variable.
+            numerical_min:      Fitted min value of each numerical variable.
+            numerical_scale:    Fitted scale of each numerical variable.
+        """
+        self.categories = categories
+        self.numerical_min = numerical_min
+        self.numerical_scale = numerical_scale
+
+        # Encoded column of each enum code of each categorical variable, or -1 if the
+        # enum value wasn't fitted (which is encoded as all zeros, like sklearn)
+        self._columns = []
+        offset = 0
+        for enum, values in zip(CATEGORICAL_ENUMS.values(), categories):
+            index: Dict[str, int] = {value: i for i, value in enumerate(values)}
+            self._columns.append(
+                np.array(
+                    [offset + index[e.value] if e.value in index else -1 for e in enum]
+                )
+            )
+            offset += len(values)
+
+    @classmethod
+    def from_encoder(cls, encoder: "TitanicEncoder") -> "TableEncoder":
+        """Extract the category tables and scaling of a fitted <encoder>.
+
+        Args:
+            encoder:    Fitted TitanicEncoder.
+
+        Returns:
+            The TableEncoder of <encoder>.
+        """
+        return cls(
+            categories=[values.astype(str) for values in encoder.enc.categories_],
+            numerical_min=encoder.numerical_min,
+            numerical_scale=encoder.numerical_scale,
+        )
+
+    def encode(self, data: TitanicData) -> np.ndarray:
+        """Encode <data>, one hot encoding categorical variables and normalizing
+        numerical variables.
+
+        Args:
+            data:   Titanic dataset to encode.
+
+        Returns:
+            Numpy array of the encoded Titanic data, to be used for prediction.
+        """
+        codes, numerical = _codes(data), _numerical(data)
+        n_categorical = sum(len(values) for values in self.categories)
+        data_enc = np.zeros((len(numerical), n_categorical + numerical.shape[1]))
+
+        # One hot encode categorical variables
+        rows = np.arange(len(numerical))
+        for columns, col_codes in zip(self._columns, codes.T):
+            col_enc = columns[col_codes]
+            known = col_enc >= 0
+            data_enc[rows[known], col_enc[known]] = 1.0
+
+        # Normalize numerical variables in-place, using the fitted scaling
+        numerical_enc = data_enc[:, n_categorical:]
+        np.subtract(numerical, self.numerical_min, out=numerical_enc)
+        numerical_enc *= self.numerical_scale
+
+        return data_enc
+
+
+@dataclass(frozen=True)
+class Kernel:
+    """Kernel function of an SVC, with the same parameters as sklearn's SVC."""
+
+    kernel: str = "rbf"
+    gamma: float = 1.0
+    degree: int = 3
+    coef0: float = 0.0
+
+    def __call__(
+        self, data_enc: np.ndarray, support_vectors: np.ndarray, support_norms: Any
+    ) -> np.ndarray:
+        """Compute the kernel between each row of <data_enc> and <support_vectors>.
+
+        Args:
+            data_enc:           Encoded Titanic data, one row per passenger.
+            support_vectors:    Support vectors, one row per support vector.
+            support_norms:      Squared norm of each support vector (for "rbf").
+
+        Returns:
+            Kernel matrix, one row per row and one column per support vector.
+        """
+        kernel: np.ndarray = data_enc @ support_vectors.T
+        if self.kernel == "rbf":
+            # Squared distances between rows and support vectors, |x|^2+|sv|^2-2x.sv
+            kernel *= -2.0
+            kernel += np.einsum("ij,ij->i", data_enc, data_enc)[:, np.newaxis]
+            kernel += support_norms
+            np.maximum(kernel, 0.0, out=kernel)
+            # exp(-gamma * distance)
+            kernel *= -self.gamma
+            np.exp(kernel, out=kernel)
+        elif self.kernel == "poly":
+            kernel = np.power(self.gamma * kernel + self.coef0, self.degree)
+        elif self.kernel == "sigmoid":
+            kernel = np.tanh(self.gamma * kernel + self.coef0)
+        elif self.kernel != "linear":
+            raise ValueError(f"Unsupported kernel {self.kernel}")
+
+        return kernel
+
+
+class SVCPredictor:
+    """Binary SVC predictor in NumPy, computing the same predictions as sklearn's SVC.
+
+    Uses the support vectors, dual coefficients, intercept, kernel and Platt scaling
+    parameters of a trained SVC(probability=True), with the sign conventions of
+    libsvm (sklearn's private "_dual_coef_" and "_intercept_"). Skips all of the
+    input validation and libsvm wrapping of sklearn, which dominates the time of
+    predicting a single row.
+    """
+
+    support_vectors: np.ndarray
+    dual_coef: np.ndarray
+    intercept: float
+    kernel: Kernel
+    platt: Tuple[float, float]
+    classes: np.ndarray
+    _support_norms: np.ndarray
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        support_vectors: np.ndarray,
+        dual_coef: np.ndarray,
+        intercept: float,
+        kernel: Kernel,
+        platt: Tuple[float, float],
+        classes: np.ndarray,
+    ) -> None:
+        """Initialize SVCPredictor.
+
+        Args:
+            support_vectors:    Support vectors, one row per support vector.
+            dual_coef:          Dual coefficient of each support vector.
+            intercept:          Intercept of the decision function.
+            kernel:             Kernel function and its parameters.
+            platt:              Platt scaling parameters A and B.
+            classes:            The two class labels.
+        """
+        self.support_vectors = support_vectors
+        self.dual_coef = dual_coef
+        self.intercept = intercept
+        self.kernel = kernel
+        self.platt = platt
+        self.classes = classes
+        self._support_norms = np.einsum("ij,ij->i", support_vectors, support_vectors)
+
+    @classmethod
+    def from_sklearn(cls, model: "SVC") -> "SVCPredictor":
+        """Extract the predictor of a trained sklearn <model>.
+
+        Args:
+            model:  Trained binary sklearn SVC(probability=True).
+
+        Returns:
+            The predictor of <model>.
+
+        Raises:
+            ValueError: If <model> isn't binary or wasn't trained with probabilities.
+        """
+        if len(model.classes_) != 2 or not model.probability:
+            raise ValueError("Only binary SVCs with probabilities are supported")
+
+        # Support vectors and dual coefficients are sparse if the model was trained
+        # on sparse data
+        # pylint: disable=protected-access
+        support_vectors, dual_coef = model.support_vectors_, model._dual_coef_
+        if hasattr(support_vectors, "toarray"):
+            support_vectors, dual_coef = support_vectors.toarray(), dual_coef.toarray()
+
+        return cls(
+            support_vectors=np.asarray(support_vectors, dtype=float),
+            dual_coef=np.asarray(dual_coef[0]).ravel(),
+            intercept=float(model._intercept_[0]),
+            kernel=Kernel(
+                kernel=model.kernel,
+                gamma=float(model._gamma),
+                degree=int(model.degree),
+                coef0=float(model.coef0),
+            ),
+            platt=(float(model.probA_[0]), float(model.probB_[0])),
+            classes=model.classes_,
+        )
+
+    def decision_function(self, data_enc: np.ndarray) -> np.ndarray:
+        """Compute the libsvm decision values of <data_enc>.
+
+        Args:
+            data_enc:   Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Decision value of each row, positive for the first class.
+        """
+        kernel = self.kernel(data_enc, self.support_vectors, self._support_norms)
+        decision: np.ndarray = kernel @ self.dual_coef
+        decision += self.intercept
+        return decision
+
+    def predict_proba(self, data_enc: np.ndarray) -> np.ndarray:
+        """Predict the probability of each class for <data_enc>.
+
+        Args:
+            data_enc:   Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Numpy array of the probabilities of each class, one row per row.
+        """
+        # Platt scaling of the decision values to pairwise probabilities
+        prob_a, prob_b = self.platt
+        pairwise = 1.0 / (
+            1.0 + np.exp(self.decision_function(data_enc) * prob_a + prob_b)
+        )
+        np.clip(pairwise, MIN_PROB, 1.0 - MIN_PROB, out=pairwise)
+
+        return _pairwise_coupling(pairwise)
+
+    def predict(self, data_enc: np.ndarray) -> np.ndarray:
+        """Predict the class of <data_enc>.
+
+        Args:
+            data_enc:   Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Numpy array of the predicted class of each row.
+        """
+        second: np.ndarray = self.decision_function(data_enc) <= 0.0
+        return self.classes[second.astype(int)]
+
+
+class LinearPredictor:
+    """Binary linear predictor in NumPy, e.g. of sklearn's LogisticRegression.
+
+    Computes the same predictions as any binary sklearn linear model with logistic
+    probabilities, i.e. LogisticRegression and SGDClassifier(loss="log").
+    """
+
+    coef: np.ndarray
+    intercept: float
+    classes: np.ndarray
+
+    def __init__(self, coef: np.ndarray, intercept: float, classes: np.ndarray) -> None:
+        """Initialize LinearPredictor.
+
+        Args:
+            coef:       Coefficient of each encoded variable.
+            intercept:  Intercept of the decision function.
+            classes:    The two class labels.
+        """
+        self.coef = coef
+        self.intercept = intercept
+        self.classes = classes
+
+    @classmethod
+    def from_sklearn(
+        cls, model: Union["LogisticRegression", "SGDClassifier"]
+    ) -> "LinearPredictor":
+        """Extract the predictor of a trained sklearn <model>.
+
+        Args:
+            model:  Trained binary sklearn linear model with logistic probabilities.
+
+        Returns:
+            The predictor of <model>.
+
+        Raises:
+            ValueError: If <model> isn't binary.
+        """
+        if len(model.classes_) != 2:
+            raise ValueError("Only binary linear models are supported")
+
+        return cls(
+            coef=np.asarray(model.coef_[0], dtype=float),
+            intercept=float(model.intercept_[0]),
+            classes=model.classes_,
+        )
+
+    def decision_function(self, data_enc: np.ndarray) -> np.ndarray:
+        """Compute the decision values of <data_enc>.
+
+        Args:
+            data_enc:   Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Decision value of each row, positive for the second class.
+        """
+        decision: np.ndarray = data_enc @ self.coef
+        decision += self.intercept
+        return decision
+
+    def predict_proba(self, data_enc: np.ndarray) -> np.ndarray:
+        """Predict the probability of each class for <data_enc>.
+
+        Args:
+            data_enc:   Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Numpy array of the probabilities of each class, one row per row.
+        """
+        prob = 1.0 / (1.0 + np.exp(-self.decision_function(data_enc)))
+        return np.column_stack((1.0 - prob, prob))
+
+    def predict(self, data_enc: np.ndarray) -> np.ndarray:
+        """Predict the class of <data_enc>.
+
+        Args:
+            data_enc:   Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Numpy array of the predicted class of each row.
+        """
+        second: np.ndarray = self.decision_function(data_enc) > 0.0
+        return self.classes[second.astype(int)]
+
+
+class NystroemPredictor:
+    """Binary Nystroem kernel approximation predictor in NumPy, e.g. of NystroemSVC.
+
+    The Nystroem mapping of a row is its kernel against the basis vectors, times the
+    normalization matrix, and its decision value is the mapping times the linear
+    coefficients. The normalization and the coefficients are folded into one weight
+    per basis vector, so predicting costs one kernel evaluation per basis vector.
+    """
+
+    basis: np.ndarray
+    weights: np.ndarray
+    intercept: float
+    kernel: Kernel
+    classes: np.ndarray
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        basis: np.ndarray,
+        weights: np.ndarray,
+        intercept: float,
+        kernel: Kernel,
+        classes: np.ndarray,
+    ) -> None:
+        """Initialize NystroemPredictor.
+
+        Args:
+            basis:      Kernel basis vectors, one row per basis vector.
+            weights:    Weight of each basis vector.
+            intercept:  Intercept of the decision function.
+            kernel:     Kernel function and its parameters.
+            classes:    The two class labels.
+        """
+        self.basis = basis
+        self.weights = weights
+        self.intercept = intercept
+        self.kernel = kernel
+        self.classes = classes
+        self._basis_norms = np.einsum("ij,ij->i", basis, basis)
+
+    @classmethod
+    def from_sklearn(cls, model: "NystroemSVC") -> "NystroemPredictor":
+        """Extract the predictor of a trained <model>.
+
+        Args:
+            model:  Trained binary NystroemSVC.
+
+        Returns:
+            The predictor of <model>.
+
+        Raises:
+            ValueError: If <model> isn't binary.
+        """
+        if len(model.classes_) != 2:
+            raise ValueError("Only binary Nystroem models are supported")
+
+        # Fold the normalization of the mapping into the linear coefficients
+        nystroem, linear = model.nystroem_, model.linear_
+        return cls(
+            basis=np.asarray(nystroem.components_, dtype=float),
+            weights=nystroem.normalization_.T @ linear.coef_[0],
+            intercept=float(linear.intercept_[0]),
+            kernel=Kernel(kernel="rbf", gamma=float(nystroem.gamma)),
+            classes=model.classes_,
+        )
+
+    def decision_function(self, data_enc: np.ndarray) -> np.ndarray:
+        """Compute the decision values of <data_enc>.
+
+        Args:
+            data_enc:   Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Decision value of each row, positive for the second class.
+        """
+        kernel = self.kernel(data_enc, self.basis, self._basis_norms)
+        decision: np.ndarray = kernel @ self.weights
+        decision += self.intercept
+        return decision
+
+    def predict_proba(self, data_enc: np.ndarray) -> np.ndarray:
+        """Predict the probability of each class for <data_enc>.
+
+        Args:
+            data_enc:   Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Numpy array of the probabilities of each class, one row per row.
+        """
+        prob = 1.0 / (1.0 + np.exp(-self.decision_function(data_enc)))
+        return np.column_stack((1.0 - prob, prob))
+
+    def predict(self, data_enc: np.ndarray) -> np.ndarray:
+        """Predict the class of <data_enc>.
+
+        Args:
+            data_enc:   Encoded Titanic data, one row per passenger.
+
+        Returns:
+            Numpy array of the predicted class of each row.
+        """
+        second: np.ndarray = self.decision_function(data_enc) > 0.0
+        return self.classes[second.astype(int)]
+
+
+# NumPy predictors of the ML model backends that have one
+Predictor = Union[SVCPredictor, LinearPredictor, NystroemPredictor]
+
+
+def _pairwise_coupling(pairwise: np.ndarray) -> np.ndarray:
+    """Estimate class probabilities from two-class <pairwise> probabilities.
+
+    Vectorized over rows, but iterates exactly like libsvm's multiclass_probability()
+    does for two classes, so that the probabilities are the same as sklearn's. A few
+    rows are iterated in plain Python instead, as the per-call overhead of NumPy
+    dominates for e.g. single-row predictions.
+
+    Args:
+        pairwise:   Probability of the first class over the second, of each row.
+
+    Returns:
+        Numpy array of the probabilities of each class, one row per row.
+    """
+    if len(pairwise) <= SCALAR_ROWS:
+        return np.array([_couple(r_01) for r_01 in pairwise.tolist()]).reshape(-1, 2)
+
+    # Q matrix of each row, Q[t][t] = r[j][t]^2 and Q[t][j] = -r[j][t] * r[t][j]
+    r_01, r_10 = pairwise, np.subtract(1.0, pairwise)
+    q_mat = np.array([[r_10 * r_10, -r_10 * r_01], [-r_01 * r_10, r_01 * r_01]])
+
+    probs = np.full((2, len(pairwise)), 0.5)
+    active = np.ones(len(pairwise), dtype=bool)
+    for _ in range(MAX_ITER):
+        q_p = np.einsum("tjn,jn->tn", q_mat, probs)
+        p_q_p = np.einsum("tn,tn->n", probs, q_p)
+        active &= np.abs(q_p - p_q_p).max(axis=0) >= EPS
+        if not active.any():
+            break
+
+        for t in range(2):
+            diff = np.where(active, (p_q_p - q_p[t]) / q_mat[t, t], 0.0)
+            probs[t] += diff
+            p_q_p = (p_q_p + diff * (diff * q_mat[t, t] + 2.0 * q_p[t])) / (
+                (1.0 + diff) * (1.0 + diff)
+            )
+            q_p = (q_p + diff * q_mat[t]) / (1.0 + diff)
+            probs /= 1.0 + diff
+
+    return probs.T
+
+
+def _couple(r_01: float) -> Tuple[float, float]:
+    """Estimate class probabilities from one two-class probability <r_01>.
+
+    The same as _pairwise_coupling(), but for a single row in plain Python.
+
+    Args:
+        r_01:   Probability of the first class over the second.
+
+    Returns:
+        Tuple of the probabilities of each class.
+    """
+    r_10 = 1.0 - r_01
+    q_mat = ((r_10 * r_10, -r_10 * r_01), (-r_01 * r_10, r_01 * r_01))
+
+    probs = [0.5, 0.5]
+    for _ in range(MAX_ITER):
+        q_p = [q_mat[t][0] * probs[0] + q_mat[t][1] * probs[1] for t in range(2)]
+        p_q_p = probs[0] * q_p[0] + probs[1] * q_p[1]
+        if max(abs(q_p[0] - p_q_p), abs(q_p[1] - p_q_p)) < EPS:
+            break
+
+        for t in range(2):
+            diff = (p_q_p - q_p[t]) / q_mat[t][t]
+            probs[t] += diff
+            p_q_p = (p_q_p + diff * (diff * q_mat[t][t] + 2.0 * q_p[t])) / (
+                (1.0 + diff) * (1.0 + diff)
+            )
+            q_p = [(q_p[j] + diff * q_mat[t][j]) / (1.0 + diff) for j in range(2)]
+            probs = [prob / (1.0 + diff) for prob in probs]
+
+    return probs[0], probs[1]
+
+
+def _codes(data: TitanicData) -> np.ndarray:
+    """Extract the enum codes of the categorical variables of <data>.
+
+    Args:
+        data:   Titanic dataset to extract categorical variables from.
+
+    Returns:
+        Integer numpy array of the enum codes, one row per row.
+    """
+    if isinstance(data, TitanicColumns):
+        return np.column_stack(list(data.categorical.values()))
+
+    cols = list(CATEGORICAL_CODES)
+    return np.array(
+        [
+            [CATEGORICAL_CODES[col][getattr(row.categorical, col)] for col in cols]
+            for row in data
+        ],
+        dtype=int,
+    ).reshape(len(data), len(CATEGORICAL_CODES))
+
+
+def _numerical(data: TitanicData) -> np.ndarray:
+    """Extract the numerical variables of <data>.
+
+    Args:
+        data:   Titanic dataset to extract numerical variables from.
+
+    Returns:
+        Float numpy array of the numerical variables, one row per row.
+    """
+    if isinstance(data, TitanicColumns):
+        return np.column_stack(list(data.numerical.values())).astype(float)
+
+    return np.array(
+        [[getattr(row.numerical, col) for col in NUMERICAL_TYPES] for row in data],
+        dtype=float,
+    ).reshape(len(data), len(NUMERICAL_TYPES))
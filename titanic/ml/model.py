@@ -1,45 +1,181 @@
 """Train, test, save, and load functions for ML models."""
 import os
-import shutil
+import copy
+import json
 import pickle  # nosec
-from typing import List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional, Union
+from dataclasses import asdict, dataclass
 from datetime import datetime
-import dateutil.parser
+import numpy as np
+from scipy import sparse as sp
 from sklearn.svm import SVC
 from sklearn import metrics
+from . import artifact, backends, store, tuning
+from .backends import Backend, Classifier
+from .store import MODEL_PATH
 from ..preprocessing.encoder import TitanicEncoder
-from ..data.titanic import Titanic
+from ..data.titanic import TitanicData, TitanicLabels
 
-MODEL_PATH = "titanic/ml/models"
+VERSION_INFO = "version.json"
 
+# Number of latest model versions to keep when saving a new one
+RETAIN = 10
 
-def train(x_train: List[Titanic], y_train: List[int]) -> Tuple[SVC, TitanicEncoder]:
+
+@dataclass(frozen=True)
+class VersionInfo:
+    """Lineage of a saved model version, to update it incrementally."""
+
+    # Version that this version was incrementally updated from, if any
+    parent: Optional[str] = None
+    # The last passenger id of the data that this version was trained on, if known
+    watermark: Optional[int] = None
+
+
+def train(
+    x_train: TitanicData,
+    y_train: TitanicLabels,
+    encoder: Optional[TitanicEncoder] = None,
+    params: Optional[Dict[str, Any]] = None,
+    backend: Backend = Backend.SVC,
+    sparse: bool = False,
+    budget: Optional[int] = None,
+) -> Tuple[Classifier, TitanicEncoder]:
     """Fit TitanicEncoder and train ML model using <x_train> and <y_train> data.
 
     Args:
         x_train:    Titanic dataset to train on.
         y_train:    Titanic survival labels to train on.
+        encoder:    Optional already fitted encoder, e.g. fitted chunk by chunk. If not
+                    provided, a new encoder is fitted on <x_train>.
+        params:     Optional hyperparameters of the backend, e.g. found by tune(). If
+                    not provided, the backend's defaults are used.
+        backend:    Backend of the ML model to train, default SVC.
+        sparse:     Whether to train on sparse encoded data, instead of densifying the
+                    one hot encoded categorical variables, to save memory.
+        budget:     Optional number of kernel basis vectors of the nystroem backend,
+                    bounding its prediction cost and size, default backends.BUDGET.
 
     Returns:
-        Tuple of the trained SVC model and fitted TitanicEncoder.
+        Tuple of the trained ML model and fitted TitanicEncoder.
+
+    Raises:
+        ValueError: If <sparse> but the backend can't be trained on sparse data, or
+                    <budget> but the backend isn't nystroem.
     """
+    if sparse and backend not in backends.SPARSE_BACKENDS:
+        raise ValueError(f"The {backend.value} backend can't be trained sparse")
+    if budget is not None:
+        if backend != Backend.NYSTROEM:
+            raise ValueError(f"The {backend.value} backend has no budget")
+        params = {**(params or {}), "n_components": budget}
+
     # Create TitanicEncoder to encode categorical data and normalize numerical data
-    encoder = TitanicEncoder()
-    encoder.fit(x_train)
+    if encoder is None:
+        encoder = TitanicEncoder()
+        encoder.fit(x_train)
+    x_train_enc = _encode(encoder, x_train, sparse)
+
+    # Train ML model of the backend
+    model = backends.create(backend, params)
+    model.fit(x_train_enc, y_train)
+
+    return model, encoder
+
+
+def tune(
+    x_train: TitanicData,
+    y_train: TitanicLabels,
+    encoder: Optional[TitanicEncoder] = None,
+    n_iter: Optional[int] = None,
+    processes: Optional[int] = None,
+) -> Tuple[SVC, TitanicEncoder, List[tuning.CandidateResult]]:
+    """Search for the best SVC hyperparameters, and train an ML model with them.
+
+    The hyperparameters of tuning.PARAM_GRID are cross-validated in parallel over a
+    pool of processes, see tuning.search().
+
+    Args:
+        x_train:    Titanic dataset to train on.
+        y_train:    Titanic survival labels to train on.
+        encoder:    Optional already fitted encoder, e.g. fitted chunk by chunk. If not
+                    provided, a new encoder is fitted on <x_train>.
+        n_iter:     Optional number of random candidates to search. If not provided,
+                    every candidate of the grid is searched.
+        processes:  Number of processes to search with, default all cores.
+
+    Returns:
+        Tuple of the trained SVC model, fitted TitanicEncoder, and the result of
+        each hyperparameter candidate (best first).
+    """
+    # Create TitanicEncoder to encode categorical data and normalize numerical data
+    if encoder is None:
+        encoder = TitanicEncoder()
+        encoder.fit(x_train)
     x_train_enc = encoder.encode(x_train)
 
-    # Train SVC model
-    model = SVC(probability=True)
+    # Search for the best hyperparameters, reusing the encoded data for all of them
+    results = tuning.search(
+        x_train_enc, np.asarray(y_train), n_iter=n_iter, processes=processes
+    )
+
+    # Train SVC model with the best hyperparameters
+    model = SVC(probability=True, **results[0].params)
     model.fit(x_train_enc, y_train)
 
+    return model, encoder, results
+
+
+def update(
+    x_new: TitanicData,
+    y_new: TitanicLabels,
+    model: Classifier,
+    encoder: TitanicEncoder,
+    sparse: bool = False,
+) -> Tuple[Classifier, TitanicEncoder]:
+    """Update a trained online ML model and its encoder with only new data.
+
+    The encoder's categories and numerical scaling are partially fitted on <x_new>,
+    the model is adapted to the updated encoding, and then partially fitted on the
+    encoded <x_new>. This takes time proportional to the new data only.
+
+    Args:
+        x_new:      New Titanic data, that <model> hasn't been trained on.
+        y_new:      Titanic survival labels of the new data.
+        model:      Trained ML model of an online backend, e.g. loaded from file.
+        encoder:    Encoder that <model> was trained with.
+        sparse:     Whether to update on sparse encoded data, see train().
+
+    Returns:
+        Tuple of the updated copies of the ML model and TitanicEncoder.
+
+    Raises:
+        ValueError: If the backend of <model> can't be updated incrementally.
+    """
+    backend = backends.backend_of(model)
+    if backend not in backends.ONLINE_BACKENDS:
+        raise ValueError(f"The {backend.value} backend can't be updated incrementally")
+
+    # Update copies, so that the given model and encoder can still be used
+    model, encoder_old = copy.deepcopy(model), encoder
+    encoder = copy.deepcopy(encoder)
+
+    # Update the encoder, and adapt the model to the updated encoding
+    encoder.partial_fit(x_new)
+    backends.adapt(model, encoder_old, encoder)
+
+    # Update the model with the new data
+    model.partial_fit(_encode(encoder, x_new, sparse), y_new)
+
     return model, encoder
 
 
 def test(
-    x_test: List[Titanic],
-    y_test: List[int],
-    model: Optional[SVC] = None,
+    x_test: TitanicData,
+    y_test: TitanicLabels,
+    model: Optional[Classifier] = None,
     encoder: Optional[TitanicEncoder] = None,
+    sparse: bool = False,
 ) -> float:
     """Test ML model on <x_test> and <y_test> data.
 
@@ -48,6 +184,8 @@ def test(
         y_test:     Titanic survival ground truth labels to use for evaluation.
         model:      Optional ML model, if not provided, the latest stored will be loaded
         encoder:    Optional encoder, if not provided, the latest stored will be loaded.
+        sparse:     Whether to predict on sparse encoded data, e.g. for models trained
+                    sparse, see train().
 
     Returns:
         Float accuracy score of the model.
@@ -58,7 +196,7 @@ def test(
     )
 
     # Encode categorical data and normalize numerical data
-    x_test_enc = encoder.encode(x_test)
+    x_test_enc = _encode(encoder, x_test, sparse)
 
     # Predict data
     y_pred = model.predict(x_test_enc)
@@ -69,58 +207,131 @@ def test(
     return score
 
 
-def save(model: SVC, encoder: TitanicEncoder) -> None:
+def save(
+    model: Classifier,
+    encoder: TitanicEncoder,
+    info: VersionInfo = VersionInfo(),
+    retain: Optional[int] = RETAIN,
+) -> str:
     """Save <model> and <encoder> to file, versioned by date.
 
+    The version is written to a staging folder first, and only published as the
+    latest version once complete, see store.publish().
+
     Args:
         model:      The ML model to save to file.
         encoder:    The TitanicEncoder to save to file.
+        info:       Lineage of the version, e.g. its parent version and watermark.
+        retain:     Number of latest versions to keep, pruning older ones. If None,
+                    all versions are kept.
+
+    Returns:
+        The version (date) that the model and encoder were saved as.
     """
-    # Create directory for model and encoder
+    # Create staging directory for model and encoder
     date = datetime.now().strftime("%Y-%m-%dT%H:%M:%S")
-    os.mkdir(f"{MODEL_PATH}/{date}")
+    staging = store.stage(MODEL_PATH)
 
     # Save model to file
-    model_path = f"{MODEL_PATH}/{date}/model.pkl"
+    model_path = f"{staging}/model.pkl"
     with open(model_path, "wb") as file:  # nosec
         pickle.dump(model, file)
 
     # Save encoder to file
-    enc_path = f"{MODEL_PATH}/{date}/encoder.pkl"
+    enc_path = f"{staging}/encoder.pkl"
     with open(enc_path, "wb") as file:  # nosec
         pickle.dump(encoder, file)
 
+    # Save model and encoder as a compact artifact too, to be loaded by the API, if
+    # its backend has a NumPy predictor (else the API loads the pickles)
+    if artifact.supports(model):
+        artifact.save(staging, model, encoder)
 
-def load_latest() -> Tuple[SVC, TitanicEncoder]:
-    """Load the latest trained ML model and encoder from file.
+    # Save the lineage of the version
+    info_path = f"{staging}/{VERSION_INFO}"
+    with open(info_path, "w", encoding="utf-8") as info_file:
+        json.dump(asdict(info), info_file, indent=2)
+
+    # Publish the complete version as the latest one
+    store.publish(MODEL_PATH, staging, date, retain)
+
+    return date
+
+
+def latest_version() -> str:
+    """Get the latest saved model version, without loading the model itself.
 
     Returns:
-        Tuple of the loaded ML model and TitanicEncoder.
+        The version (date) of the latest trained ML model and encoder.
     """
-    # Get the folder with the latest date
-    latest_date = max(
-        dateutil.parser.parse(date) for date in os.listdir(f"{MODEL_PATH}/")
-    ).strftime("%Y-%m-%dT%H:%M:%S")
+    # Read the pointer to the latest version, instead of listing all versions
+    return store.latest(MODEL_PATH)
 
+
+def load(version: str) -> Tuple[Classifier, TitanicEncoder]:
+    """Load the trained ML model and encoder of <version> from file.
+
+    Args:
+        version:    The version (date) of the ML model and encoder to load.
+
+    Returns:
+        Tuple of the loaded ML model and TitanicEncoder.
+    """
     # Load model from file
-    model_path = f"{MODEL_PATH}/{latest_date}/model.pkl"
+    model_path = f"{MODEL_PATH}/{version}/model.pkl"
     with open(model_path, "rb") as file:  # nosec
         model = pickle.load(file)
 
     # Load encoder from file
-    enc_path = f"{MODEL_PATH}/{latest_date}/encoder.pkl"
+    enc_path = f"{MODEL_PATH}/{version}/encoder.pkl"
     with open(enc_path, "rb") as file:  # nosec
         encoder = pickle.load(file)
 
     return model, encoder
 
 
+def load_info(version: str) -> VersionInfo:
+    """Load the lineage of <version>, without loading the model itself.
+
+    Args:
+        version:    The version (date) of the ML model and encoder.
+
+    Returns:
+        The lineage of <version>, empty if it was saved without one.
+    """
+    path = f"{MODEL_PATH}/{version}/{VERSION_INFO}"
+    if not os.path.isfile(path):
+        return VersionInfo()
+    with open(path, encoding="utf-8") as file:
+        return VersionInfo(**json.load(file))
+
+
+def load_latest() -> Tuple[Classifier, TitanicEncoder]:
+    """Load the latest trained ML model and encoder from file.
+
+    Returns:
+        Tuple of the loaded ML model and TitanicEncoder.
+    """
+    return load(latest_version())
+
+
 def delete_latest() -> None:
     """Delete the latest trained ML model and encoder files."""
-    # Get the folder with the latest date
-    latest_date = max(
-        dateutil.parser.parse(date) for date in os.listdir(f"{MODEL_PATH}/")
-    ).strftime("%Y-%m-%dT%H:%M:%S")
+    # Remove the folder of the latest version, and point to the previous version
+    store.remove(MODEL_PATH, latest_version())
+
+
+def _encode(
+    encoder: TitanicEncoder, data: TitanicData, sparse: bool
+) -> Union[np.ndarray, sp.csr_matrix]:
+    """Encode <data> with <encoder>, densely or sparsely.
 
-    # Remove the folder with the latest date, and its model & encoder files
-    shutil.rmtree(f"{MODEL_PATH}/{latest_date}")
+    Args:
+        encoder:    The fitted TitanicEncoder to encode with.
+        data:       Titanic dataset to encode.
+        sparse:     Whether to encode as a sparse CSR matrix, instead of densely.
+
+    Returns:
+        The encoded Titanic data.
+    """
+    return encoder.encode_sparse(data) if sparse else encoder.encode(data)
@@ -0,0 +1,180 @@
+"""In-process registry that keeps the latest ML model version loaded in memory.
+
+Serving only imports NumPy to load and predict with model artifacts, so that API
+processes start fast. sklearn is only imported to load models saved without one.
+"""
+import pickle  # nosec
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+import time
+from typing import Callable, Optional, Tuple, Union, TYPE_CHECKING
+from . import artifact, store
+from .inference import Predictor, TableEncoder
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .backends import Classifier
+    from ..preprocessing.encoder import TitanicEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceEngine(str, Enum):
+    """Engines that loaded ML models can predict with."""
+
+    # NumPy predictor of the memory-mapped model artifact, without sklearn overhead
+    NUMPY = "numpy"
+    # The unpickled sklearn model and encoder
+    SKLEARN = "sklearn"
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """An ML model and encoder version that is loaded in memory."""
+
+    model: Union["Classifier", Predictor]
+    encoder: Union["TitanicEncoder", TableEncoder]
+    version: str
+    loaded_at: datetime
+    # Seconds that it took to load the model and encoder
+    load_seconds: float = 0.0
+
+
+class ModelRegistry:
+    """Keep the latest ML model version loaded, and hot-swap it when a new is saved.
+
+    The loaded model is swapped by replacing a single reference, so callers that
+    already got a LoadedModel keep using it until they are done, even if a newer
+    version has been swapped in meanwhile.
+    """
+
+    poll_interval: float
+    engine: InferenceEngine
+    on_load: Optional[Callable[[LoadedModel], None]]
+    _current: Optional[LoadedModel]
+    _lock: threading.Lock
+    _stop: threading.Event
+    _thread: Optional[threading.Thread]
+
+    def __init__(
+        self,
+        poll_interval: float = 10.0,
+        engine: InferenceEngine = InferenceEngine.NUMPY,
+        on_load: Optional[Callable[[LoadedModel], None]] = None,
+    ) -> None:
+        """Initialize ModelRegistry, without loading any model yet.
+
+        Args:
+            poll_interval:  Seconds between each check for a new model version.
+            engine:         Engine to load the ML models to predict with.
+            on_load:        Optional callback of each newly loaded model version,
+                            e.g. to record its load time.
+        """
+        self.poll_interval = poll_interval
+        self.engine = engine
+        self.on_load = on_load
+        self._current = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def get(self) -> LoadedModel:
+        """Get the loaded ML model, loading the latest version if none is loaded yet.
+
+        Returns:
+            The currently loaded ML model and encoder.
+        """
+        current = self._current
+        return current if current is not None else self.refresh()
+
+    def current(self) -> Optional[LoadedModel]:
+        """Get the loaded ML model, without loading any if none is loaded yet.
+
+        Returns:
+            The currently loaded ML model and encoder, or None.
+        """
+        return self._current
+
+    def refresh(self) -> LoadedModel:
+        """Load the latest ML model version, if it is not the one already loaded.
+
+        Returns:
+            The currently loaded ML model and encoder.
+        """
+        with self._lock:
+            version = store.latest(store.MODEL_PATH)
+            current = self._current
+            if current is None or current.version != version:
+                start = time.perf_counter()
+                model_, encoder = load(version, self.engine)
+                current = LoadedModel(
+                    model=model_,
+                    encoder=encoder,
+                    version=version,
+                    loaded_at=datetime.now(),
+                    load_seconds=time.perf_counter() - start,
+                )
+                self._current = current
+                if self.on_load is not None:
+                    self.on_load(current)
+            return current
+
+    def start(self) -> None:
+        """Start polling for new model versions in a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop polling for new model versions."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _poll(self) -> None:
+        """Check for new model versions every <poll_interval> until stopped."""
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except (OSError, EOFError, KeyError, ValueError, pickle.UnpicklingError):
+                # Keep serving the already loaded model if the new one is broken
+                logger.exception("Failed to load the latest model version")
+
+
+def load(
+    version: str, engine: InferenceEngine = InferenceEngine.NUMPY
+) -> Tuple[Union["Classifier", Predictor], Union["TitanicEncoder", TableEncoder]]:
+    """Load the ML model and encoder of <version> to predict with <engine>.
+
+    For the NumPy engine, the memory-mapped artifact of the version is loaded if it
+    was saved with one, and else the pickled model and encoder are converted. Models
+    of backends without a NumPy predictor are still predicted by sklearn.
+
+    Args:
+        version:    The version (date) of the ML model and encoder to load.
+        engine:     Engine to load the ML model and encoder to predict with.
+
+    Returns:
+        Tuple of the loaded ML model (or predictor) and encoder.
+    """
+    path = f"{store.MODEL_PATH}/{version}"
+    if engine == InferenceEngine.NUMPY and artifact.exists(path):
+        return artifact.load(path)
+
+    # pylint: disable=import-outside-toplevel
+    from . import backends, model
+
+    model_, encoder = model.load(version)
+    if engine == InferenceEngine.NUMPY:
+        predictor = backends.to_predictor(model_)
+        return (
+            model_ if predictor is None else predictor,
+            TableEncoder.from_encoder(encoder),
+        )
+    return model_, encoder
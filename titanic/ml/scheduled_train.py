@@ -1,27 +1,309 @@
 """Scheduled cloud function to regularly train & save new ML model versions."""
-import pandas as pd
-from . import model
-from ..preprocessing import parser
+import time
+import pstats
+import cProfile
+import argparse
+from typing import Any, Callable, Optional, Tuple
+import numpy as np
+from . import model, tuning
+from .backends import Backend, ONLINE_BACKENDS, SPARSE_BACKENDS, backend_of
+from ..api.consumer.api import APIConnector
+from ..data.enums import ColumnsRaw
+from ..data.titanic import TitanicColumns
+from ..preprocessing import cache, parser, shards, stream
+from ..preprocessing.encoder import TitanicEncoder
 
+TRAIN_PATH = "titanic/data/csv/train.csv"
 
-def main() -> None:
-    """Main function to train & save a new ML model and encoder."""
-    # Load data to train from (could be replaced with API consumer)
-    train_raw = pd.read_csv("titanic/data/csv/train.csv")
 
-    # Parse, preprocess and verify raw data is correct
-    x_train, y_train = parser.create_titanic(train_raw)
+def main(  # pylint: disable=too-many-arguments
+    chunksize: Optional[int] = None,
+    tune: bool = False,
+    backend: Backend = Backend.SVC,
+    incremental: bool = False,
+    from_api: bool = False,
+    sparse: bool = False,
+    budget: Optional[int] = None,
+    shard_source: Optional[str] = None,
+) -> None:
+    """Main function to train & save a new ML model and encoder.
 
-    # Train model and fit encoder to the data
-    model_, encoder = model.train(x_train, y_train)
+    Args:
+        chunksize:    Optional max number of raw rows to parse at a time, to bound the
+                      memory usage for large datasets. If not provided, the whole raw
+                      dataset is read and parsed at once.
+        tune:         Whether to search for the best hyperparameters before training,
+                      instead of using the defaults (only for the SVC backend).
+        backend:      Backend of the ML model to train, default SVC.
+        incremental:  Whether to only update the latest model version with the rows
+                      added since it was trained, instead of training from scratch.
+        from_api:     Whether to fetch the raw data from the upstream API (see
+                      APIConnector), instead of reading the raw CSV dataset.
+        sparse:       Whether to train on sparse one-hot encoded data, instead of
+                      densifying it (not for the hist_gradient_boosting backend).
+        budget:       Optional number of kernel basis vectors of the nystroem backend,
+                      bounding its prediction cost and size.
+        shard_source: Optional folder or glob pattern of raw CSV shards to parse in
+                      parallel (see shards.ingest), instead of the raw CSV dataset.
+    """
+    if incremental:
+        update(chunksize or stream.CHUNKSIZE)
+        return
+
+    # Load data to train from, and parse, preprocess and verify raw data is correct
+    # (columnar, for large datasets)
+    x_train, y_train, encoder, watermark = load(chunksize, from_api, shard_source)
+
+    # Train model and fit encoder to the data (if not fitted already)
+    if tune:
+        model_, encoder, results = model.tune(x_train, y_train, encoder)
+        print(tuning.report(results))
+    else:
+        model_, encoder = model.train(
+            x_train, y_train, encoder, backend=backend, sparse=sparse, budget=budget
+        )
 
     # Test model on training data
-    score = model.test(x_train, y_train, model_, encoder)
+    score = model.test(x_train, y_train, model_, encoder, sparse=sparse)
+    print("Accuracy:", score)
+
+    # Save model and encoder to file (should be cloud), with the last passenger id
+    # that it was trained on, to update it incrementally from
+    if watermark is None:
+        watermark = stream.last_passenger_id(TRAIN_PATH, chunksize or stream.CHUNKSIZE)
+    model.save(model_, encoder, model.VersionInfo(watermark=watermark))
+
+
+def load(
+    chunksize: Optional[int] = None,
+    from_api: bool = False,
+    shard_source: Optional[str] = None,
+) -> Tuple[TitanicColumns, np.ndarray, Optional[TitanicEncoder], Optional[int]]:
+    """Load and parse the raw data to train on, from the source to train from.
+
+    Args:
+        chunksize:    Optional max number of raw rows to parse at a time, see main().
+        from_api:     Whether to fetch the raw data from the upstream API.
+        shard_source: Optional folder or glob pattern of raw CSV shards to parse.
+
+    Returns:
+        Tuple of the parsed columnar Titanic dataset, y labels, the encoder if it was
+        already fitted while parsing, and the last passenger id if already known.
+    """
+    encoder: Optional[TitanicEncoder] = None
+    watermark: Optional[int] = None
+    if from_api:
+        with APIConnector() as api:
+            train_raw = api.fetch_titanic()
+        # pylint infers fillna() as maybe None (if inplace), not a DataFrame
+        # pylint: disable=unsubscriptable-object
+        x_train, y_train = parser.create_titanic_columns(train_raw)
+        watermark = int(train_raw[ColumnsRaw.PASSENGER_ID.value].max())
+    elif shard_source is not None:
+        start = time.perf_counter()
+        x_train, y_train, shard_results = shards.ingest(shard_source)
+        print(shards.report(shard_results, time.perf_counter() - start))
+        watermark = max(result.watermark for result in shard_results)
+    elif chunksize is None:
+        # Reuse the parsed dataset of a previous run, if the data and parsing are the
+        # same
+        x_train, y_train = cache.load(TRAIN_PATH)
+    else:
+        # Stream the raw data chunk by chunk, fitting the encoder on each chunk
+        x_train, y_train, encoder = stream.fit_stream(TRAIN_PATH, chunksize)
+
+    return x_train, y_train, encoder, watermark
+
+
+def update(chunksize: int = stream.CHUNKSIZE) -> None:
+    """Update the latest ML model version with new data, and save it as a new version.
+
+    Only the raw rows that were added since the latest version was trained are
+    parsed and trained on, so each update takes time proportional to the new data.
+    Their NaN/None numerical values are filled with the averages of the data that the
+    latest version was trained on, as the new rows may be few or all NaN/None.
+
+    Args:
+        chunksize:  Max number of raw rows to read at a time.
+
+    Raises:
+        ValueError: If the latest version can't be updated incrementally.
+    """
+    # Load the latest version, and the last passenger id that it was trained on
+    parent = model.latest_version()
+    info = model.load_info(parent)
+    if info.watermark is None:
+        raise ValueError(f"Model version {parent} has no watermark to update from")
+    model_, encoder = model.load(parent)
+    backend = backend_of(model_)
+    if backend not in ONLINE_BACKENDS:
+        raise ValueError(
+            f"Model version {parent} of the {backend.value} backend can't be updated "
+            f"incrementally, train a version of the {Backend.SGD.value} backend first "
+            f"(--backend {Backend.SGD.value})"
+        )
+
+    # Load only the rows added since then
+    new_raw, watermark = stream.read_new(TRAIN_PATH, info.watermark, chunksize)
+    if len(new_raw) == 0:
+        print("No new data since model version", parent)
+        return
+    x_new, y_new = parser.create_titanic_columns(new_raw, encoder.numerical_means())
+
+    # Update model and encoder with the new data
+    model_, encoder = model.update(x_new, y_new, model_, encoder)
+
+    # Test model on the new data
+    score = model.test(x_new, y_new, model_, encoder)
     print("Accuracy:", score)
 
-    # Save model and encoder to file (should be cloud)
-    model.save(model_, encoder)
+    # Save model and encoder as a new version, linked to its parent
+    model.save(model_, encoder, model.VersionInfo(parent=parent, watermark=watermark))
+
+
+def profile(path: str, func: Callable[..., Any], *arguments: Any, top: int = 25) -> Any:
+    """Call <func> with <arguments> under cProfile, and save and print its profile.
+
+    Args:
+        path:       Path to save the profile stats to, e.g. to view with snakeviz.
+        func:       Function to profile.
+        arguments:  Arguments to call <func> with.
+        top:        Number of functions with the longest cumulative time to print.
+
+    Returns:
+        What <func> returned.
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *arguments)
+    finally:
+        profiler.dump_stats(path)
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(top)
+        print("Profile saved to", path)
+
+
+def _parse_args() -> argparse.Namespace:
+    """Parse the command line arguments, and reject unsupported combinations.
+
+    Returns:
+        The parsed arguments, with the backend as a Backend.
+    """
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--chunksize",
+        type=int,
+        help="Max number of raw rows to parse at a time (default: all at once).",
+    )
+    arg_parser.add_argument(
+        "--measure-memory",
+        action="store_true",
+        help="Measure and print the peak memory usage (slows down training).",
+    )
+    arg_parser.add_argument(
+        "--tune",
+        action="store_true",
+        help="Search for the best hyperparameters before training.",
+    )
+    arg_parser.add_argument(
+        "--backend",
+        choices=[backend.value for backend in Backend],
+        help="Backend of the ML model to train (default: svc).",
+    )
+    arg_parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only update the latest model version with new rows (sgd backend).",
+    )
+    arg_parser.add_argument(
+        "--from-api",
+        action="store_true",
+        help="Fetch the raw data from the upstream API at API_BASE_URL.",
+    )
+    arg_parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help="Train on sparse one-hot encoded data (not hist_gradient_boosting).",
+    )
+    arg_parser.add_argument(
+        "--budget",
+        type=int,
+        help="Number of kernel basis vectors of the nystroem backend.",
+    )
+    arg_parser.add_argument(
+        "--shards",
+        help="Folder or glob pattern of raw CSV shards to parse in parallel.",
+    )
+    arg_parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="Profile training with cProfile, and save the profile stats to PATH.",
+    )
+    args = arg_parser.parse_args()
+    backend = Backend(args.backend or Backend.SVC.value)
+
+    # Unsupported combinations of arguments, with their error message
+    unsupported = [
+        (
+            args.incremental
+            and (
+                args.backend not in (None, Backend.SGD.value)
+                or args.sparse
+                or args.budget is not None
+                or args.tune
+            ),
+            "--incremental updates the latest sgd version, it can't be combined "
+            "with --backend/--sparse/--budget/--tune",
+        ),
+        (
+            args.tune and backend != Backend.SVC,
+            "--tune is only supported for the svc backend",
+        ),
+        (
+            args.from_api and (args.chunksize or args.incremental),
+            "--from-api can't be combined with --chunksize/--incremental",
+        ),
+        (
+            args.shards and (args.chunksize or args.incremental or args.from_api),
+            "--shards can't be combined with --chunksize/--incremental/--from-api",
+        ),
+        (
+            args.sparse and backend not in SPARSE_BACKENDS,
+            f"--sparse is not supported for the {backend.value} backend",
+        ),
+        (args.sparse and args.tune, "--sparse can't be combined with --tune"),
+        (
+            args.budget is not None and backend != Backend.NYSTROEM,
+            "--budget is only supported for the nystroem backend",
+        ),
+        (
+            args.measure_memory and args.profile,
+            "--measure-memory can't be combined with --profile",
+        ),
+    ]
+    for rejected, message in unsupported:
+        if rejected:
+            arg_parser.error(message)
+
+    args.backend = backend
+    return args
 
 
 if __name__ == "__main__":
-    main()
+    options = _parse_args()
+    main_args = (
+        options.chunksize,
+        options.tune,
+        options.backend,
+        options.incremental,
+        options.from_api,
+        options.sparse,
+        options.budget,
+        options.shards,
+    )
+    if options.measure_memory:
+        _, peak = stream.peak_memory(main, *main_args)
+        print(f"Peak memory: {peak / 2**20:.1f} MiB")
+    elif options.profile:
+        profile(options.profile, main, *main_args)
+    else:
+        main(*main_args)
@@ -0,0 +1,199 @@
+"""Versioned model store, with an atomically updated pointer to the latest version.
+
+Each model version is a folder in the store, named by its version (date). Next to
+the version folders, the store keeps:
+- LATEST: The latest version, to resolve it without listing the store.
+- index.json: All versions, oldest first, to list them without listing the store.
+
+Versions are written to a hidden staging folder first, and renamed to their version
+folder once complete, so that partially written versions are never visible. The
+pointer and index files are replaced atomically, and updates of them are serialized
+between processes with a file lock on the store folder.
+"""
+import os
+import json
+import fcntl
+import shutil
+import tempfile
+import contextlib
+from typing import Iterator, List, Optional
+
+# Folder of the store of the Titanic ML models
+MODEL_PATH = "titanic/ml/models"
+LATEST = "LATEST"
+INDEX = "index.json"
+STAGING_PREFIX = ".staging-"
+
+
+def stage(path: str) -> str:
+    """Create a hidden staging folder in the store at <path>, to write a version to.
+
+    Args:
+        path:   Folder of the store.
+
+    Returns:
+        Path of the staging folder, to publish() once the version is written.
+    """
+    return tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=path)
+
+
+def publish(
+    path: str, staging: str, version: str, retain: Optional[int] = None
+) -> None:
+    """Publish the version written to <staging> as <version>, and make it the latest.
+
+    Args:
+        path:       Folder of the store.
+        staging:    Staging folder that the version was written to, see stage().
+        version:    The version (date) to publish the version as.
+        retain:     Optional number of latest versions to keep, pruning older ones.
+                    If not provided, all versions are kept.
+
+    Raises:
+        FileExistsError: If <version> already exists.
+    """
+    with _lock(path):
+        if os.path.exists(os.path.join(path, version)):
+            shutil.rmtree(staging)
+            raise FileExistsError(f"Model version {version} already exists")
+        os.rename(staging, os.path.join(path, version))
+
+        indexed = [v for v in _read_index(path) if v != version] + [version]
+        keep = len(indexed) if retain is None else max(retain, 1)
+        pruned, indexed = indexed[:-keep], indexed[-keep:]
+        _write(path, INDEX, json.dumps({"versions": indexed}, indent=2))
+        _write(path, LATEST, version)
+
+        # Delete pruned versions only once they are no longer indexed
+        for old in pruned:
+            shutil.rmtree(os.path.join(path, old), ignore_errors=True)
+
+
+def latest(path: str) -> str:
+    """Get the latest version of the store at <path>, from its pointer file.
+
+    Stores without a pointer file (saved before it existed) are scanned instead.
+
+    Args:
+        path:   Folder of the store.
+
+    Returns:
+        The latest version (date).
+
+    Raises:
+        FileNotFoundError: If the store has no versions.
+    """
+    try:
+        with open(os.path.join(path, LATEST), encoding="utf-8") as file:
+            return file.read().strip()
+    except FileNotFoundError:
+        scanned = _scan(path)
+        if not scanned:
+            raise
+        return scanned[-1]
+
+
+def list_versions(path: str) -> List[str]:
+    """List all versions of the store at <path>, from its index file.
+
+    Args:
+        path:   Folder of the store.
+
+    Returns:
+        All versions (dates), oldest first.
+    """
+    return _read_index(path)
+
+
+def remove(path: str, version: str) -> None:
+    """Remove <version> from the store at <path>, and repoint the latest version.
+
+    Args:
+        path:       Folder of the store.
+        version:    The version (date) to remove.
+    """
+    with _lock(path):
+        indexed = [v for v in _read_index(path) if v != version]
+        _write(path, INDEX, json.dumps({"versions": indexed}, indent=2))
+        if indexed:
+            _write(path, LATEST, indexed[-1])
+        else:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(path, LATEST))
+        shutil.rmtree(os.path.join(path, version))
+
+
+def _read_index(path: str) -> List[str]:
+    """Read the versions of the index file of the store at <path>.
+
+    Stores without an index file (saved before it existed) are scanned instead.
+
+    Args:
+        path:   Folder of the store.
+
+    Returns:
+        All versions (dates), oldest first.
+    """
+    try:
+        with open(os.path.join(path, INDEX), encoding="utf-8") as file:
+            indexed: List[str] = json.load(file)["versions"]
+            return indexed
+    except FileNotFoundError:
+        return _scan(path)
+
+
+def _scan(path: str) -> List[str]:
+    """List the version folders of the store at <path>, by parsing their names.
+
+    Args:
+        path:   Folder of the store.
+
+    Returns:
+        All versions (dates), oldest first.
+    """
+    # Only stores without index files are scanned, so don't import dateutil for all
+    # pylint: disable=import-outside-toplevel
+    import dateutil.parser
+
+    folders = [
+        name
+        for name in os.listdir(path)
+        if not name.startswith(".") and os.path.isdir(os.path.join(path, name))
+    ]
+    return sorted(folders, key=dateutil.parser.parse)
+
+
+def _write(path: str, name: str, content: str) -> None:
+    """Atomically replace the file <name> in the store at <path> with <content>.
+
+    Args:
+        path:       Folder of the store.
+        name:       Name of the file to replace.
+        content:    New content of the file.
+    """
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{name}-", dir=path)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(content)
+        os.replace(tmp_path, os.path.join(path, name))
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+@contextlib.contextmanager
+def _lock(path: str) -> Iterator[None]:
+    """Hold an exclusive lock of the store at <path>, between processes.
+
+    Args:
+        path:   Folder of the store, which is locked itself.
+
+    Yields:
+        Nothing, while the lock is held.
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
@@ -0,0 +1,146 @@
+"""Parallel hyperparameter search of SVC models, using cross-validation."""
+import os
+import time
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from sklearn.model_selection import ParameterGrid, ParameterSampler, StratifiedKFold
+from sklearn.svm import SVC
+
+# Hyperparameters to search over, if no other are given
+PARAM_GRID: Dict[str, Sequence[Any]] = {
+    "C": [0.1, 1.0, 10.0, 100.0],
+    "gamma": ["scale", 0.01, 0.1, 1.0],
+    "kernel": ["rbf", "poly", "sigmoid"],
+}
+
+# Encoded training data of each worker process, memory-mapped from a shared file
+_data: Dict[str, np.ndarray] = {}
+
+
+@dataclass
+class CandidateResult:
+    """Cross-validation result of one hyperparameter candidate."""
+
+    params: Dict[str, Any]
+    score: float
+    # Total time of fitting every fold, which are fitted in parallel, so not wall time
+    fit_time: float
+
+
+def search(  # pylint: disable=too-many-arguments
+    x_train_enc: np.ndarray,
+    y_train: np.ndarray,
+    param_grid: Optional[Dict[str, Sequence[Any]]] = None,
+    n_iter: Optional[int] = None,
+    folds: int = 5,
+    processes: Optional[int] = None,
+) -> List[CandidateResult]:
+    """Search for the SVC hyperparameters with the best cross-validation accuracy.
+
+    Every fold of every candidate is fitted in parallel over a pool of processes.
+    The encoded training data is saved once to a temporary file that every process
+    memory-maps, instead of sending a copy of it with each fit.
+
+    Args:
+        x_train_enc:    Encoded Titanic dataset to search on.
+        y_train:        Titanic survival labels to search on.
+        param_grid:     Hyperparameters to search over, default PARAM_GRID.
+        n_iter:         Optional number of random candidates to search. If not
+                        provided, every candidate of the grid is searched.
+        folds:          Number of cross-validation folds.
+        processes:      Number of processes, default all cores.
+
+    Returns:
+        Result of each candidate, sorted with the best accuracy first.
+    """
+    param_grid = PARAM_GRID if param_grid is None else param_grid
+    candidates: List[Dict[str, Any]] = list(
+        ParameterGrid(param_grid)
+        if n_iter is None
+        else ParameterSampler(param_grid, n_iter, random_state=0)
+    )
+    splits = list(
+        StratifiedKFold(folds, shuffle=True, random_state=0).split(x_train_enc, y_train)
+    )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Save the encoded training data once, for all processes to share
+        paths = {
+            "x": os.path.join(tmp_dir, "x.npy"),
+            "y": os.path.join(tmp_dir, "y.npy"),
+        }
+        np.save(paths["x"], x_train_enc)
+        np.save(paths["y"], np.asarray(y_train))
+
+        with ProcessPoolExecutor(
+            processes, initializer=_init_worker, initargs=(paths,)
+        ) as pool:
+            futures = [
+                [pool.submit(_fit_fold, params, fold) for fold in splits]
+                for params in candidates
+            ]
+            results = [
+                CandidateResult(
+                    params=params,
+                    score=float(np.mean([f.result()[0] for f in fold_futures])),
+                    fit_time=sum(f.result()[1] for f in fold_futures),
+                )
+                for params, fold_futures in zip(candidates, futures)
+            ]
+
+    return sorted(results, key=lambda result: result.score, reverse=True)
+
+
+def report(results: List[CandidateResult]) -> str:
+    """Format search <results> as a table, one row per candidate.
+
+    Args:
+        results:    Result of each candidate.
+
+    Returns:
+        The table of the candidates' accuracy, total fit time and hyperparameters.
+    """
+    lines = [f"{'Accuracy':>8}  {'Fit (s)':>8}  Hyperparameters"]
+    lines += [
+        f"{result.score:>8.3f}  {result.fit_time:>8.2f}  {result.params}"
+        for result in results
+    ]
+    return "\n".join(lines)
+
+
+def _init_worker(paths: Dict[str, str]) -> None:
+    """Memory-map the shared encoded training data in a worker process.
+
+    Args:
+        paths:  Paths of the saved encoded training data and labels.
+    """
+    _data.update({name: np.load(path, mmap_mode="r") for name, path in paths.items()})
+
+
+def _fit_fold(
+    params: Dict[str, Any], fold: Tuple[np.ndarray, np.ndarray]
+) -> Tuple[float, float]:
+    """Fit an SVC with <params> on one cross-validation <fold>, and score it.
+
+    Probabilities aren't fitted, as they don't affect the accuracy and would need
+    an internal cross-validation of their own.
+
+    Args:
+        params: Hyperparameters of the SVC.
+        fold:   Indices of the training and validation rows of the fold.
+
+    Returns:
+        Tuple of the validation accuracy and the time of fitting in seconds.
+    """
+    train_idx, test_idx = fold
+    x_data, y_data = _data["x"], _data["y"]
+
+    start = time.perf_counter()
+    model = SVC(**params).fit(x_data[train_idx], y_data[train_idx])
+    fit_time = time.perf_counter() - start
+
+    score = float(model.score(x_data[test_idx], y_data[test_idx]))
+    return score, fit_time
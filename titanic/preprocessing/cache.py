@@ -0,0 +1,270 @@
+"""On-disk cache of parsed raw Titanic datasets, as one .npy file per column.
+
+Parsing a raw dataset (renaming, feature engineering and cleaning it) is the same
+every time for the same raw file and preprocessing code, so the parsed columnar
+dataset is cached, keyed by:
+- The SHA-256 of the content of the raw file, so any change of the data misses.
+- The SHA-256 of the source code of the preprocessing modules, so any change of
+  how the data is parsed misses too, without having to remember to bump a version.
+
+Each entry is a folder named by its key, written to a hidden staging folder first
+and renamed once complete. Entries are loaded memory-mapped, and the least recently
+used entries are evicted when the cache grows larger than its max size.
+"""
+import os
+import json
+import shutil
+import hashlib
+import argparse
+import tempfile
+import contextlib
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from . import feature_engineering, parser
+from ..data import enums, titanic
+from ..data.titanic import TitanicColumns, CATEGORICAL_ENUMS, NUMERICAL_TYPES
+
+CACHE_PATH = "titanic/data/cache"
+MANIFEST = "manifest.json"
+STAGING_PREFIX = ".staging-"
+
+# Max total size of the cache, before evicting the least recently used entries
+MAX_BYTES = 1024 * 1024 * 1024
+
+# Layout of the cache entries, bumped if it changes
+FORMAT_VERSION = 1
+
+# Modules whose source code defines how raw datasets are parsed
+PREPROCESSING_MODULES = (parser, feature_engineering, enums, titanic)
+
+# Bytes to hash at a time
+HASH_CHUNKSIZE = 1024 * 1024
+
+
+def load(
+    path: str, cache_path: str = CACHE_PATH, max_bytes: int = MAX_BYTES
+) -> Tuple[TitanicColumns, np.ndarray]:
+    """Load the parsed raw Titanic CSV dataset at <path>, parsing it if not cached.
+
+    Gives the same dataset as parser.create_titanic_columns(pd.read_csv(path)).
+
+    Args:
+        path:       Path to the raw Titanic CSV dataset.
+        cache_path: Folder of the cache.
+        max_bytes:  Max total size of the cache, evicting the least recently used
+                    entries when a new entry makes it larger.
+
+    Returns:
+        Tuple of the parsed columnar Titanic dataset and y labels.
+    """
+    entry = os.path.join(cache_path, key(path))
+    if os.path.isfile(os.path.join(entry, MANIFEST)):
+        # Mark the entry as recently used
+        os.utime(entry)
+        return _read(entry)
+
+    # pylint infers read_csv() as a chunk reader, not a DataFrame
+    # pylint: disable=no-member
+    data, labels = parser.create_titanic_columns(pd.read_csv(path))
+    os.makedirs(cache_path, exist_ok=True)
+    _write(entry, data, labels, os.path.abspath(path))
+    evict(cache_path, max_bytes, keep=os.path.basename(entry))
+    return data, labels
+
+
+def key(path: str) -> str:
+    """Get the cache key of the raw dataset at <path>, with the preprocessing code.
+
+    Args:
+        path:   Path to the raw Titanic dataset.
+
+    Returns:
+        The hex SHA-256 of the content of the file and the preprocessing code.
+    """
+    digest = hashlib.sha256(f"format {FORMAT_VERSION}\n".encode("utf-8"))
+    digest.update(code_version().encode("utf-8"))
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(HASH_CHUNKSIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_version() -> str:
+    """Get the version of the preprocessing code, as a hash of its source code.
+
+    Returns:
+        The hex SHA-256 of the source files of the preprocessing modules.
+    """
+    digest = hashlib.sha256()
+    for module in PREPROCESSING_MODULES:
+        with open(str(module.__file__), "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def invalidate(path: Optional[str] = None, cache_path: str = CACHE_PATH) -> int:
+    """Remove the cached entries of the raw dataset at <path>, or all entries.
+
+    Args:
+        path:       Optional path to the raw dataset to remove the entries of, of
+                    any content and preprocessing code. If not provided, the whole
+                    cache is cleared.
+        cache_path: Folder of the cache.
+
+    Returns:
+        Number of removed entries.
+    """
+    source = None if path is None else os.path.abspath(path)
+    removed = 0
+    for entry in _entries(cache_path):
+        if source is None or _manifest(entry).get("source") == source:
+            shutil.rmtree(entry, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def evict(cache_path: str, max_bytes: int, keep: Optional[str] = None) -> List[str]:
+    """Evict the least recently used entries, until the cache is at most <max_bytes>.
+
+    Args:
+        cache_path: Folder of the cache.
+        max_bytes:  Max total size of the cache.
+        keep:       Optional key of an entry to never evict, e.g. the one just
+                    written, even if it alone is larger than <max_bytes>.
+
+    Returns:
+        Keys of the evicted entries.
+    """
+    entries = sorted(_entries(cache_path), key=os.path.getmtime)
+    sizes = {entry: _size(entry) for entry in entries}
+    total = sum(sizes.values())
+
+    evicted = []
+    for entry in entries:
+        if total <= max_bytes:
+            break
+        if os.path.basename(entry) == keep:
+            continue
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= sizes[entry]
+        evicted.append(os.path.basename(entry))
+    return evicted
+
+
+def _write(entry: str, data: TitanicColumns, labels: np.ndarray, source: str) -> None:
+    """Write a parsed dataset to the cache <entry> folder, atomically.
+
+    Args:
+        entry:  Folder of the entry to write.
+        data:   The parsed columnar Titanic dataset.
+        labels: The y labels of the dataset.
+        source: Absolute path to the raw dataset, to invalidate its entries by.
+    """
+    staging = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=os.path.dirname(entry))
+    try:
+        columns = {**data.categorical, **data.numerical, "labels": labels}
+        for name, values in columns.items():
+            np.save(os.path.join(staging, f"{name}.npy"), values, allow_pickle=False)
+        manifest = {
+            "format": FORMAT_VERSION,
+            "source": source,
+            "rows": len(labels),
+        }
+        with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+        os.rename(staging, entry)
+    except OSError:
+        # E.g. another process cached the same dataset meanwhile
+        shutil.rmtree(staging, ignore_errors=True)
+        if not os.path.isdir(entry):
+            raise
+
+
+def _read(entry: str) -> Tuple[TitanicColumns, np.ndarray]:
+    """Read a parsed dataset from the cache <entry> folder, memory-mapped.
+
+    Args:
+        entry:  Folder of the entry to read.
+
+    Returns:
+        Tuple of the parsed columnar Titanic dataset and y labels.
+    """
+    arrays = {
+        name: np.load(os.path.join(entry, f"{name}.npy"), mmap_mode="r")
+        for name in [*CATEGORICAL_ENUMS, *NUMERICAL_TYPES, "labels"]
+    }
+    data = TitanicColumns(
+        categorical={col: arrays[col] for col in CATEGORICAL_ENUMS},
+        numerical={col: arrays[col] for col in NUMERICAL_TYPES},
+    )
+    return data, arrays["labels"]
+
+
+def _entries(cache_path: str) -> List[str]:
+    """List the complete entries of the cache.
+
+    Args:
+        cache_path: Folder of the cache.
+
+    Returns:
+        Folders of the entries.
+    """
+    if not os.path.isdir(cache_path):
+        return []
+    return [
+        os.path.join(cache_path, name)
+        for name in os.listdir(cache_path)
+        if not name.startswith(".")
+        and os.path.isfile(os.path.join(cache_path, name, MANIFEST))
+    ]
+
+
+def _manifest(entry: str) -> Dict[str, Any]:
+    """Read the manifest of a cache <entry>.
+
+    Args:
+        entry:  Folder of the entry.
+
+    Returns:
+        The manifest, or an empty dict if it can't be read.
+    """
+    with contextlib.suppress(OSError, ValueError):
+        with open(os.path.join(entry, MANIFEST), encoding="utf-8") as file:
+            manifest: Dict[str, Any] = json.load(file)
+            return manifest
+    return {}
+
+
+def _size(entry: str) -> int:
+    """Get the total size of the files of a cache <entry>.
+
+    Args:
+        entry:  Folder of the entry.
+
+    Returns:
+        Size in bytes.
+    """
+    with os.scandir(entry) as files:
+        return sum(file.stat().st_size for file in files if file.is_file())
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument(
+        "--invalidate",
+        metavar="PATH",
+        help="Remove the cached entries of the raw dataset at PATH.",
+    )
+    arg_parser.add_argument(
+        "--clear", action="store_true", help="Remove all cached entries."
+    )
+    arg_parser.add_argument(
+        "--cache-path", default=CACHE_PATH, help="Folder of the cache."
+    )
+    args = arg_parser.parse_args()
+    if not args.clear and args.invalidate is None:
+        arg_parser.error("Either --invalidate or --clear is required")
+
+    count = invalidate(None if args.clear else args.invalidate, args.cache_path)
+    print(f"Removed {count} cached entries")
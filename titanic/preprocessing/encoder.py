@@ -1,44 +1,109 @@
 """Titanic dataset encoder."""
-from typing import List
+from typing import Dict, List, Union
 import numpy as np
-from sklearn.preprocessing import OneHotEncoder, MinMaxScaler
-from ..data.titanic import Titanic
+from scipy import sparse
+from sklearn.preprocessing import OneHotEncoder
+from ..data.titanic import (
+    TitanicColumns,
+    TitanicData,
+    CATEGORICAL_ENUMS,
+    NUMERICAL_TYPES,
+)
+
+# Enum values of each categorical variable, indexed by the columnar enum codes
+CATEGORICAL_VALUES = {
+    col: np.array([e.value for e in enum], dtype=object)
+    for col, enum in CATEGORICAL_ENUMS.items()
+}
 
 
 class TitanicEncoder:
     """Titanic dataset encoder."""
 
     enc: OneHotEncoder
+    numerical_min: np.ndarray
+    numerical_max: np.ndarray
+    numerical_scale: np.ndarray
+    # Sum of each numerical variable, and number of rows, of all data fitted on
+    numerical_sum: np.ndarray
+    numerical_count: int
 
     def __init__(self) -> None:
         """Initialize TitanicEncoder."""
         self.enc = OneHotEncoder(handle_unknown="ignore")
 
-    def fit(self, data: List[Titanic]) -> None:
-        """Fit the OneHotEncoder based on <data>.
+    def fit(self, data: TitanicData) -> None:
+        """Fit the OneHotEncoder and the numerical normalization based on <data>.
 
         Args:
             data:   Titanic dataset to fit the encoder on.
         """
-        # Extract only categorical variables from <data>, as numerical variables
-        # shouldn't be one hot encoded.
-        categorical = [
-            [
-                v.value
-                for k, v in row.categorical.__dict__.items()
-                if k != "__initialised__"
-            ]
-            for row in data
+        # Discard anything fitted before, and fit on only <data>
+        self.enc = OneHotEncoder(handle_unknown="ignore")
+        self.partial_fit(data)
+
+    def partial_fit(self, data: TitanicData) -> None:
+        """Update the fitted OneHotEncoder and numerical normalization with <data>.
+
+        Fitting chunk by chunk with partial_fit() gives the same encoder as fit() on
+        all chunks at once, without having to keep all chunks in memory.
+
+        Args:
+            data:   Titanic dataset (chunk) to fit the encoder on.
+        """
+        if len(data) == 0:
+            return
+        fitted = hasattr(self.enc, "categories_")
+
+        # Fit the OneHotEncoder using only categorical variables, as numerical
+        # variables shouldn't be one hot encoded. Categories fitted before are kept.
+        categories = [
+            np.unique(column)
+            for column in np.asarray(_categorical(data), dtype=object).T
         ]
+        if fitted:
+            categories = [
+                np.union1d(fitted, new)
+                for fitted, new in zip(self.enc.categories_, categories)
+            ]
+        self.enc.fit(_pad(categories))
+
+        # Fit the min-max normalization of numerical variables once, so that the same
+        # scaling is used when encoding for training and for prediction.
+        numerical = _numerical(data)
+        numerical_min, numerical_max = numerical.min(axis=0), numerical.max(axis=0)
+        if fitted:
+            numerical_min = np.minimum(self.numerical_min, numerical_min)
+            numerical_max = np.maximum(self.numerical_max, numerical_max)
+        self.numerical_min, self.numerical_max = numerical_min, numerical_max
+        numerical_range = numerical_max - numerical_min
+        # Columns without any range are only shifted, not scaled (like MinMaxScaler)
+        numerical_range[numerical_range == 0.0] = 1.0
+        self.numerical_scale = 1.0 / numerical_range
+
+        # Keep the sums to average the numerical variables of all data fitted on, to
+        # fill NaN/None values of new data with, as cleaned data keeps the averages
+        numerical_sum, numerical_count = numerical.sum(axis=0), len(numerical)
+        if fitted:
+            numerical_sum += self.numerical_sum
+            numerical_count += self.numerical_count
+        self.numerical_sum, self.numerical_count = numerical_sum, numerical_count
+
+    def numerical_means(self) -> Dict[str, float]:
+        """Get the average of each numerical variable of all data fitted on.
 
-        # Fit the OneHotEncoder using <categorical> data
-        self.enc.fit(categorical)
+        Returns:
+            Dict of the average of each numerical variable, e.g. to fill the NaN/None
+            values of new data with, see parser.clean().
+        """
+        means: np.ndarray = self.numerical_sum / self.numerical_count
+        return dict(zip(NUMERICAL_TYPES, means.tolist()))
 
-    def encode(self, data: List[Titanic]) -> np.ndarray:
+    def encode(self, data: TitanicData) -> np.ndarray:
         """Encode <data> using the OneHotEncoder, assuming that it is already fitted.
 
         This function one hot encodes categorical variables, and normalizes numerical
-        variables.
+        variables with the min-max scaling fitted in fit().
 
         Args:
             data:   Titanic dataset to encode.
@@ -47,31 +112,136 @@ class TitanicEncoder:
             Numpy array of the encoded Titanic data, to be used for prediction or
             training an ML model.
         """
-        # Extract only categorical variables from <data>, as numerical variables
-        # shouldn't be one hot encoded.
-        categorical = [
-            [
-                v.value
-                for k, v in row.categorical.__dict__.items()
-                if k != "__initialised__"
-            ]
-            for row in data
-        ]
-
         # One hot encode/transform categorical variables
-        categorical_enc = self.enc.transform(categorical).toarray()
-
-        # Extract only numerical variables from <data>, as these should be normalized
-        numerical = [
-            [v for k, v in row.numerical.__dict__.items() if k != "__initialised__"]
-            for row in data
-        ]
+        categorical_enc = self.enc.transform(_categorical(data)).toarray()
 
-        # Normalize numerical variables
-        normalizer = MinMaxScaler()
-        numerical_enc = normalizer.fit_transform(numerical)
+        # Normalize numerical variables in-place, using the fitted scaling
+        numerical_enc = _numerical(data)
+        numerical_enc -= self.numerical_min
+        numerical_enc *= self.numerical_scale
 
         # Stack encoded categorical and numerical dimensions next to each other
         data_enc = np.hstack((categorical_enc, numerical_enc))
 
         return data_enc
+
+    def encode_sparse(self, data: TitanicData) -> sparse.csr_matrix:
+        """Encode <data> like encode(), but as a sparse CSR matrix without densifying.
+
+        Each row only stores the ones of its one hot encoded categorical variables
+        and its normalized numerical variables, instead of mostly zeros. Columnar
+        data is encoded straight from its enum codes.
+
+        Args:
+            data:   Titanic dataset to encode.
+
+        Returns:
+            Sparse CSR matrix of the encoded Titanic data, with the same columns as
+            encode(), to train or predict with ML models that accept sparse input.
+        """
+        # Normalize numerical variables in-place, using the fitted scaling
+        numerical_enc = _numerical(data)
+        numerical_enc -= self.numerical_min
+        numerical_enc *= self.numerical_scale
+
+        if not isinstance(data, TitanicColumns):
+            # One hot encode/transform categorical variables, which is sparse already
+            categorical_enc = self.enc.transform(_categorical(data))
+            return sparse.hstack((categorical_enc, numerical_enc), format="csr")
+
+        # Column of each one hot encoded variable, and of each numerical variable
+        offsets = np.cumsum([0] + [len(c) for c in self.enc.categories_])
+        n_categorical, n_numerical = len(data.categorical), numerical_enc.shape[1]
+        indices = np.empty((len(data), n_categorical + n_numerical), dtype=np.int32)
+        for i, (col, codes) in enumerate(data.categorical.items()):
+            indices[:, i] = self._columns(col, i, offsets[i])[codes]
+        indices[:, n_categorical:] = offsets[-1] + np.arange(n_numerical)
+        values = np.ones(indices.shape)
+        values[:, n_categorical:] = numerical_enc
+
+        # Drop categories that weren't fitted, which are encoded as all zeros (if
+        # all were fitted, every row has the same number of values, without copying)
+        known: np.ndarray = indices >= 0
+        indptr = np.zeros(len(data) + 1, dtype=np.int64)
+        if known.all():
+            np.cumsum(np.full(len(data), indices.shape[1]), out=indptr[1:])
+            values, indices = values.ravel(), indices.ravel()
+        else:
+            np.cumsum(known.sum(axis=1), out=indptr[1:])
+            values, indices = values[known], indices[known]
+
+        return sparse.csr_matrix(
+            (values, indices, indptr), shape=(len(data), offsets[-1] + n_numerical)
+        )
+
+    def _columns(self, col: str, index: int, offset: int) -> np.ndarray:
+        """Get the one hot encoded column of each enum code of the categorical <col>.
+
+        Args:
+            col:    Name of the categorical variable.
+            index:  Index of the categorical variable in the OneHotEncoder.
+            offset: Column of the first category of the categorical variable.
+
+        Returns:
+            Column of each enum code, -1 for enum values that weren't fitted.
+        """
+        fitted: Dict[str, int] = {
+            value: offset + i for i, value in enumerate(self.enc.categories_[index])
+        }
+        return np.array([fitted.get(v, -1) for v in CATEGORICAL_VALUES[col]])
+
+
+def _categorical(data: TitanicData) -> Union[List[List[str]], np.ndarray]:
+    """Extract only the categorical variables of <data>, as their enum values.
+
+    Args:
+        data:   Titanic dataset to extract categorical variables from.
+
+    Returns:
+        The categorical variable values, one row per row.
+    """
+    if isinstance(data, TitanicColumns):
+        return np.column_stack(
+            [CATEGORICAL_VALUES[col][codes] for col, codes in data.categorical.items()]
+        )
+
+    return [
+        [v.value for k, v in row.categorical.__dict__.items() if k != "__initialised__"]
+        for row in data
+    ]
+
+
+def _numerical(data: TitanicData) -> np.ndarray:
+    """Extract only the numerical variables of <data>.
+
+    Args:
+        data:   Titanic dataset to extract numerical variables from.
+
+    Returns:
+        Float numpy array of the numerical variables, one row per row.
+    """
+    if isinstance(data, TitanicColumns):
+        return np.column_stack(list(data.numerical.values())).astype(float)
+
+    return np.array(
+        [
+            [v for k, v in row.numerical.__dict__.items() if k != "__initialised__"]
+            for row in data
+        ],
+        dtype=float,
+    )
+
+
+def _pad(categories: List[np.ndarray]) -> np.ndarray:
+    """Stack <categories> of each column into a matrix, to fit a OneHotEncoder with.
+
+    Shorter columns are padded by repeating their categories.
+
+    Args:
+        categories: Unique categories of each column.
+
+    Returns:
+        Matrix with one column per categorical variable, containing its categories.
+    """
+    longest = max(len(column) for column in categories)
+    return np.column_stack([np.resize(column, longest) for column in categories])
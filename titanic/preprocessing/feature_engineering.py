@@ -1,9 +1,17 @@
 """Feature engineering functions."""
 import re
-import numpy as np
+from typing import Iterable, Iterator
 import pandas as pd
 from ..data.enums import CabinLetter, ColumnsProcessed
 
+# Name title between the first "," and the following "." of a name.
+# Example "Braund, Mr. Owen Harris" -> "Mr"
+NAME_TITLE_PATTERN = re.compile(r"^[^,]*,([^,.]*)")
+
+# Everything that is not part of a cabin letter, or a cabin number
+NOT_CABIN_LETTER_PATTERN = re.compile(r"[^A-Z]+")
+NOT_CABIN_NUMBER_PATTERN = re.compile(r"[^0-9]+")
+
 
 def feature_engineering(df: pd.DataFrame) -> pd.DataFrame:
     """Feature engineer / extract new features from from Titanic <df>.
@@ -23,6 +31,25 @@ def feature_engineering(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def feature_engineering_chunks(
+    chunks: Iterable[pd.DataFrame],
+) -> Iterator[pd.DataFrame]:
+    """Feature engineer Titanic DataFrame <chunks> one at a time.
+
+    As all features are extracted row by row, this gives the same result as feature
+    engineering the whole dataset at once, but only one chunk has to fit in memory.
+    E.g. chunks = pd.read_csv(path, chunksize=100_000).
+
+    Args:
+        chunks: DataFrame chunks to feature engineer new features to.
+
+    Yields:
+        The updated DataFrame chunks with new featured engineered columns.
+    """
+    for chunk in chunks:
+        yield feature_engineering(chunk)
+
+
 def extract_name_title(df: pd.DataFrame) -> pd.DataFrame:
     """Extract name titles from the name column, and put into a new column.
 
@@ -33,10 +60,11 @@ def extract_name_title(df: pd.DataFrame) -> pd.DataFrame:
         The updated DataFrame with a new name title column.
     """
     # Extract name titles for each name, and put them into a new "name_title" column
-    df[ColumnsProcessed.NAME_TITLE.value] = [
-        name.split(",")[1].split(".")[0].strip()
-        for name in df[ColumnsProcessed.NAME.value]
-    ]
+    df[ColumnsProcessed.NAME_TITLE.value] = (
+        df[ColumnsProcessed.NAME.value]
+        .str.extract(NAME_TITLE_PATTERN, expand=False)
+        .str.strip()
+    )
     return df
 
 
@@ -52,37 +80,25 @@ def extract_cabin_letter_number(df: pd.DataFrame) -> pd.DataFrame:
     # Clean cabins with multiple cabin names in one, as that makes no sense (noise).
     # Instead keep only the first cabin name if it is a multiple.
     # Example "C23 C25 C27" -> "C23"
-    cabins_clean = [
-        cabin.split(" ")[0] if isinstance(cabin, str) else cabin
-        for cabin in df[ColumnsProcessed.CABIN.value]
-    ]
+    # (as object, since a chunk without any cabins is read as a float NaN column)
+    cabins_clean = (
+        df[ColumnsProcessed.CABIN.value].astype(object).str.split(" ", n=1).str[0]
+    )
 
     # Extract cabin letters and numbers from "cabin" column
-    cabin_letters = [
-        "".join(re.findall("[A-Z]+", cabin)) if isinstance(cabin, str) else cabin
-        for cabin in cabins_clean
-    ]
-    cabin_numbers = [
-        "".join(re.findall("[0-9]+", cabin)) if isinstance(cabin, str) else cabin
-        for cabin in cabins_clean
-    ]
+    cabin_letters = cabins_clean.str.replace(NOT_CABIN_LETTER_PATTERN, "", regex=True)
+    cabin_numbers = cabins_clean.str.replace(NOT_CABIN_NUMBER_PATTERN, "", regex=True)
 
     # Set NaN cabin letters & empty strings as "none"
-    cabin_letters = [
-        letter
-        if isinstance(letter, str) and len(letter) > 0
-        else CabinLetter.NONE.value
-        for letter in cabin_letters
-    ]
-
-    # Convert cabin number strings to integers, or np.nan if NaN/None
-    cabin_numbers = [
-        int(number) if isinstance(number, str) and len(number) > 0 else np.nan
-        for number in cabin_numbers
-    ]
+    cabin_letters = cabin_letters.mask(
+        cabin_letters.isna() | (cabin_letters == ""), CabinLetter.NONE.value
+    )
+
+    # Convert cabin number strings to numbers, or np.nan if NaN/None/empty
+    cabin_numbers = pd.to_numeric(cabin_numbers.mask(cabin_numbers == ""))
 
     # Add new columns to dataframe
     df[ColumnsProcessed.CABIN_LETTER.value] = cabin_letters
-    df[ColumnsProcessed.CABIN_NUMBER.value] = np.array(cabin_numbers).astype(int)
+    df[ColumnsProcessed.CABIN_NUMBER.value] = cabin_numbers.to_numpy().astype(int)
 
     return df
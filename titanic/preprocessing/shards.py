@@ -0,0 +1,190 @@
+"""Parallel ingestion of raw Titanic datasets that are split into many CSV shards.
+
+Each shard is read, renamed, feature engineered and stripped of incomplete rows in
+its own process, and sent back as compact NumPy columns, with the sums and counts
+of its numerical columns. The numerical NaN/None values are only filled once all
+shards are parsed, with the averages of the whole dataset, so the result is the
+same as parsing all shards concatenated with parser.create_titanic_columns().
+"""
+import os
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from . import parser, stream
+from ..data.enums import ColumnsRaw
+from ..data.titanic import TitanicColumns, NUMERICAL_TYPES
+
+# Pattern of the shards in a folder
+SHARD_PATTERN = "*.csv"
+
+
+@dataclass
+class ShardResult:
+    """Parse result of one shard, and its throughput."""
+
+    path: str
+    # Number of raw rows, and of rows that were kept after dropping incomplete rows
+    raw_rows: int
+    rows: int
+    seconds: float
+    # The last passenger id of the shard, or 0 if it's empty
+    watermark: int
+    # Sum and count of the non-NaN values of each numerical column of the kept rows
+    sums: Dict[str, float] = field(repr=False)
+    counts: Dict[str, int] = field(repr=False)
+
+    @property
+    def rows_per_second(self) -> float:
+        """Get the number of raw rows parsed per second."""
+        return self.raw_rows / self.seconds if self.seconds > 0 else 0.0
+
+
+def shard_paths(source: str) -> List[str]:
+    """List the shards of a raw Titanic dataset, in a folder or matching a glob.
+
+    Args:
+        source: Folder of the shards (all its SHARD_PATTERN files), or a glob
+                pattern of the shards, e.g. "data/raw/part-*.csv".
+
+    Returns:
+        Sorted paths of the shards.
+
+    Raises:
+        FileNotFoundError: If there are no shards.
+    """
+    pattern = os.path.join(source, SHARD_PATTERN) if os.path.isdir(source) else source
+    paths = sorted(glob.glob(pattern))
+    if not paths:
+        raise FileNotFoundError(f"No raw dataset shards found at {source}")
+    return paths
+
+
+def ingest(
+    source: str, processes: Optional[int] = None
+) -> Tuple[TitanicColumns, np.ndarray, List[ShardResult]]:
+    """Parse all shards of a raw Titanic dataset in parallel, into one dataset.
+
+    Args:
+        source:     Folder or glob pattern of the shards, see shard_paths().
+        processes:  Number of processes to parse shards in, default all cores. With
+                    1 process, the shards are parsed one by one in this process.
+
+    Returns:
+        Tuple of the parsed columnar Titanic dataset (of the shards in path order),
+        y labels, and the result of each shard.
+    """
+    paths = shard_paths(source)
+
+    # Parse each shard in its own process, leaving numerical NaN/None values as is
+    if processes == 1:
+        parsed = [_parse_shard(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(processes) as executor:
+            parsed = list(executor.map(_parse_shard, paths))
+    results = [result for result, _, _ in parsed]
+    data = TitanicColumns.concat([data for _, data, _ in parsed])
+    labels = np.concatenate([labels for _, _, labels in parsed])
+
+    # Fill numerical NaN/None values with the averages of all shards, like clean()
+    for col, mean in global_means(results).items():
+        values = data.numerical[col]
+        if values.dtype.kind == "f":
+            np.copyto(values, mean, where=np.isnan(values))
+
+    return data, labels, results
+
+
+def global_means(results: List[ShardResult]) -> Dict[str, float]:
+    """Compute the numerical column averages of all shards, from their sums and counts.
+
+    Args:
+        results:    Result of each shard.
+
+    Returns:
+        Dict of the average of each numerical column, NaN if it has no values.
+    """
+    means = {}
+    for col in NUMERICAL_TYPES:
+        count = sum(result.counts[col] for result in results)
+        total = sum(result.sums[col] for result in results)
+        means[col] = total / count if count > 0 else float("nan")
+    return means
+
+
+def report(results: List[ShardResult], wall_time: float) -> str:
+    """Format the throughput of each shard, and of all shards.
+
+    Args:
+        results:    Result of each shard.
+        wall_time:  Wall time of ingesting all shards, in seconds.
+
+    Returns:
+        The report, as lines of text.
+    """
+    lines = [f"{'shard':<40} {'raw rows':>10} {'rows':>10} {'s':>7} {'rows/s':>10}"]
+    for result in results:
+        lines.append(
+            f"{os.path.basename(result.path):<40} {result.raw_rows:>10} "
+            f"{result.rows:>10} {result.seconds:>7.2f} "
+            f"{result.rows_per_second:>10.0f}"
+        )
+    raw_rows = sum(result.raw_rows for result in results)
+    lines.append(
+        f"{len(results)} shards, {raw_rows} raw rows in {wall_time:.2f} s "
+        f"({raw_rows / wall_time:.0f} rows/s)"
+    )
+    return "\n".join(lines)
+
+
+def _parse_shard(path: str) -> Tuple[ShardResult, TitanicColumns, np.ndarray]:
+    """Parse one shard, without filling its numerical NaN/None values.
+
+    Args:
+        path:   Path to the raw Titanic CSV shard.
+
+    Returns:
+        Tuple of the result of the shard, its columnar Titanic dataset and y labels.
+    """
+    start = time.perf_counter()
+    # pylint infers read_csv() as a chunk reader, not a DataFrame
+    # pylint: disable=no-member
+    raw = pd.read_csv(path, usecols=list(stream.RAW_DTYPES), dtype=stream.RAW_DTYPES)
+    passenger_ids = raw[ColumnsRaw.PASSENGER_ID.value]
+
+    # Rename, feature engineer and drop incomplete rows, and sum the numerical values
+    df = parser.drop_incomplete(parser.transform(raw))
+    numerical = df[list(NUMERICAL_TYPES)]
+    sums = {col: float(value) for col, value in numerical.sum().items()}
+    counts = {col: int(value) for col, value in numerical.count().items()}
+    data, labels = parser.to_columns(df)
+
+    result = ShardResult(
+        path=path,
+        raw_rows=len(raw),
+        rows=len(labels),
+        seconds=time.perf_counter() - start,
+        watermark=int(passenger_ids.max()) if len(raw) > 0 else 0,
+        sums=sums,
+        counts=counts,
+    )
+    return result, data, labels
+
+
+if __name__ == "__main__":
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("source", help="Folder or glob pattern of the shards.")
+    arg_parser.add_argument(
+        "--processes",
+        type=int,
+        help="Number of processes to parse shards in (default: all cores).",
+    )
+    args = arg_parser.parse_args()
+
+    start_time = time.perf_counter()
+    shard_results = ingest(args.source, args.processes)[2]
+    print(report(shard_results, time.perf_counter() - start_time))
@@ -0,0 +1,191 @@
+"""Streaming, chunk by chunk, ingestion of raw Titanic datasets."""
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, Tuple
+import numpy as np
+import pandas as pd
+from . import parser
+from .encoder import TitanicEncoder
+from ..data.enums import ColumnsRaw
+from ..data.titanic import TitanicColumns, NUMERICAL_TYPES
+
+# Data types of the raw columns that are read, the same as pandas would infer for a
+# complete dataset. Explicit, so that every chunk is read with the same data types,
+# even if e.g. a chunk happens to have no cabins at all.
+RAW_DTYPES: Dict[str, Any] = {
+    ColumnsRaw.PASSENGER_ID.value: np.int64,
+    ColumnsRaw.SURVIVED.value: np.int64,
+    ColumnsRaw.PERSON_CLASS.value: np.int64,
+    ColumnsRaw.NAME.value: object,
+    ColumnsRaw.SEX.value: object,
+    ColumnsRaw.AGE.value: np.float64,
+    ColumnsRaw.SIBLINGS_SPOUSES.value: np.int64,
+    ColumnsRaw.PARENTS_CHILDREN.value: np.int64,
+    ColumnsRaw.CABIN.value: object,
+    ColumnsRaw.EMBARKED.value: object,
+    ColumnsRaw.TICKET_PRICE.value: np.float64,
+}
+
+CHUNKSIZE = 100_000
+
+
+def read_raw_chunks(path: str, chunksize: int = CHUNKSIZE) -> Iterator[pd.DataFrame]:
+    """Read the raw Titanic CSV dataset at <path> in chunks of <chunksize> rows.
+
+    Only the columns that are used are read, with explicit data types.
+
+    Args:
+        path:       Path to the raw Titanic CSV dataset.
+        chunksize:  Max number of rows per chunk.
+
+    Yields:
+        Raw Titanic DataFrame chunks.
+    """
+    yield from pd.read_csv(
+        path,
+        usecols=list(RAW_DTYPES),
+        dtype=RAW_DTYPES,
+        chunksize=chunksize,
+    )
+
+
+def last_passenger_id(path: str, chunksize: int = CHUNKSIZE) -> int:
+    """Get the last (highest) passenger id of the raw Titanic CSV dataset at <path>.
+
+    Only the passenger id column is read, chunk by chunk.
+
+    Args:
+        path:       Path to the raw Titanic CSV dataset.
+        chunksize:  Max number of rows per chunk.
+
+    Returns:
+        The highest passenger id, or 0 if the dataset is empty.
+    """
+    col = ColumnsRaw.PASSENGER_ID.value
+    return max(
+        (
+            int(chunk[col].max())
+            for chunk in pd.read_csv(path, usecols=[col], chunksize=chunksize)
+            if len(chunk) > 0
+        ),
+        default=0,
+    )
+
+
+def read_new(
+    path: str, watermark: int, chunksize: int = CHUNKSIZE
+) -> Tuple[pd.DataFrame, int]:
+    """Read only the rows of the raw Titanic CSV dataset at <path> that are new.
+
+    Rows are new if their passenger id is higher than <watermark>, i.e. they were
+    added after the data that a model version was trained on. Only the new rows of
+    each chunk are kept in memory.
+
+    Args:
+        path:       Path to the raw Titanic CSV dataset.
+        watermark:  The last passenger id that is not new.
+        chunksize:  Max number of rows per chunk.
+
+    Returns:
+        Tuple of the new raw rows, and the new watermark (the last passenger id).
+    """
+    col = ColumnsRaw.PASSENGER_ID.value
+    chunks = [
+        chunk[chunk[col] > watermark] for chunk in read_raw_chunks(path, chunksize)
+    ]
+    new = pd.concat(chunks, ignore_index=True)
+    return new, max(watermark, int(new[col].max()) if len(new) > 0 else 0)
+
+
+def numerical_means(path: str, chunksize: int = CHUNKSIZE) -> Dict[str, float]:
+    """Compute the numerical column averages that clean() would use for all of <path>.
+
+    The averages are computed from running sums and counts over all chunks, of the
+    rows that are kept after dropping rows with NaN/None categorical variables.
+
+    Args:
+        path:       Path to the raw Titanic CSV dataset.
+        chunksize:  Max number of rows per chunk.
+
+    Returns:
+        Dict of the average of each numerical column.
+    """
+    cols = list(NUMERICAL_TYPES)
+    sums = pd.Series(0.0, index=cols)
+    counts = pd.Series(0, index=cols)
+    for chunk in read_raw_chunks(path, chunksize):
+        chunk = parser.drop_incomplete(parser.transform(chunk))[cols]
+        sums += chunk.sum()
+        counts += chunk.count()
+
+    means: Dict[str, float] = (sums / counts).to_dict()
+    return means
+
+
+def stream_titanic(
+    path: str, chunksize: int = CHUNKSIZE
+) -> Iterator[Tuple[TitanicColumns, np.ndarray]]:
+    """Parse the raw Titanic CSV dataset at <path> chunk by chunk.
+
+    Reads the dataset twice, first to compute the numerical column averages of the
+    whole dataset, and then to parse it chunk by chunk using those averages. This
+    gives the same dataset as parsing all of it at once with create_titanic_columns(),
+    but only one raw chunk is kept in memory at a time.
+
+    Args:
+        path:       Path to the raw Titanic CSV dataset.
+        chunksize:  Max number of rows per chunk.
+
+    Yields:
+        Tuples of parsed columnar Titanic dataset chunks and their y labels.
+    """
+    means = numerical_means(path, chunksize)
+    for chunk in read_raw_chunks(path, chunksize):
+        yield parser.create_titanic_columns(chunk, means)
+
+
+def fit_stream(
+    path: str, chunksize: int = CHUNKSIZE
+) -> Tuple[TitanicColumns, np.ndarray, TitanicEncoder]:
+    """Parse the raw Titanic CSV dataset at <path>, and fit an encoder chunk by chunk.
+
+    Only one raw chunk is kept in memory at a time, while the parsed columnar chunks
+    (which are a lot smaller than the raw data) are concatenated for training.
+
+    Args:
+        path:       Path to the raw Titanic CSV dataset.
+        chunksize:  Max number of rows per chunk.
+
+    Returns:
+        Tuple of the parsed columnar Titanic dataset, y labels and fitted encoder.
+    """
+    encoder = TitanicEncoder()
+    data, labels = [], []
+    for data_chunk, labels_chunk in stream_titanic(path, chunksize):
+        encoder.partial_fit(data_chunk)
+        data.append(data_chunk)
+        labels.append(labels_chunk)
+
+    return TitanicColumns.concat(data), np.concatenate(labels), encoder
+
+
+def peak_memory(func: Callable[..., Any], *args: Any) -> Tuple[Any, int]:
+    """Call <func> with <args>, and measure its peak memory usage.
+
+    Only memory allocated by Python (including NumPy and pandas) is measured, using
+    tracemalloc, which slows down <func> while measuring.
+
+    Args:
+        func:   Function to call.
+        args:   Arguments to call <func> with.
+
+    Returns:
+        Tuple of what <func> returned and its peak memory usage in bytes.
+    """
+    tracemalloc.start()
+    try:
+        result = func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return result, peak